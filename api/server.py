@@ -0,0 +1,305 @@
+"""
+api/server.py
+─────────────
+Asyncio HTTP/WebSocket API around the headless screening engine
+(services/engine.py), for ATS integrations and non-Streamlit front ends:
+
+    python -m api.server --host 0.0.0.0 --port 8080
+
+Endpoints (JSON bodies):
+
+  POST   /sessions                   start a screening → {"reply", "state"}
+  GET    /sessions/{token}           → {"state"}
+  POST   /sessions/{token}/messages  {"content": "..."} → {"reply", "state"}
+  GET    /sessions/{token}/ws        WebSocket: send {"content": "..."} per turn;
+                                     receive {"type": "delta", "text"} chunks, then
+                                     {"type": "turn", "state"}; {"type": "scores",
+                                     "scores"} is pushed whenever answer scores land
+  DELETE /sessions/{token}           drop the live session (stored data is kept)
+
+"state" is {"token", "session_id", "stage", "stage_label", "progress",
+"ended", "candidate_data", "scores", "messages"}; messages[0] is the hidden
+greeting trigger and scores are keyed by message index.
+
+All sessions share one event loop, but LLM I/O is not asynchronous: the
+engine and LLM providers are synchronous, so each handler blocks on a
+worker thread (API_WORKERS, 64 by default) for the length of its turn and
+the reply chunks are bridged back to the loop. Idle and typing candidates
+hold no thread, but at most API_WORKERS turns are generated at once. Live
+sessions are persisted through services/persistence.py, so an unknown token
+is resumed from the session stores and idle sessions can be evicted.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import AsyncIterator, Callable, Iterator
+
+from config.settings import API_HOST, API_PORT, API_WORKERS, API_IDLE_SECONDS
+from services.engine import ScreeningSession
+from services.greeting_pool import refresh as refresh_greetings
+from services.llm_client import warm_up
+from services.metrics import start_exporter
+from services.persistence import SessionPersister, enabled, new_token, resume
+from services.providers import get_registry
+from services.state_manager import get_stage_label, get_stage_progress
+
+try:
+    from aiohttp import WSMsgType, web
+except ImportError:  # optional dependency, checked in main()
+    web = None
+
+_log = logging.getLogger(__name__)
+
+_SCORE_POLL_SECONDS = 1.0
+_EVICT_EVERY_SECONDS = 60.0
+_DONE = object()
+
+
+class _Live:
+    """A live session: engine, persister and the lock serialising its turns."""
+
+    def __init__(self, token: str, session: ScreeningSession, persister: SessionPersister | None):
+        self.token = token
+        self.session = session
+        self.persister = persister
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+    def save(self) -> None:
+        if self.persister is not None:
+            self.persister.save(self.session)
+
+    def state(self) -> dict:
+        s = self.session
+        return {
+            "token":          self.token,
+            "session_id":     s.session_id,
+            "stage":          s.stage,
+            "stage_label":    get_stage_label(s.stage),
+            "progress":       get_stage_progress(s.stage),
+            "ended":          s.ended,
+            "candidate_data": s.candidate_data,
+            "scores":         s.scores,
+            "messages":       s.messages,
+        }
+
+
+class ScreeningServer:
+    """Live-session registry plus the route handlers."""
+
+    def __init__(self, workers: int = API_WORKERS, idle_seconds: float = API_IDLE_SECONDS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talentscout-api")
+        self._idle_seconds = idle_seconds
+        self._live: dict[str, _Live] = {}
+        self._evictor: asyncio.Task | None = None
+
+    # ── Engine bridge ──────────────────────────────────────────────────────────
+
+    async def _run(self, fn: Callable, *args):
+        """Run blocking `fn(*args)` on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, contextvars.copy_context().run, fn, *args)
+
+    async def _stream(self, make_chunks: Callable[[], Iterator[str]]) -> AsyncIterator[str]:
+        """Consume a blocking chunk iterator on the worker pool, yielding chunks on the loop."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def pump() -> None:
+            try:
+                for chunk in make_chunks():
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+        done = loop.run_in_executor(self._pool, contextvars.copy_context().run, pump)
+        try:
+            while (chunk := await queue.get()) is not _DONE:
+                yield chunk
+        finally:
+            # Even if the client went away, hold the caller (and its session
+            # lock) until the turn has finished updating the session.
+            await asyncio.shield(done)
+
+    @staticmethod
+    def _start_chunks(live: _Live) -> Iterator[str]:
+        yield from live.session.start()
+        live.save()
+
+    @staticmethod
+    def _turn_chunks(live: _Live, content: str) -> Iterator[str]:
+        chunks = live.session.reply(content)
+        live.save()  # the candidate's message survives a crash mid-reply
+        yield from chunks
+        live.save()
+
+    # ── Registry ───────────────────────────────────────────────────────────────
+
+    async def _get(self, token: str) -> _Live:
+        live = self._live.get(token)
+        if live is None:
+            resumed = await self._run(resume, token) if enabled() else None
+            if resumed is None:
+                raise _error(web.HTTPNotFound, "unknown session")
+            live = self._live.setdefault(token, _Live(token, *resumed))
+        live.last_used = time.monotonic()
+        return live
+
+    async def _evict_idle(self) -> None:
+        """Drop live sessions idle for longer than API_IDLE_SECONDS (persisted ones can be resumed)."""
+        while True:
+            await asyncio.sleep(_EVICT_EVERY_SECONDS)
+            cutoff = time.monotonic() - self._idle_seconds
+            for token, live in list(self._live.items()):
+                if live.last_used < cutoff and not live.lock.locked():
+                    del self._live[token]
+
+    # ── Handlers ───────────────────────────────────────────────────────────────
+
+    async def create(self, request: "web.Request") -> "web.Response":
+        token = new_token()
+        live = _Live(token, ScreeningSession(), SessionPersister(token) if enabled() else None)
+        self._live[token] = live
+        async with live.lock:
+            reply = "".join([chunk async for chunk in self._stream(lambda: self._start_chunks(live))])
+        return web.json_response({"reply": reply, "state": live.state()}, status=201)
+
+    async def get_state(self, request: "web.Request") -> "web.Response":
+        live = await self._get(request.match_info["token"])
+        async with live.lock:
+            live.session.poll()
+            return web.json_response({"state": live.state()})
+
+    async def post_message(self, request: "web.Request") -> "web.Response":
+        live = await self._get(request.match_info["token"])
+        content = await _content(request)
+        async with live.lock:
+            _check_open(live)
+            reply = "".join([chunk async for chunk in self._stream(lambda: self._turn_chunks(live, content))])
+            return web.json_response({"reply": reply, "state": live.state()})
+
+    async def delete(self, request: "web.Request") -> "web.Response":
+        self._live.pop(request.match_info["token"], None)
+        return web.Response(status=204)
+
+    async def websocket(self, request: "web.Request") -> "web.WebSocketResponse":
+        live = await self._get(request.match_info["token"])
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        poller = asyncio.create_task(self._push_scores(live, ws))
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    content = _parse_content(msg.json())
+                except ValueError as exc:
+                    await ws.send_json({"type": "error", "error": str(exc)})
+                    continue
+                async with live.lock:
+                    if live.session.ended:
+                        await ws.send_json({"type": "error", "error": "session has ended"})
+                        continue
+                    async with aclosing(self._stream(lambda: self._turn_chunks(live, content))) as chunks:
+                        async for chunk in chunks:
+                            await ws.send_json({"type": "delta", "text": chunk})
+                    live.last_used = time.monotonic()
+                    await ws.send_json({"type": "turn", "state": live.state()})
+        finally:
+            poller.cancel()
+        return ws
+
+    async def _push_scores(self, live: _Live, ws: "web.WebSocketResponse") -> None:
+        """Push answer scores to a WebSocket client as they land."""
+        while not ws.closed:
+            await asyncio.sleep(_SCORE_POLL_SECONDS)
+            if not live.session.pending_scores or live.lock.locked():
+                continue
+            async with live.lock:
+                landed = live.session.poll()
+                if landed:
+                    await self._run(live.save)
+            if landed and not ws.closed:
+                await ws.send_json({"type": "scores", "scores": live.session.scores})
+
+    # ── App ────────────────────────────────────────────────────────────────────
+
+    def app(self) -> "web.Application":
+        app = web.Application()
+        app.add_routes([
+            web.post("/sessions", self.create),
+            web.get("/sessions/{token}", self.get_state),
+            web.post("/sessions/{token}/messages", self.post_message),
+            web.delete("/sessions/{token}", self.delete),
+            web.get("/sessions/{token}/ws", self.websocket),
+        ])
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app: "web.Application") -> None:
+        await self._run(_warm)
+        self._evictor = asyncio.create_task(self._evict_idle())
+
+    async def _on_cleanup(self, app: "web.Application") -> None:
+        if self._evictor is not None:
+            self._evictor.cancel()
+        self._pool.shutdown(wait=False)
+
+
+def _warm() -> None:
+    """Build the provider registry, warm the shared client, fill the greeting pool and start the metrics exporter."""
+    get_registry()
+    start_exporter()
+    warm_up()
+    refresh_greetings()
+
+
+def _error(http_error: type, message: str) -> Exception:
+    """An aiohttp HTTP error with a JSON {"error": message} body."""
+    return http_error(text=json.dumps({"error": message}), content_type="application/json")
+
+
+def _parse_content(body) -> str:
+    content = body.get("content") if isinstance(body, dict) else None
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError('expected {"content": "<non-empty text>"}')
+    return content.strip()
+
+
+async def _content(request: "web.Request") -> str:
+    try:
+        return _parse_content(await request.json())
+    except ValueError as exc:  # includes malformed JSON
+        raise _error(web.HTTPBadRequest, str(exc)) from exc
+
+
+def _check_open(live: _Live) -> None:
+    if live.session.ended:
+        raise _error(web.HTTPConflict, "session has ended")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m api.server", description="TalentScout screening API.")
+    parser.add_argument("--host", default=API_HOST, help=f"bind address (default: {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"port (default: {API_PORT})")
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="threads for blocking engine calls")
+    args = parser.parse_args(argv)
+
+    if web is None:
+        print("The API server needs aiohttp: pip install aiohttp", file=sys.stderr)
+        return 2
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(ScreeningServer(args.workers).app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,115 +4,129 @@ Entry point: initialises the app and wires all modules together.
 Run with: streamlit run app.py
 """
 
+import time
+
 import streamlit as st
 from datetime import datetime
-
-from config.settings import set_page, FAREWELL_MESSAGE
-from utils.session import init_session
-from utils.validators import detect_exit
-from utils.extract_data import extract_candidate_data
-from services.llm_service import get_ai_response, score_answer
-from services.state_manager import infer_stage, get_stage_progress, get_stage_label
+from typing import Iterator
+
+from config.settings import CHAT_PAGE_MESSAGES
+from utils.session import init_session, persist_session
+from services.llm_client import warm_up
+from services.providers import get_registry
+from services.greeting_pool import refresh as refresh_greetings
+from services.state_manager import get_stage_progress, get_stage_label
+from services.metrics import start_exporter
 from ui.styles import load_css
 from ui.sidebar import render_sidebar
-from ui.chat_ui import render_message, render_header, render_ended_banner
+from ui.chat_ui import render_message, render_history, render_header, render_ended_banner
+
+_STREAM_REFRESH_SECONDS = 0.05
+_SCORE_POLL_SECONDS = 1.0
+
+
+def set_page() -> None:
+    """
+    Configure the Streamlit page.
+    MUST be called as the very first Streamlit command — before any other
+    st.* call or widget render.
+    """
+    st.set_page_config(
+        page_title="TalentScout | AI Hiring Assistant",
+        page_icon="🎯",
+        layout="wide",
+        initial_sidebar_state="collapsed",
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_llm_client() -> bool:
+    """Build the provider registry, warm the shared client, fill the greeting pool and start the metrics exporter."""
+    get_registry()
+    start_exporter()
+    warmed = warm_up()
+    refresh_greetings()
+    return warmed
+
+
+def _stream_reply(chunks: Iterator[str]) -> None:
+    """
+    Draw a reply into a bot bubble as its chunks arrive.
+
+    A spinner is shown until the first chunk (question-bank and structured
+    replies arrive in one piece); after that the bubble is redrawn at most
+    every _STREAM_REFRESH_SECONDS to keep websocket traffic down. The engine
+    commits the reply to the transcript once the iterator is exhausted.
+    """
+    placeholder = st.empty()
+    timestamp = datetime.now().strftime("%H:%M")
+    with st.spinner("TalentScout is typing…"):
+        response = next(chunks, "")
+    last_draw = 0.0
+
+    for chunk in chunks:
+        response += chunk
+        now = time.monotonic()
+        if now - last_draw >= _STREAM_REFRESH_SECONDS:
+            render_message("assistant", response + " ▌", timestamp, container=placeholder)
+            last_draw = now
+
+    render_message("assistant", response, timestamp, container=placeholder)
+
+
+@st.fragment(run_every=_SCORE_POLL_SECONDS)
+def _poll_pending_scores() -> None:
+    """While scores are in flight, rerun the app as soon as one lands."""
+    if st.session_state.screening.poll():
+        st.rerun()
 
 
 def main() -> None:
-    """Main application controller."""
+    """Main application controller: a thin Streamlit client of the ScreeningSession engine."""
 
     # ── Bootstrap ──────────────────────────────────────────────────────────────
     set_page()
+    _warm_llm_client()
     load_css()
     init_session()
+    persist_session()
+    screening = st.session_state.screening
     render_sidebar()
 
     # ── Header + Progress Bar ──────────────────────────────────────────────────
-    progress = get_stage_progress(st.session_state.stage)
-    stage_label = get_stage_label(st.session_state.stage)
+    progress = get_stage_progress(screening.stage)
+    stage_label = get_stage_label(screening.stage)
     render_header(stage_label, progress)
 
     # ── Auto-Greeting on first load ────────────────────────────────────────────
-    if not st.session_state.started:
-        st.session_state.started = True
-        trigger = {"role": "user", "content": "Hello, I'm here for the screening."}
-        st.session_state.messages.append(trigger)
-
-        with st.spinner(""):
-            greeting = get_ai_response(st.session_state.messages)
-
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": greeting,
-            "time": datetime.now().strftime("%H:%M"),
-        })
-        st.session_state.stage = "greeting"
+    if not screening.started:
+        _stream_reply(screening.start())
         st.rerun()
 
     # ── Render Chat History ────────────────────────────────────────────────────
+    screening.poll()
     st.markdown('<div class="ts-chat">', unsafe_allow_html=True)
-    scores = st.session_state.get("scores", {})
-    for i, msg in enumerate(st.session_state.messages[1:], start=1):
-        accuracy = scores.get(i) if msg["role"] == "user" else None
-        render_message(msg["role"], msg["content"], msg.get("time", ""), accuracy)
+    earlier = st.empty()  # the pager sits above the history it pages
+    hidden = render_history(screening.messages, screening.scores, st.session_state.history_window)
+    if hidden and earlier.button(f"Show earlier messages ({hidden} hidden)", key="show_earlier"):
+        st.session_state.history_window += CHAT_PAGE_MESSAGES
+        st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
+    if screening.pending_scores:
+        _poll_pending_scores()
+
     # ── Ended State ────────────────────────────────────────────────────────────
-    if st.session_state.ended:
+    if screening.ended:
         render_ended_banner()
         return
 
     # ── Chat Input ─────────────────────────────────────────────────────────────
     if user_input := st.chat_input("Type your response here…"):
-        timestamp = datetime.now().strftime("%H:%M")
-        st.session_state.messages.append(
-            {"role": "user", "content": user_input, "time": timestamp}
-        )
-
-        # Exit-intent detection
-        if detect_exit(user_input):
-            st.session_state.messages.append({
-                "role": "assistant",
-                "content": FAREWELL_MESSAGE,
-                "time": timestamp,
-            })
-            st.session_state.stage = "ended"
-            st.session_state.ended = True
-            st.rerun()
-
-        # Score answer if in technical questions stage
-        msg_index = len(st.session_state.messages) - 1
-        if st.session_state.stage == "technical_questions":
-            bot_msgs = [m for m in st.session_state.messages if m["role"] == "assistant"]
-            last_question = bot_msgs[-1]["content"] if bot_msgs else ""
-            result = score_answer(last_question, user_input)
-            if result and "score" in result:
-                if "scores" not in st.session_state:
-                    st.session_state.scores = {}
-                st.session_state.scores[msg_index] = result["score"]
-
-        # Get LLM response
-        with st.spinner("TalentScout is thinking…"):
-            response = get_ai_response(st.session_state.messages)
-
-        st.session_state.messages.append({
-            "role": "assistant",
-            "content": response,
-            "time": datetime.now().strftime("%H:%M"),
-        })
-
-        # Update extracted candidate data and conversation stage
-        extract_candidate_data(st.session_state.messages)
-        st.session_state.stage = infer_stage(st.session_state.messages, st.session_state.stage)
-
-        # Detect if the LLM itself wrapped up the conversation
-        if any(phrase in response.lower() for phrase in [
-            "recruiter will", "2-3 business days", "2–3 business days",
-            "best of luck", "thank you for your time today",
-        ]):
-            st.session_state.stage = "ended"
-            st.session_state.ended = True
-
+        render_message("user", user_input, datetime.now().strftime("%H:%M"))
+        chunks = screening.reply(user_input)
+        persist_session()  # the candidate's message survives a crash mid-reply
+        _stream_reply(chunks)
         st.rerun()
 
 
@@ -11,6 +11,8 @@ Design decisions:
 - Explicit field list and question-format instructions produce consistent,
   parseable outputs.
 - Fallback and guardrail instructions keep the model on-topic.
+- STRUCTURED_TURN_PROMPT is appended in TURN_MODE "structured" so one
+  completion also returns the score, next stage and extracted fields.
 """
 
 SYSTEM_PROMPT: str = """
@@ -119,3 +121,28 @@ EXIT HANDLING
 If the user expresses intent to leave (says "bye", "exit", "quit", etc.),
 thank them gracefully and conclude — do not ask further questions.
 """
+
+
+STRUCTURED_TURN_PROMPT: str = """
+════════════════════════════════════════════════════════════
+RESPONSE FORMAT
+════════════════════════════════════════════════════════════
+Respond ONLY with a JSON object of this shape — no text outside it:
+
+{{
+  "reply": "<your message to the candidate; markdown allowed>",
+  "score": <integer 0-100 or null>,
+  "feedback": "<one sentence or null>",
+  "next_stage": "<greeting | collecting_info | tech_stack | technical_questions | wrap_up | ended>",
+  "candidate_data": {{<only fields stated in the candidate's latest message>}}
+}}
+
+• score / feedback — only when the current stage is technical_questions and
+  the candidate's latest message answers one of your technical questions:
+  score that answer strictly. Otherwise null.
+• next_stage — the stage the conversation is in once your reply is sent.
+  Use "ended" when your reply concludes the screening.
+• candidate_data — any of full_name, email, phone, years_experience,
+  desired_position, location, tech_stack (a list of technologies). Omit
+  fields the candidate did not state; use {{}} if there are none.
+"""
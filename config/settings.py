@@ -1,12 +1,13 @@
 """
 config/settings.py
 ──────────────────
-App-wide constants, Streamlit page configuration, and static text blobs.
+App-wide constants and static text blobs. Free of Streamlit imports, so the
+headless engine (services/engine.py) and the API (api/server.py) can use it.
 Keep all magic strings and configuration values here — never scatter them
 across modules.
 """
 
-import streamlit as st
+import os
 
 
 # ── Conversation Stages ────────────────────────────────────────────────────────
@@ -25,6 +26,12 @@ EXIT_KEYWORDS: set[str] = {
     "stop", "done", "finish", "close", "cancel",
 }
 
+# ── Confirmation Keywords ──────────────────────────────────────────────────────
+CONFIRM_KEYWORDS: set[str] = {
+    "yes", "yep", "yeah", "yup", "correct", "right", "confirmed",
+    "exactly", "sure", "ok", "okay", "perfect", "good",
+}
+
 # ── Farewell message shown on exit ────────────────────────────────────────────
 FAREWELL_MESSAGE: str = """\
 Thank you so much for taking the time to speak with us today! 🎉
@@ -43,16 +50,195 @@ with next steps.
 *This screening session has ended. Click **Start Over** in the sidebar to begin a new session.*
 """
 
-# ── Streamlit Page Config ──────────────────────────────────────────────────────
-def set_page() -> None:
-    """
-    Configure the Streamlit page.
-    MUST be called as the very first Streamlit command — before any other
-    st.* call or widget render.
-    """
-    st.set_page_config(
-        page_title="TalentScout | AI Hiring Assistant",
-        page_icon="🎯",
-       layout="wide",                       
-       initial_sidebar_state="collapsed",   
-    )
+# ── Greeting ───────────────────────────────────────────────────────────────────
+# Hidden first user turn that prompts the opening message of every session.
+GREETING_TRIGGER: str = "Hello, I'm here for the screening."
+
+# Pre-generated greetings served instantly on first page load; each is
+# regenerated in the background once older than GREETING_MAX_AGE_SECONDS.
+GREETING_POOL_SIZE: int = int(os.getenv("TALENTSCOUT_GREETING_POOL", "5"))
+GREETING_MAX_AGE_SECONDS: int = int(os.getenv("TALENTSCOUT_GREETING_MAX_AGE", "3600"))
+
+# ── LLM Client Pool ────────────────────────────────────────────────────────────
+# One Groq client is shared by every session in the process. Each session can
+# have a reply and a scoring call in flight at once, so size the pool for
+# roughly twice the number of concurrent candidates you expect per instance.
+LLM_POOL_SIZE: int = int(os.getenv("TALENTSCOUT_LLM_POOL_SIZE", "32"))
+LLM_KEEPALIVE_SECONDS: float = float(os.getenv("TALENTSCOUT_LLM_KEEPALIVE", "60"))
+LLM_TIMEOUT_SECONDS: float = float(os.getenv("TALENTSCOUT_LLM_TIMEOUT", "60"))
+
+# ── LLM Providers ──────────────────────────────────────────────────────────────
+# Comma-separated failover order; the first available provider is primary.
+# Providers whose SDK or API key is missing are skipped at start-up.
+LLM_PROVIDERS: list[str] = [
+    name.strip() for name in os.getenv("TALENTSCOUT_LLM_PROVIDERS", "groq,anthropic").split(",")
+    if name.strip()
+]
+
+# ── Model Tiers ────────────────────────────────────────────────────────────────
+# Each call type is routed to a model tier; each provider maps tiers to its
+# own models. Tiers with "downgrade_to" fall back to that tier while the big
+# model's p95 latency or connection-pool usage crosses the thresholds below,
+# and stay there for at least DOWNGRADE_HOLD_SECONDS. Stage classification is
+# regex-only (services/state_manager.py), so it has no call type or tier.
+CALL_TIERS: dict[str, str] = {
+    "reply":     "conversation",
+    "turn":      "conversation",
+    "questions": "conversation",
+    "score":     "scoring",
+    "summary":   "summarization",
+}
+MODEL_TIERS: dict[str, dict] = {
+    "conversation":   {"max_tokens": 1024, "temperature": None, "downgrade_to": "fast"},
+    "scoring":        {"max_tokens": 80,   "temperature": 0.1},
+    "summarization":  {"max_tokens": 320,  "temperature": 0.2},
+    "fast":           {"max_tokens": 1024, "temperature": None},
+}
+PROVIDER_MODELS: dict[str, dict[str, str]] = {
+    "groq": {
+        "conversation":   os.getenv("TALENTSCOUT_GROQ_MODEL", "llama-3.3-70b-versatile"),
+        "scoring":        "llama-3.1-8b-instant",
+        "summarization":  "llama-3.1-8b-instant",
+        "fast":           "llama-3.1-8b-instant",
+    },
+    "anthropic": {
+        "conversation":   os.getenv("TALENTSCOUT_ANTHROPIC_MODEL", "claude-3-5-sonnet-20240620"),
+        "scoring":        "claude-3-haiku-20240307",
+        "summarization":  "claude-3-haiku-20240307",
+        "fast":           "claude-3-haiku-20240307",
+    },
+}
+DOWNGRADE_P95_SECONDS: float = float(os.getenv("TALENTSCOUT_DOWNGRADE_P95", "8"))
+DOWNGRADE_POOL_RATIO: float = 0.9
+DOWNGRADE_HOLD_SECONDS: float = float(os.getenv("TALENTSCOUT_DOWNGRADE_HOLD", "60"))
+DOWNGRADE_MIN_SAMPLES: int = 20
+
+# Circuit breaker: after this many consecutive rate-limit/connection failures
+# a provider is skipped for CIRCUIT_COOLDOWN_SECONDS, then retried once.
+CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("TALENTSCOUT_CIRCUIT_FAILURES", "3"))
+CIRCUIT_COOLDOWN_SECONDS: float = float(os.getenv("TALENTSCOUT_CIRCUIT_COOLDOWN", "30"))
+HEALTH_WINDOW: int = int(os.getenv("TALENTSCOUT_HEALTH_WINDOW", "50"))
+
+# ── Retries & Hedging ──────────────────────────────────────────────────────────
+# Each call type gets an end-to-end latency budget (seconds). Retryable errors
+# are retried with capped, jittered exponential backoff while budget remains.
+# A slow call is hedged — duplicated once — when it has not answered by the
+# observed p95 latency for its type, limited to HEDGE_MAX_RATIO of calls.
+LLM_LATENCY_BUDGETS: dict[str, float] = {
+    "reply":   45.0,
+    "turn":    45.0,
+    "score":   20.0,
+    "summary": 60.0,
+    "questions": 90.0,
+}
+RETRY_MAX_ATTEMPTS: int = int(os.getenv("TALENTSCOUT_RETRY_ATTEMPTS", "4"))
+RETRY_BASE_DELAY: float = 0.5
+RETRY_MAX_DELAY: float = 8.0
+HEDGE_ENABLED: bool = os.getenv("TALENTSCOUT_HEDGE", "1") == "1"
+HEDGE_MIN_SAMPLES: int = 20
+HEDGE_MAX_RATIO: float = 0.1
+
+# ── Background Work ────────────────────────────────────────────────────────────
+# Shared thread pool for work that must never block a candidate turn
+# (answer scoring, summaries, prefetching). Threads mostly wait on network I/O.
+BACKGROUND_WORKERS: int = int(os.getenv("TALENTSCOUT_BACKGROUND_WORKERS", "8"))
+
+# ── Conversation Context Budget ────────────────────────────────────────────────
+# Prompt tokens sent per reply (system prompt + summary + recent turns). The
+# last CONTEXT_KEEP_MESSAGES messages are always sent verbatim; older turns are
+# folded into a running summary in the background.
+CONTEXT_TOKEN_BUDGET: int = int(os.getenv("TALENTSCOUT_CONTEXT_TOKENS", "6000"))
+CONTEXT_KEEP_MESSAGES: int = int(os.getenv("TALENTSCOUT_CONTEXT_KEEP", "8"))
+
+# ── Turn Mode ──────────────────────────────────────────────────────────────────
+# "stream":     the reply is streamed; technical answers are scored by a
+#               separate call and the stage is inferred from the reply text.
+# "structured": one JSON-mode call per turn returns the reply, the score for
+#               the previous answer, the next stage and newly stated profile
+#               fields (utils/turn_envelope.py). Falls back to "stream" for
+#               any turn whose envelope cannot be parsed.
+TURN_MODE: str = os.getenv("TALENTSCOUT_TURN_MODE", "stream")
+
+# ── Answer Scoring ─────────────────────────────────────────────────────────────
+# "per_answer": score each technical answer as soon as it is sent.
+# "batch":      score a whole question block in one call once it is answered.
+SCORE_MODE: str = os.getenv("TALENTSCOUT_SCORE_MODE", "per_answer")
+
+# ── Score Cache ────────────────────────────────────────────────────────────────
+# Memoised answer scores: a small in-memory LRU in front of an SQLite file.
+SCORE_CACHE_PATH: str = os.getenv("TALENTSCOUT_SCORE_CACHE", "data/score_cache.sqlite3")
+SCORE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("TALENTSCOUT_SCORE_CACHE_MEMORY", "2048"))
+SCORE_CACHE_MAX_ENTRIES: int = int(os.getenv("TALENTSCOUT_SCORE_CACHE_MAX", "50000"))
+SCORE_CACHE_TTL_SECONDS: int = int(os.getenv("TALENTSCOUT_SCORE_CACHE_TTL", str(7 * 24 * 3600)))
+
+# ── Question Bank ──────────────────────────────────────────────────────────────
+# Stage 4 questions per canonical technology, version and difficulty tier.
+# A stack fully covered by the bank is served locally; a tech with fewer than
+# BANK_MIN_PER_TIER questions in any tier is refilled by the LLM in the
+# background, BANK_REFILL_PER_TIER questions per tier at a time.
+QUESTION_BANK_INTRO: str = (
+    "Thanks for confirming! Here are a few technical questions based on your "
+    "stack. Answer them one at a time — take your time.\n\n"
+)
+# How long the confirmation turn may wait for a speculative question prefetch
+# that is still running before falling back to the bank, then live generation.
+PREFETCH_WAIT_SECONDS: float = float(os.getenv("TALENTSCOUT_PREFETCH_WAIT", "1"))
+QUESTION_BANK_PATH: str = os.getenv("TALENTSCOUT_QUESTION_BANK", "data/question_bank.sqlite3")
+QUESTION_TIERS: list[str] = ["beginner", "intermediate", "advanced"]
+QUESTIONS_PER_TECH: int = 3
+BANK_MIN_PER_TIER: int = 5
+BANK_REFILL_PER_TIER: int = 5
+
+# ── Session Store ──────────────────────────────────────────────────────────────
+# Opt-in: set TALENTSCOUT_SESSION_STORE (e.g. data/sessions.sqlite3) to persist
+# sessions and transcripts to SQLite (WAL) through a write-behind writer thread,
+# which groups everything queued within SESSION_STORE_FLUSH_SECONDS (at most
+# SESSION_STORE_BATCH writes) into one transaction. A session is then resumed
+# from the ?s=<token> URL parameter. Unset, nothing is written to disk.
+SESSION_STORE_PATH: str = os.getenv("TALENTSCOUT_SESSION_STORE", "")
+SESSION_STORE_BATCH: int = 500
+SESSION_STORE_FLUSH_SECONDS: float = float(os.getenv("TALENTSCOUT_SESSION_STORE_FLUSH", "0.25"))
+SESSION_TOKEN_PARAM: str = "s"
+
+# Shared live-session backend so any replica can serve a resumed session:
+# "redis" (any Redis-protocol server at SESSION_REDIS_URL), "memory" (one
+# process only) or "" to keep sessions replica-local. Idle records expire
+# after SESSION_TTL_SECONDS.
+SESSION_BACKEND: str = os.getenv("TALENTSCOUT_SESSION_BACKEND", "")
+SESSION_REDIS_URL: str = os.getenv("TALENTSCOUT_REDIS_URL", "redis://localhost:6379/0")
+SESSION_TTL_SECONDS: int = int(os.getenv("TALENTSCOUT_SESSION_TTL", str(24 * 3600)))
+
+# ── Screening API ──────────────────────────────────────────────────────────────
+# python -m api.server: HTTP/WebSocket front end of the screening engine.
+# Turns run on API_WORKERS threads (the LLM providers are blocking); live
+# sessions idle for API_IDLE_SECONDS are evicted and resumed from the
+# session stores on their next request.
+API_HOST: str = os.getenv("TALENTSCOUT_API_HOST", "127.0.0.1")
+API_PORT: int = int(os.getenv("TALENTSCOUT_API_PORT", "8080"))
+API_WORKERS: int = int(os.getenv("TALENTSCOUT_API_WORKERS", "64"))
+API_IDLE_SECONDS: float = float(os.getenv("TALENTSCOUT_API_IDLE", "1800"))
+
+# ── Chat History ───────────────────────────────────────────────────────────────
+# Only the most recent CHAT_WINDOW_MESSAGES bubbles are drawn on each rerun;
+# "Show earlier messages" pages in CHAT_PAGE_MESSAGES more at a time. Bubble
+# HTML is memoised for up to CHAT_HTML_CACHE_SIZE messages per process.
+CHAT_WINDOW_MESSAGES: int = int(os.getenv("TALENTSCOUT_CHAT_WINDOW", "30"))
+CHAT_PAGE_MESSAGES: int = 30
+CHAT_HTML_CACHE_SIZE: int = 4096
+
+# ── Interface Fonts ────────────────────────────────────────────────────────────
+# Fonts are served from static/fonts (python -m tools.fetch_fonts). Families
+# whose file is missing fall back to the system font stack; set
+# TALENTSCOUT_FONT_CDN=1 to load them from Google Fonts instead, which sends
+# every candidate's browser to a third-party CDN.
+FONT_CDN_FALLBACK: bool = os.getenv("TALENTSCOUT_FONT_CDN", "0") == "1"
+
+# ── Metrics ────────────────────────────────────────────────────────────────────
+# Per-call LLM metrics in Prometheus text format. METRICS_FILE is rewritten
+# every METRICS_WRITE_SECONDS (for a node_exporter textfile collector; empty
+# disables it); METRICS_PORT > 0 also serves them at http://host:port/metrics.
+METRICS_FILE: str = os.getenv("TALENTSCOUT_METRICS_FILE", "data/metrics.prom")
+METRICS_WRITE_SECONDS: float = float(os.getenv("TALENTSCOUT_METRICS_INTERVAL", "15"))
+METRICS_PORT: int = int(os.getenv("TALENTSCOUT_METRICS_PORT", "0"))
+# Per-session usage rollups kept in memory (oldest sessions are dropped).
+METRICS_SESSION_LIMIT: int = int(os.getenv("TALENTSCOUT_METRICS_SESSIONS", "5000"))
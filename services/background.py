@@ -0,0 +1,44 @@
+"""
+services/background.py
+──────────────────────
+Process-wide worker pool for work that runs off a candidate's critical path.
+
+Streamlit gives every session its own script thread, but LLM side-calls
+(scoring, summaries, prefetches) should not hold that thread while the
+candidate waits. `submit()` hands them to one shared ThreadPoolExecutor sized
+by BACKGROUND_WORKERS; callers keep the returned Future in session_state and
+poll it on a later rerun.
+
+Jobs must not read or write st.session_state — pass everything they need as
+arguments, since they run outside the session's script thread. They do run
+in a copy of the submitter's context, so ambient metrics labels (session,
+stage) carry over.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from config.settings import BACKGROUND_WORKERS
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=BACKGROUND_WORKERS,
+                    thread_name_prefix="talentscout-bg",
+                )
+    return _executor
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """Schedule fn(*args, **kwargs) on the shared pool and return its Future."""
+    return _get_executor().submit(contextvars.copy_context().run, fn, *args, **kwargs)
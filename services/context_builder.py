@@ -0,0 +1,93 @@
+"""
+services/context_builder.py
+───────────────────────────
+Token-budgeted conversation context for the reply call.
+
+Resending the whole transcript on every turn makes prompt tokens grow
+linearly per turn and session cost quadratically. Instead each request is
+built from:
+
+  1. The system prompt (stage + collected candidate_data).
+  2. A running summary of older turns, if one exists.
+  3. The most recent turns verbatim — at least CONTEXT_KEEP_MESSAGES, and as
+     many more as fit in CONTEXT_TOKEN_BUDGET.
+
+The summary itself is maintained in the background by
+services/summary_queue.py.
+"""
+
+import re
+
+from config.settings import CONTEXT_TOKEN_BUDGET, CONTEXT_KEEP_MESSAGES
+
+# Per-message framing overhead (role markers, separators) in chat templates.
+_MESSAGE_OVERHEAD = 4
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+# ── Token Counting ─────────────────────────────────────────────────────────────
+
+def count_tokens(text: str) -> int:
+    """
+    Estimate the token count of `text` locally, without a tokenizer download.
+
+    BPE tokenizers emit roughly one token per word or punctuation mark, and
+    about one per four characters on long identifiers and non-English text;
+    taking the larger of the two keeps the estimate on the safe side.
+    """
+    return max(len(_TOKEN_RE.findall(text)), len(text) // 4)
+
+
+def message_tokens(message: dict) -> int:
+    """Estimated prompt tokens for one chat message."""
+    return count_tokens(message["content"]) + _MESSAGE_OVERHEAD
+
+
+# ── Context Assembly ───────────────────────────────────────────────────────────
+
+def build_context(
+    system: str,
+    messages: list[dict],
+    summary: str = "",
+    upto: int = 0,
+    budget: int = CONTEXT_TOKEN_BUDGET,
+    keep: int = CONTEXT_KEEP_MESSAGES,
+) -> list[dict]:
+    """
+    Assemble the API message list within the token budget.
+
+    Parameters
+    ----------
+    system   : rendered system prompt
+    messages : full conversation history (extra keys such as 'time' are stripped)
+    summary  : running summary of messages[:upto]
+    upto     : index of the first message not covered by the summary
+    budget   : prompt-token budget for the whole request
+    keep     : number of trailing messages always sent verbatim
+
+    Returns
+    -------
+    list[dict]
+        role/content dicts ready for the chat-completions API.
+    """
+    head = [{"role": "system", "content": system}]
+    if summary:
+        head.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation (older turns omitted):\n{summary}",
+        })
+
+    # Walk back from the newest message and stop at the first one that no
+    # longer fits, so each turn counts only what it sends, not the whole
+    # unsummarised history.
+    used = sum(message_tokens(m) for m in head)
+    tail: list[dict] = []
+    for message in reversed(messages[upto:]):
+        cost = message_tokens(message)
+        if len(tail) >= keep and used + cost > budget:
+            break
+        used += cost
+        tail.append({"role": message["role"], "content": message["content"]})
+
+    return [*head, *reversed(tail)]
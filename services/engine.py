@@ -0,0 +1,309 @@
+"""
+services/engine.py
+──────────────────
+Headless screening engine: one `ScreeningSession` per candidate.
+
+The session owns everything a screening needs — transcript, extracted
+profile, stage tracking, pending scores, running summary and question
+prefetch — and runs the whole turn pipeline without any UI dependency:
+
+    session = ScreeningSession()
+    greeting = "".join(session.start())
+    for chunk in session.reply("Hi, I'm Jane Doe"):
+        print(chunk, end="")
+    session.poll()        # apply background scores/summaries as they land
+
+`start` and `reply` are generators of reply text so callers can stream it;
+the session's state is updated once the generator is exhausted. The
+Streamlit app (app.py) and the HTTP/WebSocket API (api/server.py) are both
+thin clients of this class. Methods block on LLM I/O and must not be called
+concurrently on one session.
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Iterator
+
+from config.settings import (
+    FAREWELL_MESSAGE, GREETING_TRIGGER, QUESTION_BANK_INTRO, PREFETCH_WAIT_SECONDS,
+    SCORE_MODE, TURN_MODE,
+)
+from services.background import submit
+from services.greeting_pool import take_greeting
+from services.llm_service import stream_ai_response, structured_turn
+from services.metrics import set_context as set_metrics_context, session_rollup
+from services.prefetch import maybe_prefetch, take_prefetched
+from services.question_bank import harvest, render_question_block
+from services.score_queue import (
+    add_answer, collect_scores, flush_block, remap_indices, schedule_score, track_reply,
+)
+from services.shared_store import common_prefix
+from services.state_manager import StageTracker, advance_stage, awaiting_stack_confirmation
+from services.summary_queue import collect_summary, maybe_schedule_summary
+from utils.extraction import update_candidate_data
+from utils.questions import is_question_block
+from utils.validators import detect_confirmation, detect_exit
+
+_log = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%H:%M")
+
+
+class ScreeningSession:
+    """State and turn pipeline of one candidate screening."""
+
+    def __init__(self, session_id: str | None = None):
+        self.session_id = session_id or uuid.uuid4().hex  # labels this session's LLM metrics
+        self.messages: list[dict] = []
+        self.candidate_data: dict = {}
+        self.extract_cursor = 0          # first message not yet scanned for profile fields
+        self.stage = "greeting"
+        self.tracker = StageTracker()
+        self.ended = False
+        self.started = False
+        self.scores: dict[int, int] = {}  # message index → accuracy score
+        self.pending_scores: dict = {}    # message index → in-flight scoring job
+        self.score_batch: dict = {"questions": [], "answers": []}
+        self.context: dict = {"summary": "", "upto": 0, "pending": None}
+        self.prefetch: dict = {"stack": None, "future": None}
+
+    # ── Persistence ────────────────────────────────────────────────────────────
+
+    def state(self) -> dict:
+        """The persistable state (see services/session_store.py, services/shared_store.py)."""
+        return {
+            "session_id":     self.session_id,
+            "stage":          self.stage,
+            "ended":          self.ended,
+            "candidate_data": self.candidate_data,
+            "messages":       self.messages,
+            "scores":         self.scores,
+        }
+
+    @classmethod
+    def restore(cls, saved: dict) -> "ScreeningSession":
+        """Rebuild a session from `state()` output; in-flight background work is not restored."""
+        session = cls(saved["session_id"])
+        session.adopt(saved)
+        session.extract_cursor = len(saved["messages"])
+        session.started = bool(saved["messages"])
+        return session
+
+    def adopt(self, saved: dict) -> None:
+        """
+        Take over a newer stored state, e.g. after another replica's
+        concurrent write was merged in.
+
+        A merge can move this session's latest messages behind the other
+        writer's. In-flight scores follow their answers to the new indices
+        (matched by identity: the merge keeps the local message objects),
+        and state derived from the old order — the stage tracker, the
+        extraction cursor and a summary reaching past the divergence — is
+        rebuilt.
+        """
+        old, new = self.messages, saved["messages"]
+        prefix = common_prefix(old, new)
+        if prefix < len(old):
+            positions = {id(message): index for index, message in enumerate(new)}
+
+            def new_index(index: int) -> int | None:
+                return index if index < prefix else positions.get(id(old[index]))
+
+            remap_indices(self.pending_scores, self.score_batch, new_index)
+            self.extract_cursor = min(self.extract_cursor, prefix)
+            pending = self.context.get("pending")
+            if self.context["upto"] > prefix or (pending and pending[1] > prefix):
+                self.context.update(summary="", upto=0, pending=None)
+
+        self.messages = new
+        self.candidate_data = saved["candidate_data"]
+        self.stage = saved["stage"]
+        self.ended = saved["ended"]
+        self.scores = saved["scores"]
+        self.tracker = StageTracker()
+        self.tracker.observe(self.messages)
+
+    # ── Turns ──────────────────────────────────────────────────────────────────
+
+    def start(self) -> Iterator[str]:
+        """Open the screening: yield the greeting (pre-generated when the pool has one)."""
+        self._label_metrics()
+        self.started = True
+        self.messages.append({"role": "user", "content": GREETING_TRIGGER})
+
+        greeting = take_greeting()
+        if greeting:
+            yield greeting
+        else:
+            greeting = yield from self._stream()
+
+        self.messages.append({"role": "assistant", "content": greeting, "time": _now()})
+        self.stage = "greeting"
+
+    def reply(self, user_input: str) -> Iterator[str]:
+        """
+        Run one candidate turn and return an iterator over the assistant reply.
+
+        Background scores and summaries that have finished are applied
+        first. The candidate's message is then added to the transcript
+        immediately (so it can be persisted before the reply is generated);
+        the reply is streamed from the LLM, or yielded whole when it comes
+        from the question bank, a structured turn or the farewell message.
+        Profile fields, stage, scores and summary are updated once the
+        iterator is exhausted.
+        """
+        self._label_metrics()
+        # Fold in background work that finished since the last turn, whether
+        # or not the client polled: a finished summary job left pending would
+        # block every later summary.
+        self.poll()
+        timestamp = _now()
+        self.messages.append({"role": "user", "content": user_input, "time": timestamp})
+        return self._reply(user_input, timestamp)
+
+    def _reply(self, user_input: str, timestamp: str) -> Iterator[str]:
+        """Body of `reply`, run as the caller consumes the reply."""
+        # Exit-intent detection
+        if detect_exit(user_input):
+            self.messages.append({"role": "assistant", "content": FAREWELL_MESSAGE, "time": timestamp})
+            self.stage = "ended"
+            self.ended = True
+            flush_block(self.pending_scores, self.score_batch)
+            self._log_usage()
+            yield FAREWELL_MESSAGE
+            return
+
+        # Score answer in the background if in technical questions stage;
+        # the reply below is generated while the score is computed. A
+        # structured turn scores the answer in the reply call itself.
+        msg_index = len(self.messages) - 1
+        technical = self.stage == "technical_questions"
+        structured = TURN_MODE == "structured"
+        if technical and not structured:
+            self._score_in_background(msg_index, user_input)
+
+        # Once the candidate confirms their stack, serve Stage 4 questions
+        # prefetched in the background, or from the question bank when it
+        # covers every declared technology.
+        response = None
+        if (
+            self.stage == "tech_stack"
+            and detect_confirmation(user_input)
+            and awaiting_stack_confirmation(self.messages)
+        ):
+            tech_stack = self.candidate_data.get("tech_stack", [])
+            block = (
+                take_prefetched(self.prefetch, tech_stack, wait=PREFETCH_WAIT_SECONDS)
+                or render_question_block(tech_stack)
+            )
+            if block:
+                response = QUESTION_BANK_INTRO + block
+                yield response
+
+        # Structured mode: one JSON call returns the reply together with the
+        # answer's score, the next stage and newly stated profile fields.
+        turn = None
+        if response is None and structured:
+            turn = structured_turn(self.messages, self.stage, self.candidate_data, self.context)
+            if turn is not None:
+                response = turn["reply"]
+                if technical and turn["score"] is not None:
+                    self.scores[msg_index] = turn["score"]
+                yield response
+                if is_question_block(response):
+                    submit(harvest, response)
+            elif technical:
+                self._score_in_background(msg_index, user_input)
+
+        # Otherwise stream the LLM response, keeping any question block it
+        # generates for the bank.
+        if response is None:
+            response = yield from self._stream()
+            if is_question_block(response):
+                submit(harvest, response)
+
+        self.messages.append({"role": "assistant", "content": response, "time": _now()})
+        self._after_reply(response, turn)
+
+    def poll(self) -> bool:
+        """
+        Apply background results that have landed: answer scores and the
+        running summary.
+
+        Returns
+        -------
+        bool
+            True if a new score arrived.
+        """
+        collect_summary(self.context)
+        return collect_scores(self.pending_scores, self.scores)
+
+    def usage(self) -> dict:
+        """This session's LLM usage rollup (see services/metrics.py)."""
+        return session_rollup(self.session_id)
+
+    # ── Internals ──────────────────────────────────────────────────────────────
+
+    def _label_metrics(self) -> None:
+        set_metrics_context(session=self.session_id, stage=self.stage)
+
+    def _stream(self) -> Iterator[str]:
+        """Yield the streamed reply and return it in full."""
+        chunks: list[str] = []
+        for chunk in stream_ai_response(self.messages, self.stage, self.candidate_data, self.context):
+            chunks.append(chunk)
+            yield chunk
+        return "".join(chunks)
+
+    def _after_reply(self, response: str, turn: dict | None) -> None:
+        """Update extracted candidate data and conversation stage after a reply."""
+        # Fields and stage reported by a structured turn take precedence over
+        # heuristics.
+        data = self.candidate_data.copy()
+        self.extract_cursor = update_candidate_data(data, self.messages, self.extract_cursor)
+        if turn is not None:
+            data.update(turn["candidate_data"])
+        self.candidate_data = data
+        maybe_prefetch(self.prefetch, self.candidate_data.get("tech_stack"))
+
+        previous_stage = self.stage
+        if turn is not None and turn["next_stage"]:
+            self.tracker.observe(self.messages)
+            self.stage = advance_stage(previous_stage, turn["next_stage"])
+        else:
+            self.stage = self.tracker.update(self.messages, previous_stage)
+        self._label_metrics()
+
+        # Fold older turns into the running summary at stage boundaries
+        collect_summary(self.context)
+        maybe_schedule_summary(self.context, self.messages, stage_changed=self.stage != previous_stage)
+
+        # Detect if the LLM itself wrapped up the conversation
+        concluded = turn is not None and self.stage == "ended"
+        if concluded or self.tracker.concluded:
+            self.stage = "ended"
+            self.ended = True
+            self._log_usage()
+
+        if SCORE_MODE == "batch" and TURN_MODE != "structured":
+            track_reply(self.pending_scores, self.score_batch, response, self.stage)
+
+    def _score_in_background(self, msg_index: int, answer: str) -> None:
+        """
+        Score a technical answer off the critical path. In batch mode the
+        answer is buffered until its question block closes.
+        """
+        batched = SCORE_MODE == "batch" and add_answer(
+            self.pending_scores, self.score_batch, msg_index, answer,
+        )
+        if not batched:
+            bot_msgs = [m for m in self.messages if m["role"] == "assistant"]
+            last_question = bot_msgs[-1]["content"] if bot_msgs else ""
+            schedule_score(self.pending_scores, msg_index, last_question, answer)
+
+    def _log_usage(self) -> None:
+        """Log the finished session's LLM usage rollup."""
+        _log.info("Session %s LLM usage: %s", self.session_id, self.usage())
@@ -0,0 +1,218 @@
+"""
+services/executor.py
+────────────────────
+Latency-budgeted execution of LLM calls: jittered retries and hedging.
+
+A stalled or rate-limited call used to surface as an error string in the
+transcript. `execute()` and `execute_stream()` wrap a registry call with:
+
+  1. Retries — retryable ProviderErrors (rate limits, connection failures,
+     5xx, timeouts) are retried after a capped exponential backoff with full
+     jitter, so concurrent sessions do not retry in lock-step.
+  2. Hedging — if an attempt has not answered by the observed p95 latency for
+     its call type, one duplicate is started and whichever answers first
+     wins. Hedging needs HEDGE_MIN_SAMPLES observations and is capped at
+     HEDGE_MAX_RATIO of calls so a slow provider never doubles load.
+
+Both stop at the call type's budget (LLM_LATENCY_BUDGETS). For streams,
+"answered" means the first fragment arrived; nothing is retried or hedged
+after that.
+
+Attempts run on their own pool in a copy of the caller's context, so metrics
+labels set by the caller (services/metrics.py) follow them.
+"""
+
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator, TypeVar
+
+from config.settings import (
+    LLM_LATENCY_BUDGETS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    HEDGE_ENABLED,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MAX_RATIO,
+    LLM_POOL_SIZE,
+)
+from services.metrics import budget_exceeded
+from services.providers import ProviderError
+
+T = TypeVar("T")
+
+_WINDOW = 200
+
+# Attempts run here so the caller can wait on them with a timeout and race a
+# hedge; kept separate from services/background.py so background jobs that
+# make LLM calls can never starve their own attempts.
+_attempt_pool = ThreadPoolExecutor(max_workers=LLM_POOL_SIZE * 2, thread_name_prefix="talentscout-llm")
+
+
+# ── Latency Tracking ───────────────────────────────────────────────────────────
+
+class LatencyTracker:
+    """Rolling per-call-type latencies and hedge usage."""
+
+    def __init__(self, window: int = _WINDOW):
+        self._latencies: dict[str, deque[float]] = {}
+        self._hedged: deque[bool] = deque(maxlen=window)
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, latency: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(kind, deque(maxlen=self._window)).append(latency)
+
+    def p95(self, kind: str) -> float | None:
+        """95th-percentile latency for `kind`, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._latencies.get(kind, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def note_call(self, hedged: bool) -> None:
+        with self._lock:
+            self._hedged.append(hedged)
+
+    def may_hedge(self) -> bool:
+        """True while hedged calls stay under HEDGE_MAX_RATIO of recent calls."""
+        with self._lock:
+            calls = len(self._hedged) or 1
+            return sum(self._hedged) / calls < HEDGE_MAX_RATIO
+
+
+tracker = LatencyTracker()
+
+
+# ── Helpers ────────────────────────────────────────────────────────────────────
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base·2^attempt))."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def _timeout(kind: str) -> ProviderError:
+    return ProviderError("executor", "timeout", f"{kind} call exceeded its latency budget")
+
+
+def _submit(fn: Callable[[], T]) -> Future:
+    """Start one attempt on the attempt pool in the caller's context."""
+    return _attempt_pool.submit(contextvars.copy_context().run, fn)
+
+
+def _race(fn: Callable[[], T], kind: str, deadline: float) -> T:
+    """
+    Run one attempt of `fn`, hedging it once if it outlives the p95 latency.
+
+    Returns the first successful result; raises the last error if every
+    started attempt failed, or a timeout ProviderError at the deadline.
+    """
+    started = time.monotonic()
+    futures: list[Future] = [_submit(fn)]
+    hedge_at = tracker.p95(kind) if HEDGE_ENABLED else None
+    hedged = False
+    error: Exception | None = None
+
+    while futures:
+        now = time.monotonic()
+        if now >= deadline:
+            tracker.note_call(hedged)
+            budget_exceeded(kind)
+            for late in futures:
+                late.add_done_callback(_discard)
+            raise _timeout(kind)
+
+        wait_for = deadline - now
+        if hedge_at is not None and not hedged:
+            wait_for = min(wait_for, max(0.0, started + hedge_at - now))
+
+        done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            futures.remove(future)
+            try:
+                result = future.result()
+            except Exception as exc:
+                error = exc
+                continue
+            tracker.record(kind, time.monotonic() - started)
+            tracker.note_call(hedged)
+            for loser in futures:
+                loser.add_done_callback(_discard)
+            return result
+
+        if (
+            not done and hedge_at is not None and not hedged
+            and time.monotonic() - started >= hedge_at and tracker.may_hedge()
+        ):
+            hedged = True
+            futures.append(_submit(fn))
+
+    tracker.note_call(hedged)
+    raise error
+
+
+def _discard(future: Future) -> None:
+    """Release a losing hedge attempt; an open stream is closed."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    result = future.result()
+    if isinstance(result, tuple) and hasattr(result[0], "close"):
+        result[0].close()
+
+
+def _run(fn: Callable[[], T], kind: str) -> T:
+    """Retry `_race(fn)` on retryable errors until attempts or budget run out."""
+    deadline = time.monotonic() + LLM_LATENCY_BUDGETS.get(kind, 60.0)
+    for attempt in range(RETRY_MAX_ATTEMPTS):
+        try:
+            return _race(fn, kind, deadline)
+        except ProviderError as exc:
+            delay = _backoff(attempt)
+            last_attempt = attempt + 1 >= RETRY_MAX_ATTEMPTS
+            if not exc.retryable or last_attempt or time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+    raise _timeout(kind)
+
+
+# ── Public API ─────────────────────────────────────────────────────────────────
+
+def execute(fn: Callable[[], T], kind: str) -> T:
+    """
+    Run a blocking LLM call under the retry/hedging policy for `kind`.
+
+    Parameters
+    ----------
+    fn   : zero-argument callable making one attempt (e.g. a registry call)
+    kind : call type, used for the latency budget and p95 tracking
+
+    Raises
+    ------
+    ProviderError
+        The last failure once retries or the budget are exhausted.
+    """
+    return _run(fn, kind)
+
+
+def execute_stream(make_stream: Callable[[], Iterator[str]], kind: str) -> Iterator[str]:
+    """
+    Stream an LLM call, retrying and hedging until the first fragment arrives.
+
+    `kind`'s latency budget and p95 apply to time-to-first-fragment; the rest
+    of the stream is relayed as-is and a later failure propagates.
+    """
+    def first_fragment() -> tuple[Iterator[str], str | None]:
+        stream = make_stream()
+        return stream, next(stream, None)
+
+    stream, first = _run(first_fragment, kind)
+    if first is None:
+        return
+    yield first
+    yield from stream
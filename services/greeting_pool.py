@@ -0,0 +1,76 @@
+"""
+services/greeting_pool.py
+─────────────────────────
+Pool of pre-generated opening messages.
+
+Every new session used to send the same hidden trigger with empty
+candidate_data, so the LLM regenerated an essentially identical greeting for
+every candidate. A small pool (GREETING_POOL_SIZE) is generated in the
+background at server start; `take_greeting()` serves a random entry
+instantly and schedules a refresh of anything missing or older than
+GREETING_MAX_AGE_SECONDS. Only one refresh job runs at a time.
+"""
+
+import random
+import threading
+import time
+
+from config.settings import GREETING_POOL_SIZE, GREETING_MAX_AGE_SECONDS
+from services.background import submit
+from services.llm_service import generate_greeting
+
+_lock = threading.Lock()
+_pool: list[tuple[float, str]] = []    # (created, greeting)
+_refreshing = False
+
+
+def _refresh_job() -> None:
+    """Top the pool up to size, replacing stale greetings one at a time."""
+    global _refreshing
+    try:
+        while True:
+            with _lock:
+                now = time.time()
+                fresh = [g for g in _pool if now - g[0] < GREETING_MAX_AGE_SECONDS]
+                if len(fresh) >= GREETING_POOL_SIZE:
+                    _pool[:] = fresh
+                    return
+            greeting = generate_greeting()
+            if not greeting:
+                return
+            with _lock:
+                stale = [i for i, g in enumerate(_pool) if now - g[0] >= GREETING_MAX_AGE_SECONDS]
+                if stale:
+                    _pool[stale[0]] = (time.time(), greeting)
+                else:
+                    _pool.append((time.time(), greeting))
+    finally:
+        with _lock:
+            _refreshing = False
+
+
+def refresh() -> None:
+    """Start a background refresh unless one is already running."""
+    global _refreshing
+    with _lock:
+        if _refreshing:
+            return
+        _refreshing = True
+    submit(_refresh_job)
+
+
+def take_greeting() -> str | None:
+    """
+    Return a pooled greeting instantly, or None while the pool is empty.
+
+    Stale greetings are still served (they are only replaced in the
+    background) so a page load never waits on the LLM when the pool exists.
+    """
+    with _lock:
+        greeting = random.choice(_pool)[1] if _pool else None
+        needs_refresh = len(_pool) < GREETING_POOL_SIZE or any(
+            time.time() - created >= GREETING_MAX_AGE_SECONDS for created, _ in _pool
+        )
+    if needs_refresh:
+        refresh()
+    return greeting
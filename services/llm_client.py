@@ -0,0 +1,124 @@
+"""
+services/llm_client.py
+──────────────────────
+Process-wide pooled Groq client.
+
+Building a `Groq()` per call means a fresh HTTP client, TLS handshake and
+connection pool on every candidate turn. Instead, one client is created per
+process and shared by every Streamlit session:
+
+  - The underlying httpx.Client is thread-safe and keeps connections alive,
+    so consecutive turns reuse an open TLS connection.
+  - The pool is sized by LLM_POOL_SIZE (config/settings.py).
+  - `warm_up()` is called once at server start to build the client and open
+    the first connection before any candidate is waiting on it.
+  - `pool_slot()` wraps every request so in-flight usage and saturation are
+    visible through `pool_stats()` and the log.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+
+import httpx
+from dotenv import load_dotenv
+from groq import Groq
+
+from config.settings import LLM_POOL_SIZE, LLM_KEEPALIVE_SECONDS, LLM_TIMEOUT_SECONDS
+
+load_dotenv()
+
+_log = logging.getLogger(__name__)
+
+_client: Groq | None = None
+_client_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats: dict[str, int] = {
+    "in_flight":      0,
+    "peak_in_flight": 0,
+    "requests":       0,
+    "saturated":      0,
+}
+
+
+# ── Client ─────────────────────────────────────────────────────────────────────
+
+def _build_client() -> Groq:
+    """Create a Groq client backed by a keep-alive connection pool."""
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=LLM_POOL_SIZE,
+            max_keepalive_connections=LLM_POOL_SIZE,
+            keepalive_expiry=LLM_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0),
+    )
+    return Groq(http_client=http_client)
+
+
+def get_client() -> Groq:
+    """Return the shared Groq client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def warm_up() -> bool:
+    """
+    Build the shared client and open its first pooled connection.
+
+    Returns
+    -------
+    bool
+        True if the API answered, False if the warm-up request failed. A
+        failure is logged but never raised — the first real call will simply
+        pay the connection cost instead.
+    """
+    try:
+        with pool_slot():
+            get_client().models.list()
+        return True
+    except Exception as exc:
+        _log.warning("LLM client warm-up failed: %s", exc)
+        return False
+
+
+# ── Pool Accounting ────────────────────────────────────────────────────────────
+
+@contextmanager
+def pool_slot():
+    """
+    Track one in-flight request against the connection pool.
+
+    When more requests are in flight than LLM_POOL_SIZE, httpx queues the
+    extra ones until a connection frees up; that is counted as a saturation
+    event and logged so the pool can be resized.
+    """
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["in_flight"] += 1
+        in_flight = _stats["in_flight"]
+        _stats["peak_in_flight"] = max(_stats["peak_in_flight"], in_flight)
+        saturated = in_flight > LLM_POOL_SIZE
+        if saturated:
+            _stats["saturated"] += 1
+    if saturated:
+        _log.warning(
+            "LLM connection pool saturated: %d requests in flight, pool size %d",
+            in_flight, LLM_POOL_SIZE,
+        )
+    try:
+        yield
+    finally:
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+
+
+def pool_stats() -> dict[str, int]:
+    """Return a snapshot of connection-pool usage counters."""
+    with _stats_lock:
+        return {**_stats, "pool_size": LLM_POOL_SIZE}
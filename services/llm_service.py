@@ -1,73 +1,216 @@
 """
-Handles all communication with the Groq API (free tier).
-"""
-from dotenv import load_dotenv
-load_dotenv()
+Handles all communication with the LLM backends.
 
+Every call goes through the provider registry (services/providers.py), which
+routes to Groq by default and fails over to the next configured provider
+when the primary is unhealthy.
+"""
+import hashlib
 import json
-import streamlit as st
-from groq import Groq, AuthenticationError, RateLimitError, APIConnectionError, APIStatusError
+from typing import Iterator
+
+from config.prompt import SYSTEM_PROMPT, STRUCTURED_TURN_PROMPT
+from config.settings import GREETING_TRIGGER
+from services.context_builder import build_context
+from services.executor import execute, execute_stream
+from services.model_router import route
+from services.providers import ProviderError, get_registry
+from services.score_cache import get_cache, make_key
+from services.single_flight import flights, request_key
+from utils.turn_envelope import parse_turn_envelope
+
+_INTERRUPTED_NOTICE = "\n\n⚠️ *The response was interrupted. Please send your last message again.*"
 
 
-from config.prompt import SYSTEM_PROMPT
-from dotenv import load_dotenv
-load_dotenv()
+def _build_messages(
+    messages: list[dict],
+    stage: str = "greeting",
+    candidate_data: dict | None = None,
+    context: dict | None = None,
+    structured: bool = False,
+) -> list[dict]:
+    """
+    Prepend the stage-aware system prompt and fit the history to the token budget.
+
+    stage, candidate_data and context (running summary) describe the session
+    the history belongs to. `structured` appends the JSON envelope
+    instructions.
+    """
+    candidate_data = candidate_data or {}
+    context = context or {}
 
-_MODEL      = "llama-3.3-70b-versatile"   
-_MAX_TOKENS = 1024
+    system = SYSTEM_PROMPT.format(
+        stage=stage,
+        candidate_data=json.dumps(candidate_data, indent=2),
+    )
+    if structured:
+        system += STRUCTURED_TURN_PROMPT.format()
+    return build_context(system, messages, context.get("summary", ""), context.get("upto", 0))
 
 
-def get_ai_response(messages: list[dict]) -> str:
+def _complete(kind: str, messages: list[dict], **overrides) -> str:
     """
-    Send the conversation history to Groq and return the assistant reply.
+    Run one completion through the registry on the model tier routed for
+    `kind`, under its retry/hedging policy, merged with any byte-identical
+    request already in flight. `overrides` replace the tier's defaults.
+    """
+    return _complete_served(kind, messages, **overrides)[0]
+
+
+def _complete_served(kind: str, messages: list[dict], **overrides) -> tuple[str, str]:
+    """`_complete`, also returning the model that answered (it differs after a failover)."""
+    params = {**route(kind), **overrides}
+
+    def attempt() -> tuple[str, str]:
+        served: dict = {}
+        text = get_registry().complete(messages, call_type=kind, served=served, **params)
+        return text, served["model"]
+
+    return flights.do(request_key(kind, messages, params), lambda: execute(attempt, kind))
+
+
+def _stream(kind: str, messages: list[dict], **overrides) -> Iterator[str]:
+    """Streaming counterpart of `_complete`; identical streams share one upstream call."""
+    params = {**route(kind), **overrides}
+    key = request_key(kind, "stream", messages, params)
+    return flights.stream(
+        key, lambda: execute_stream(lambda: get_registry().stream(messages, call_type=kind, **params), kind)
+    )
+
+
+def _error_message(exc: ProviderError) -> str:
+    """Map a provider failure to a user-friendly error string."""
+    if exc.kind == "auth":
+        return (
+            "⚠️ Authentication failed. Please check that your "
+            f"`{exc.provider.upper()}_API_KEY` environment variable is set correctly."
+        )
+    if exc.kind == "rate_limit":
+        return "⚠️ Rate limit reached. Please wait a moment and try again."
+    if exc.kind == "timeout":
+        return "⚠️ The assistant is taking too long to respond. Please try again."
+    if exc.kind == "connection":
+        return (
+            f"⚠️ Could not reach the {exc.provider.title()} API. "
+            "Please check your internet connection and try again."
+        )
+    return f"⚠️ API error ({exc.status_code}): {exc.message[:120]}. Please try again."
+
+
+def _model_key(kind: str) -> str:
+    """
+    Model label for cache lookups: the primary provider's model for `kind`.
+
+    Results are stored under the model that actually answered, so a score
+    from a failover provider is never served as the primary model's.
+    """
+    return get_registry().primary.model_for(route(kind)["tier"])
+
+
+def get_ai_response(
+    messages: list[dict], stage: str = "greeting", candidate_data: dict | None = None, context: dict | None = None,
+) -> str:
+    """
+    Send the conversation history to the LLM and return the assistant reply.
 
     Parameters
     ----------
-    messages : list[dict]
+    messages       : list[dict]
         Full conversation history. Extra keys (e.g. 'time') are stripped.
+    stage          : current conversation stage
+    candidate_data : profile fields collected so far
+    context        : the session's running summary state
 
     Returns
     -------
     str
         The assistant's text response, or a user-friendly error string.
     """
-    client = Groq()  
+    try:
+        return _complete("reply", _build_messages(messages, stage, candidate_data, context))
+    except ProviderError as exc:
+        return _error_message(exc)
 
-  
-    system = SYSTEM_PROMPT.format(
-        stage=st.session_state.get("stage", "greeting"),
-        candidate_data=json.dumps(
-            st.session_state.get("candidate_data", {}), indent=2
-        ),
-    )
 
-    api_messages = [
-        {"role": m["role"], "content": m["content"]}
-        for m in messages
-    ]
+def stream_ai_response(
+    messages: list[dict], stage: str = "greeting", candidate_data: dict | None = None, context: dict | None = None,
+) -> Iterator[str]:
+    """
+    Stream the assistant reply, yielding text chunks as they arrive.
+
+    Errors never propagate to the caller. If the request fails before any
+    text arrives, the same user-friendly error string as `get_ai_response`
+    is yielded instead. If the stream breaks partway, an interruption notice
+    is appended so the partial reply is never mistaken for a complete one.
 
+    Parameters
+    ----------
+    messages, stage, candidate_data, context
+        As for `get_ai_response`.
+
+    Yields
+    ------
+    str
+        Successive fragments of the assistant's reply.
+    """
+    received = False
     try:
-        response = client.chat.completions.create(
-            model=_MODEL,
-            max_tokens=_MAX_TOKENS,
-            messages=[{"role": "system", "content": system}, *api_messages],
-        )
-        return response.choices[0].message.content
+        for delta in _stream("reply", _build_messages(messages, stage, candidate_data, context)):
+            received = True
+            yield delta
+    except ProviderError as exc:
+        yield _INTERRUPTED_NOTICE if received else _error_message(exc)
 
-    except AuthenticationError:
-        return (
-            "⚠️ Authentication failed. Please check that your "
-            "`GROQ_API_KEY` environment variable is set correctly."
-        )
-    except RateLimitError:
-        return "⚠️ Rate limit reached. Please wait a moment and try again."
-    except APIConnectionError:
-        return (
-            "⚠️ Could not reach the Groq API. "
-            "Please check your internet connection and try again."
+
+def structured_turn(
+    messages: list[dict], stage: str = "greeting", candidate_data: dict | None = None, context: dict | None = None,
+) -> dict | None:
+    """
+    Run one turn as a single JSON-mode call (TURN_MODE "structured").
+
+    Parameters
+    ----------
+    messages : list[dict]
+        Full conversation history, ending with the candidate's message.
+    stage, candidate_data, context
+        As for `get_ai_response`.
+
+    Returns
+    -------
+    dict | None
+        The parsed envelope — reply, score and feedback for the candidate's
+        latest answer, next stage and newly stated candidate fields (see
+        utils/turn_envelope.py) — or None if the call failed or returned no
+        usable reply, in which case the caller streams the turn instead.
+    """
+    try:
+        raw = _complete(
+            "turn", _build_messages(messages, stage, candidate_data, context, structured=True), json_mode=True,
         )
-    except APIStatusError as exc:
-        return f"⚠️ API error ({exc.status_code}): {str(exc.message)[:120]}. Please try again."
+    except ProviderError:
+        return None
+    return parse_turn_envelope(raw)
+
+
+def generate_greeting() -> str | None:
+    """
+    Generate a fresh opening message for a new session, independent of any
+    session state (safe to call from background threads).
+
+    Returns
+    -------
+    str | None
+        The greeting, or None if the call failed.
+    """
+    api_messages = _build_messages(
+        [{"role": "user", "content": GREETING_TRIGGER}],
+        stage="greeting", candidate_data={}, context={},
+    )
+    try:
+        return _complete("reply", api_messages)
+    except ProviderError:
+        return None
+
 
 _SCORE_PROMPT = """You are a technical interviewer. Score this answer strictly.
 Question: {question}
@@ -75,19 +218,136 @@ Answer: {answer}
 Respond ONLY with valid JSON, no other text:
 {{"score": <integer 0-100>, "feedback": "<one sentence>"}}"""
 
+# Bumps automatically whenever the scoring prompt is edited, so cached scores
+# from an older prompt are never served.
+_SCORE_PROMPT_VERSION = hashlib.sha1(_SCORE_PROMPT.encode("utf-8")).hexdigest()[:10]
+
 def score_answer(question: str, answer: str) -> dict | None:
     """Score a candidate's technical answer. Returns dict with 'score' key or None."""
-    client = Groq()
+    cache = get_cache()
+    key = make_key(question, answer, _model_key("score"), _SCORE_PROMPT_VERSION)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        prompt = [{"role": "user", "content": _SCORE_PROMPT.format(question=question, answer=answer)}]
+        raw, model = _complete_served("score", prompt)
+        raw = raw.strip().replace("```json","").replace("```","")
+        result = json.loads(raw)
+    except Exception:
+        return None
+
+    if isinstance(result, dict) and "score" in result:
+        cache.put(make_key(question, answer, model, _SCORE_PROMPT_VERSION), result)
+    return result
+
+
+_SUMMARY_PROMPT = """You maintain a running summary of a candidate screening conversation.
+Existing summary:
+{summary}
+
+New conversation turns:
+{turns}
+
+Rewrite the summary so it also covers the new turns. Keep every fact the
+candidate stated (background, skills, experience), which technical questions
+were asked and how well each was answered. Plain text, at most 200 words."""
+
+def summarize_history(summary: str, messages: list[dict]) -> str | None:
+    """Fold `messages` into the running `summary`. Returns the new summary or None."""
+    turns = "\n".join(
+        f"{'Candidate' if m['role'] == 'user' else 'Assistant'}: {m['content']}"
+        for m in messages
+    )
+    prompt = [{"role": "user", "content": _SUMMARY_PROMPT.format(
+        summary=summary or "(none yet)", turns=turns
+    )}]
     try:
-        response = client.chat.completions.create(
-            model=_MODEL,
-            max_tokens=80,
-            temperature=0.1,
-            messages=[{"role": "user", "content": _SCORE_PROMPT.format(
-                question=question, answer=answer
-            )}],
+        return _complete("summary", prompt).strip()
+    except Exception:
+        return None
+
+
+_BATCH_SCORE_PROMPT = """You are a technical interviewer. Score a candidate's answers strictly.
+Questions:
+{questions}
+
+Candidate messages, in the order they were sent:
+{answers}
+
+Each message may answer one or several of the questions. For every question,
+identify the message that answers it (null if none does) and score that answer.
+Respond ONLY with a JSON object of this shape:
+{{"scores": [{{"question": <question number>, "message": <message number or null>,
+"score": <integer 0-100>, "feedback": "<one sentence>"}}]}}"""
+
+_BATCH_SCORE_PROMPT_VERSION = hashlib.sha1(_BATCH_SCORE_PROMPT.encode("utf-8")).hexdigest()[:10]
+
+def score_section(questions: list[str], answers: list[str]) -> list[dict] | None:
+    """
+    Score every answer to a question block in one structured-output call.
+
+    Parameters
+    ----------
+    questions : the block's questions, in order
+    answers   : the candidate's messages sent while the block was open
+
+    Returns
+    -------
+    list[dict] | None
+        One {"question", "message", "score", "feedback"} dict per question
+        (1-based numbers, "message" may be None), or None on failure.
+    """
+    cache = get_cache()
+    key = make_key("\n".join(questions), "\n\n".join(answers), _model_key("score"), _BATCH_SCORE_PROMPT_VERSION)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["scores"]
+
+    prompt = [{"role": "user", "content": _BATCH_SCORE_PROMPT.format(
+        questions="\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1)),
+        answers="\n".join(f"Message {i}: {a}" for i, a in enumerate(answers, 1)),
+    )}]
+    try:
+        raw, model = _complete_served(
+            "score", prompt, max_tokens=60 * len(questions) + 40, json_mode=True,
         )
-        raw = response.choices[0].message.content.strip().replace("```json","").replace("```","")
-        return json.loads(raw)
+        raw = raw.strip().replace("```json","").replace("```","")
+        scores = json.loads(raw)["scores"]
+    except Exception:
+        return None
+
+    if not isinstance(scores, list):
+        return None
+    key = make_key("\n".join(questions), "\n\n".join(answers), model, _BATCH_SCORE_PROMPT_VERSION)
+    cache.put(key, {"scores": scores})
+    return scores
+
+
+_QUESTION_SET_PROMPT = """You write technical screening questions for recruiters.
+Technology: {tech}{version}
+Write {per_tier} distinct questions for each difficulty tier:
+  beginner     — conceptual
+  intermediate — real-world scenario ("In a production app, how would you…")
+  advanced     — architecture or edge cases
+Each question is one or two sentences and answerable in a short paragraph.
+Respond ONLY with a JSON object of this shape:
+{{"beginner": ["..."], "intermediate": ["..."], "advanced": ["..."]}}"""
+
+def generate_question_set(tech: str, version: str, per_tier: int) -> dict[str, list[str]] | None:
+    """Generate fresh bank questions for one technology, keyed by difficulty tier."""
+    prompt = [{"role": "user", "content": _QUESTION_SET_PROMPT.format(
+        tech=tech, version=f" {version}" if version else "", per_tier=per_tier,
+    )}]
+    try:
+        raw = _complete("questions", prompt, max_tokens=120 * per_tier * 3, temperature=0.9, json_mode=True)
+        result = json.loads(raw.strip().replace("```json","").replace("```",""))
     except Exception:
-        return None
\ No newline at end of file
+        return None
+    if not isinstance(result, dict):
+        return None
+    return {
+        tier: [q for q in questions if isinstance(q, str) and q.strip()]
+        for tier, questions in result.items() if isinstance(questions, list)
+    }
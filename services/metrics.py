@@ -0,0 +1,367 @@
+"""
+services/metrics.py
+───────────────────
+In-process metrics for every LLM provider call.
+
+The provider registry wraps each call in a `CallTimer`, which records on
+completion:
+
+  - total latency and, for streams, time to first token (histograms);
+  - prompt and completion tokens from the response `usage` — estimated
+    locally when a provider does not report them;
+  - labels call_type, stage, provider, model and outcome ("ok", "cancelled"
+    or the ProviderError kind).
+
+Stage and session are ambient: the app calls `set_context()` at the top of
+each run, and services/background.py, services/executor.py and
+services/single_flight.py copy the caller's context into their worker
+threads, so side-calls are attributed to the session that caused them.
+
+`render()` produces the Prometheus text exposition, including the LLM
+connection pool and score cache counters; `start_exporter()`
+writes it to METRICS_FILE periodically and/or serves it on METRICS_PORT.
+`session_rollup()` totals one session's calls, tokens and latency.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config.settings import (
+    METRICS_FILE,
+    METRICS_WRITE_SECONDS,
+    METRICS_PORT,
+    METRICS_SESSION_LIMIT,
+)
+from services.context_builder import count_tokens, message_tokens
+from services.score_cache import cache_stats
+
+_log = logging.getLogger(__name__)
+
+_PREFIX = "talentscout_llm"
+_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+_TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+_LABELS = ("call_type", "stage", "provider", "model", "outcome")
+
+_HELP = {
+    "latency_seconds":         ("histogram", "Total LLM call latency."),
+    "ttft_seconds":            ("histogram", "Time to first streamed token."),
+    "prompt_tokens":           ("histogram", "Prompt tokens per LLM call."),
+    "completion_tokens":       ("histogram", "Completion tokens per LLM call."),
+    "requests_total":          ("counter",   "LLM calls by outcome."),
+    "tokens_estimated_total":  ("counter",   "Calls whose token counts were estimated locally."),
+    "budget_exceeded_total":   ("counter",   "Calls abandoned at their latency budget."),
+}
+
+_context: contextvars.ContextVar[dict] = contextvars.ContextVar("talentscout_metrics", default={})
+
+
+# ── Context ────────────────────────────────────────────────────────────────────
+
+def set_context(**labels: str) -> None:
+    """Set ambient labels (session, stage) for calls made from this context."""
+    _context.set({**_context.get(), **labels})
+
+
+def current_context() -> dict:
+    """The ambient labels of the calling context."""
+    return _context.get()
+
+
+# ── Storage ────────────────────────────────────────────────────────────────────
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class MetricsStore:
+    """Thread-safe histograms, counters and per-session rollups."""
+
+    def __init__(self, session_limit: int = METRICS_SESSION_LIMIT):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[tuple, _Histogram]] = {}
+        self._counters: dict[str, dict[tuple, float]] = {}
+        self._sessions: OrderedDict[str, dict] = OrderedDict()
+        self._session_limit = session_limit
+
+    def observe(self, name: str, labels: tuple, value: float, buckets: tuple) -> None:
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = _Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name: str, labels: tuple, amount: float = 1.0) -> None:
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def add_to_session(self, session: str, call_type: str, outcome: str,
+                       latency: float, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            rollup = self._sessions.get(session)
+            if rollup is None:
+                rollup = self._sessions[session] = {
+                    "calls": 0, "errors": 0, "prompt_tokens": 0,
+                    "completion_tokens": 0, "latency_s": 0.0, "by_call_type": {},
+                }
+                while len(self._sessions) > self._session_limit:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session)
+            rollup["calls"] += 1
+            rollup["errors"] += outcome not in ("ok", "cancelled")
+            rollup["prompt_tokens"] += prompt_tokens
+            rollup["completion_tokens"] += completion_tokens
+            rollup["latency_s"] += latency
+            rollup["by_call_type"][call_type] = rollup["by_call_type"].get(call_type, 0) + 1
+
+    def session(self, session: str) -> dict:
+        with self._lock:
+            rollup = self._sessions.get(session)
+            if rollup is None:
+                return {}
+            return {**rollup, "latency_s": round(rollup["latency_s"], 3),
+                    "by_call_type": dict(rollup["by_call_type"])}
+
+    def snapshot(self) -> tuple[dict, dict]:
+        """Copies of the histogram and counter series."""
+        with self._lock:
+            histograms = {
+                name: {labels: (h.buckets, list(h.counts), h.sum, h.count) for labels, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        return histograms, counters
+
+
+store = MetricsStore()
+
+
+# ── Recording ──────────────────────────────────────────────────────────────────
+
+class CallTimer:
+    """
+    Times one provider call and records it on `finish()`.
+
+    Providers fill `usage` ({"prompt_tokens", "completion_tokens"}) when the
+    API reports it; `output()` accumulates the completion text for the
+    fallback estimate.
+    """
+
+    def __init__(self, call_type: str, provider: str, model: str, messages: list[dict]):
+        context = _context.get()
+        self.call_type = call_type or "unknown"
+        self.stage = context.get("stage", "none")
+        self.session = context.get("session")
+        self.provider = provider
+        self.model = model
+        self.usage: dict[str, int] = {}
+        self._messages = messages
+        self._output: list[str] = []
+        self._started = time.monotonic()
+        self._ttft: float | None = None
+
+    def first_token(self) -> None:
+        if self._ttft is None:
+            self._ttft = time.monotonic() - self._started
+
+    def output(self, text: str) -> None:
+        self._output.append(text)
+
+    def finish(self, outcome: str) -> None:
+        latency = time.monotonic() - self._started
+        labels = (self.call_type, self.stage, self.provider, self.model, outcome)
+
+        prompt = self.usage.get("prompt_tokens")
+        completion = self.usage.get("completion_tokens")
+        if outcome == "ok" and (prompt is None or completion is None):
+            store.increment("tokens_estimated_total", labels[:4] + ("ok",))
+        if prompt is None:
+            prompt = sum(message_tokens(m) for m in self._messages)
+        if completion is None:
+            completion = count_tokens("".join(self._output))
+
+        store.increment("requests_total", labels)
+        store.observe("latency_seconds", labels, latency, _LATENCY_BUCKETS)
+        if self._ttft is not None:
+            store.observe("ttft_seconds", labels, self._ttft, _LATENCY_BUCKETS)
+        if outcome == "ok":
+            store.observe("prompt_tokens", labels, prompt, _TOKEN_BUCKETS)
+            store.observe("completion_tokens", labels, completion, _TOKEN_BUCKETS)
+        if self.session:
+            store.add_to_session(
+                self.session, self.call_type, outcome, latency,
+                prompt if outcome == "ok" else 0, completion if outcome == "ok" else 0,
+            )
+
+
+def budget_exceeded(call_type: str) -> None:
+    """Count a call the executor abandoned at its latency budget."""
+    stage = _context.get().get("stage", "none")
+    store.increment("budget_exceeded_total", (call_type, stage, "", "", "timeout"))
+
+
+def session_rollup(session: str) -> dict:
+    """Calls, errors, tokens and summed latency for one session ({} if unknown)."""
+    return store.session(session)
+
+
+# ── Exposition ─────────────────────────────────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: tuple, extra: str = "") -> str:
+    pairs = [f'{key}="{_escape(value)}"' for key, value in zip(_LABELS, labels) if value != ""]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _process_lines() -> list[str]:
+    """Gauges and counters for our own process: the LLM connection pool and the score cache."""
+    try:
+        from services.llm_client import pool_stats
+    except ImportError:
+        return []
+    stats = pool_stats()
+    lines = [
+        f"# TYPE {_PREFIX}_pool_in_flight gauge",
+        f"{_PREFIX}_pool_in_flight {stats['in_flight']}",
+        f"# TYPE {_PREFIX}_pool_size gauge",
+        f"{_PREFIX}_pool_size {stats['pool_size']}",
+        f"# TYPE {_PREFIX}_pool_saturated_total counter",
+        f"{_PREFIX}_pool_saturated_total {stats['saturated']}",
+    ]
+
+    cache = cache_stats()
+    if cache:
+        metric = f"{_PREFIX}_score_cache"
+        lines += [
+            f"# HELP {metric}_lookups_total Score cache lookups by result.",
+            f"# TYPE {metric}_lookups_total counter",
+            f'{metric}_lookups_total{{result="memory_hit"}} {cache["memory_hits"]}',
+            f'{metric}_lookups_total{{result="disk_hit"}} {cache["disk_hits"]}',
+            f'{metric}_lookups_total{{result="miss"}} {cache["misses"]}',
+            f"# HELP {metric}_evictions_total Score cache entries evicted by tier.",
+            f"# TYPE {metric}_evictions_total counter",
+            f'{metric}_evictions_total{{tier="memory"}} {cache["memory_evictions"]}',
+            f'{metric}_evictions_total{{tier="disk"}} {cache["disk_evictions"]}',
+            f"# TYPE {metric}_stores_total counter",
+            f"{metric}_stores_total {cache['stores']}",
+            f"# TYPE {metric}_memory_entries gauge",
+            f"{metric}_memory_entries {cache['memory_size']}",
+        ]
+    return lines
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    histograms, counters = store.snapshot()
+    lines: list[str] = []
+    for name, (kind, help_text) in _HELP.items():
+        metric = f"{_PREFIX}_{name}"
+        if kind == "histogram" and name in histograms:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for labels, (buckets, counts, total, count) in histograms[name].items():
+                cumulative = 0
+                for bound, n in zip(buckets, counts):
+                    cumulative += n
+                    le = f'le="{bound}"'
+                    lines.append(f"{metric}_bucket{_label_text(labels, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{metric}_bucket{_label_text(labels, le)} {count}")
+                lines.append(f"{metric}_sum{_label_text(labels)} {total}")
+                lines.append(f"{metric}_count{_label_text(labels)} {count}")
+        elif kind == "counter" and name in counters:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            for labels, value in counters[name].items():
+                lines.append(f"{metric}{_label_text(labels)} {value:g}")
+    lines += _process_lines()
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path: str = METRICS_FILE) -> None:
+    """Atomically replace `path` with the current exposition."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def _write_loop(path: str, interval: float) -> None:
+    while True:
+        try:
+            write_file(path)
+        except OSError as exc:
+            _log.warning("Could not write metrics to %s: %s", path, exc)
+        time.sleep(interval)
+
+
+def start_exporter(path: str = METRICS_FILE, port: int = METRICS_PORT) -> None:
+    """Start the file writer and/or HTTP endpoint once per process."""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    if path:
+        threading.Thread(
+            target=_write_loop, args=(path, METRICS_WRITE_SECONDS),
+            name="talentscout-metrics-file", daemon=True,
+        ).start()
+    if port > 0:
+        try:
+            server = ThreadingHTTPServer(("", port), _Handler)
+        except OSError as exc:
+            _log.warning("Metrics endpoint not started on port %d: %s", port, exc)
+            return
+        threading.Thread(
+            target=server.serve_forever, name="talentscout-metrics-http", daemon=True,
+        ).start()
+        _log.info("Serving LLM metrics at http://0.0.0.0:%d/metrics", port)
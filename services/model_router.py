@@ -0,0 +1,91 @@
+"""
+services/model_router.py
+────────────────────────
+Maps each LLM call type to a model tier and its generation parameters.
+
+Conversation replies need the big model; scoring and summarisation do not,
+and running them on a fast model frees rate-limit headroom for the replies
+candidates actually see. CALL_TIERS and MODEL_TIERS (config/settings.py)
+define the mapping; each provider maps a tier to its own model name.
+
+Stage classification has no tier because it makes no LLM call: stages are
+inferred from the transcript by regex signals (StageTracker in
+services/state_manager.py), and a structured turn reports its next stage
+in the reply call itself.
+
+A tier with "downgrade_to" is temporarily routed to that smaller tier when
+the p95 latency of the model serving it exceeds DOWNGRADE_P95_SECONDS or
+the connection pool is more than DOWNGRADE_POOL_RATIO busy. Latency is
+tracked per model by the provider registry, so calls already downgraded
+never count against the big model. A downgrade holds for at least
+DOWNGRADE_HOLD_SECONDS and clears the big model's samples, so after it
+ends the decision rests on fresh calls rather than the slow ones that
+caused it, and routing does not flip back and forth on every call.
+"""
+
+import logging
+import threading
+import time
+
+from config.settings import (
+    CALL_TIERS,
+    MODEL_TIERS,
+    DOWNGRADE_P95_SECONDS,
+    DOWNGRADE_POOL_RATIO,
+    DOWNGRADE_HOLD_SECONDS,
+    DOWNGRADE_MIN_SAMPLES,
+)
+from services.llm_client import pool_stats
+from services.providers import get_registry
+
+_log = logging.getLogger(__name__)
+
+# Downgraded tier → monotonic time the downgrade (re)started.
+_downgraded: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def _overloaded(tier: str) -> bool:
+    """True while the tier's model is slow or the connection pool is nearly full."""
+    p95 = get_registry().latency_p95(tier, DOWNGRADE_MIN_SAMPLES)
+    if p95 is not None and p95 > DOWNGRADE_P95_SECONDS:
+        return True
+    stats = pool_stats()
+    return stats["in_flight"] >= stats["pool_size"] * DOWNGRADE_POOL_RATIO
+
+
+def _downgrade(tier: str, downgrade_to: str, call_type: str) -> bool:
+    """Decide whether `tier` is downgraded right now, holding each downgrade."""
+    now = time.monotonic()
+    with _lock:
+        since = _downgraded.get(tier)
+        if since is not None and now - since < DOWNGRADE_HOLD_SECONDS:
+            return True
+        if _overloaded(tier):
+            if since is None:
+                _log.warning("Model tier %s downgraded to %s for %s calls", tier, downgrade_to, call_type)
+            _downgraded[tier] = now
+            get_registry().reset_latency(tier)
+            return True
+        if since is not None:
+            del _downgraded[tier]
+            _log.info("Model tier %s restored", tier)
+        return False
+
+
+def route(call_type: str) -> dict:
+    """
+    Return {"tier", "max_tokens", "temperature"} for a call type.
+
+    Parameters
+    ----------
+    call_type : "reply", "turn", "score", "summary", "questions", …
+        Unknown call types use the conversation tier.
+    """
+    tier = CALL_TIERS.get(call_type, "conversation")
+    downgrade_to = MODEL_TIERS[tier].get("downgrade_to")
+    if downgrade_to and _downgrade(tier, downgrade_to, call_type):
+        tier = downgrade_to
+
+    spec = MODEL_TIERS[tier]
+    return {"tier": tier, "max_tokens": spec["max_tokens"], "temperature": spec["temperature"]}
@@ -0,0 +1,123 @@
+"""
+services/persistence.py
+───────────────────────
+Saving and resuming `ScreeningSession`s through the configured stores.
+
+Two stores can be enabled independently (config/settings.py):
+  - the local SQLite archive (services/session_store.py), write-behind;
+  - the shared live store (services/shared_store.py), versioned.
+
+A session is addressed by an opaque resume token. `resume(token)` looks in
+the shared store first, then the archive. A `SessionPersister` remembers
+what of its session has already been written, so each `save` only sends the
+messages, scores and state that changed since the previous one.
+"""
+
+import json
+import secrets
+
+from services.engine import ScreeningSession
+from services.session_store import get_store
+from services.shared_store import VersionConflict, common_prefix, get_shared_store
+
+
+def enabled() -> bool:
+    """True if at least one session store is configured."""
+    return get_store() is not None or get_shared_store() is not None
+
+
+def new_token() -> str:
+    """A fresh, unguessable resume token."""
+    return secrets.token_urlsafe(16)
+
+
+def _snapshot(state: dict) -> tuple:
+    return state["stage"], state["ended"], json.dumps(state["candidate_data"], sort_keys=True)
+
+
+class SessionPersister:
+    """Writes one session's changes to the configured stores."""
+
+    def __init__(self, token: str, version: int = 0, saved: dict | None = None):
+        self.token = token
+        self.version = version  # version of the session's record in the shared store
+        self._messages = len(saved["messages"]) if saved else 0
+        self._scores: dict[int, int] = dict(saved["scores"]) if saved else {}
+        self._state = _snapshot(saved) if saved else None
+
+    def save(self, session: ScreeningSession) -> None:
+        """
+        Write whatever changed since the last call.
+
+        The SQLite archive is write-behind and never blocks. The shared store
+        is written synchronously (one small versioned record) so another
+        replica resuming the session sees this turn; if another writer got
+        there first, the merged state is adopted by `session`.
+        """
+        store, shared = get_store(), get_shared_store()
+        state = session.state()
+        changed = False
+
+        snapshot = _snapshot(state)
+        if snapshot != self._state:
+            if store is not None:
+                store.save_session(
+                    self.token, session.session_id, session.stage, session.ended, session.candidate_data,
+                )
+            self._state = snapshot
+            changed = True
+
+        if len(session.messages) > self._messages:
+            if store is not None:
+                store.save_messages(self.token, session.messages, self._messages)
+            self._messages = len(session.messages)
+            changed = True
+
+        for idx, score in session.scores.items():
+            if self._scores.get(idx) != score:
+                if store is not None:
+                    store.save_score(self.token, idx, score)
+                self._scores[idx] = score
+                changed = True
+
+        if shared is None or not changed:
+            return
+        try:
+            self.version, stored = shared.save(self.token, state, self.version)
+        except VersionConflict:
+            return  # persistently contended: the next save retries
+        if stored is not state:
+            self._resync(store, state["messages"], stored)
+            session.adopt(stored)
+
+    def _resync(self, store, local: list[dict], merged: dict) -> None:
+        """
+        Align the archive and this persister with a merged state: from the
+        point where the local log diverged, messages and scores are rewritten
+        in the merged order.
+        """
+        prefix = common_prefix(local, merged["messages"])
+        if store is not None:
+            store.save_session(
+                self.token, merged["session_id"], merged["stage"], merged["ended"], merged["candidate_data"],
+            )
+            store.save_messages(self.token, merged["messages"], prefix)
+            store.rewrite_scores(self.token, merged["scores"], prefix)
+        self._messages = len(merged["messages"])
+        self._scores = dict(merged["scores"])
+        self._state = _snapshot(merged)
+
+
+def resume(token: str) -> tuple[ScreeningSession, SessionPersister] | None:
+    """Load the session saved under `token`, or None if no store knows it."""
+    store, shared = get_store(), get_shared_store()
+    saved, version = None, 0
+    if shared is not None:
+        found = shared.load(token)
+        if found is not None:
+            version, saved = found
+    if saved is None and store is not None:
+        saved = store.load(token)
+    if saved is None:
+        return None
+    return ScreeningSession.restore(saved), SessionPersister(token, version, saved)
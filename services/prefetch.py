@@ -0,0 +1,71 @@
+"""
+services/prefetch.py
+────────────────────
+Speculative background generation of Stage 4 questions.
+
+As soon as `tech_stack` is extracted we know what Stage 4 will need, but the
+questions used to be generated only after the Stage 3 confirmation
+round-trip. `maybe_prefetch()` starts building the question block in the
+background right away — filling any gaps in the question bank through the
+LLM — while the candidate is still typing. The confirmation turn then takes
+the finished block with `take_prefetched()`.
+
+Per-session state (session_state.prefetch): {"stack": tuple | None, "future": Future | None}.
+The prefetch is keyed on the canonical stack; if the extracted stack changes,
+the old result is discarded and a new prefetch starts. Items the taxonomy
+does not know are left out: the known techs are still filled in the bank,
+but only a fully known stack is served from the prefetched block.
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from services.background import submit
+from services.question_bank import fill, known_techs, render_techs, sample_questions, stack_techs
+
+
+def _build_block(techs: tuple[tuple[str, str], ...]) -> str | None:
+    """Worker body: fill uncovered techs in the bank, then sample the block."""
+    for tech, version in techs:
+        if sample_questions(tech, version) is None:
+            fill(tech, version, source="prefetch")
+    return render_techs(list(techs))
+
+
+def maybe_prefetch(state: dict, tech_stack: list[str] | None) -> bool:
+    """
+    Start (or restart) the prefetch for the current stack.
+
+    Returns
+    -------
+    bool
+        True if a new background job was submitted.
+    """
+    techs = known_techs(tech_stack or [])
+    signature = tuple(techs) if techs else None
+    if signature == state.get("stack"):
+        return False
+
+    if state.get("future") is not None:
+        state["future"].cancel()
+    state["stack"] = signature
+    state["future"] = submit(_build_block, signature) if signature else None
+    return state["future"] is not None
+
+
+def take_prefetched(state: dict, tech_stack: list[str] | None, wait: float = 0.0) -> str | None:
+    """
+    Return the prefetched block for `tech_stack`, waiting up to `wait` seconds.
+
+    Returns None if nothing was prefetched for this exact stack, the job
+    failed, or it is still running after `wait`.
+    """
+    techs = stack_techs(tech_stack or [])
+    future = state.get("future")
+    if future is None or not techs or tuple(techs) != state.get("stack"):
+        return None
+    try:
+        return future.result(timeout=wait)
+    except FutureTimeout:
+        return None
+    except Exception:
+        return None
@@ -0,0 +1,554 @@
+"""
+services/providers.py
+─────────────────────
+One interface over every LLM backend, plus a health-aware registry.
+
+Each provider turns OpenAI-style chat messages into text (`complete`) or a
+stream of text fragments (`stream`) and reports failures as ProviderError,
+whatever SDK it wraps. The registry routes every call to the first healthy
+provider in LLM_PROVIDERS order:
+
+  - Per-provider error rate and latency are tracked over the last
+    HEALTH_WINDOW calls (`ProviderRegistry.health()`).
+  - CIRCUIT_FAILURE_THRESHOLD consecutive rate-limit/connection failures open
+    that provider's circuit for CIRCUIT_COOLDOWN_SECONDS and traffic shifts to
+    the next provider. After the cooldown a single trial call is let through
+    (half-open): its success closes the circuit, its failure reopens it.
+  - A failed call fails over to the next provider immediately. Streams fail
+    over only if nothing has been yielded yet.
+
+Every provider call is timed and its token usage recorded in
+services/metrics.py; providers fill the `usage` dict they are passed with
+the counts their API reports.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import deque
+from contextlib import closing
+from typing import Iterator
+
+import httpx
+
+from config.settings import (
+    LLM_PROVIDERS,
+    PROVIDER_MODELS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_COOLDOWN_SECONDS,
+    HEALTH_WINDOW,
+)
+from services.metrics import CallTimer
+
+_log = logging.getLogger(__name__)
+
+
+# ── Errors ─────────────────────────────────────────────────────────────────────
+
+class ProviderError(Exception):
+    """
+    Provider-agnostic LLM failure.
+
+    kind is one of "auth", "rate_limit", "connection", "timeout" or "status";
+    rate-limit, connection, timeout and 5xx failures are retryable and count
+    towards the circuit breaker.
+    """
+
+    def __init__(self, provider: str, kind: str, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.provider = provider
+        self.kind = kind
+        self.message = message
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.kind in ("rate_limit", "connection", "timeout") or (self.status_code or 0) >= 500
+
+
+# ── Providers ──────────────────────────────────────────────────────────────────
+
+class LLMProvider(ABC):
+    """
+    Base class for a chat-completion backend.
+
+    `models` maps model tiers (see MODEL_TIERS) to this provider's model
+    names; calls name a tier rather than a model so failover between
+    providers keeps the same class of model.
+    """
+
+    name: str = ""
+    models: dict[str, str] = {}
+
+    @property
+    def model(self) -> str:
+        """The provider's conversation-tier model."""
+        return self.models["conversation"]
+
+    def model_for(self, tier: str | None) -> str:
+        """Model name for `tier`, falling back to the conversation model."""
+        return self.models.get(tier or "conversation", self.model)
+
+    @abstractmethod
+    def complete(
+        self,
+        messages: list[dict],
+        max_tokens: int,
+        temperature: float | None = None,
+        json_mode: bool = False,
+        tier: str | None = None,
+        usage: dict | None = None,
+    ) -> str:
+        """
+        Return the full completion text for OpenAI-style `messages`.
+
+        If `usage` is given it is filled with the reported "prompt_tokens"
+        and "completion_tokens".
+        """
+
+    @abstractmethod
+    def stream(
+        self,
+        messages: list[dict],
+        max_tokens: int,
+        temperature: float | None = None,
+        tier: str | None = None,
+        usage: dict | None = None,
+    ) -> Iterator[str]:
+        """Yield completion text fragments as they arrive; `usage` is filled at the end."""
+
+
+class GroqProvider(LLMProvider):
+    """Groq chat completions over the shared pooled client."""
+
+    name = "groq"
+
+    def __init__(self, models: dict[str, str] = PROVIDER_MODELS["groq"]):
+        import groq
+        from services.llm_client import get_client, pool_slot  # loads .env
+
+        if not os.getenv("GROQ_API_KEY"):
+            raise RuntimeError("GROQ_API_KEY is not set")
+        self.models = models
+        self._groq = groq
+        self._get_client = get_client
+        self._pool_slot = pool_slot
+
+    def _error(self, exc: Exception) -> ProviderError:
+        groq = self._groq
+        if isinstance(exc, groq.AuthenticationError):
+            return ProviderError(self.name, "auth", str(exc), 401)
+        if isinstance(exc, groq.RateLimitError):
+            return ProviderError(self.name, "rate_limit", str(exc), 429)
+        if isinstance(exc, (groq.APIConnectionError, httpx.HTTPError)):
+            return ProviderError(self.name, "connection", str(exc))
+        if isinstance(exc, groq.APIStatusError):
+            return ProviderError(self.name, "status", str(exc.message), exc.status_code)
+        return ProviderError(self.name, "status", str(exc))
+
+    @property
+    def _errors(self) -> tuple:
+        return (self._groq.GroqError, httpx.HTTPError)
+
+    def _params(self, messages, max_tokens, temperature, tier) -> dict:
+        params = {"model": self.model_for(tier), "max_tokens": max_tokens, "messages": messages}
+        if temperature is not None:
+            params["temperature"] = temperature
+        return params
+
+    @staticmethod
+    def _usage(reported, usage: dict | None) -> None:
+        if reported is not None and usage is not None:
+            usage["prompt_tokens"] = reported.prompt_tokens
+            usage["completion_tokens"] = reported.completion_tokens
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        params = self._params(messages, max_tokens, temperature, tier)
+        if json_mode:
+            params["response_format"] = {"type": "json_object"}
+        try:
+            with self._pool_slot():
+                response = self._get_client().chat.completions.create(**params)
+        except self._errors as exc:
+            raise self._error(exc) from exc
+        self._usage(response.usage, usage)
+        return response.choices[0].message.content or ""
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None) -> Iterator[str]:
+        params = self._params(messages, max_tokens, temperature, tier)
+        try:
+            with self._pool_slot():
+                stream = self._get_client().chat.completions.create(**params, stream=True)
+                with closing(stream):
+                    for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            yield delta
+                        # Groq reports usage on the final chunk under x_groq.
+                        self._usage(getattr(getattr(chunk, "x_groq", None), "usage", None), usage)
+        except self._errors as exc:
+            raise self._error(exc) from exc
+
+
+_JSON_ONLY = "Respond with a single valid JSON object only, with no text before or after it."
+
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic Messages API (paid; used as a failover by default)."""
+
+    name = "anthropic"
+
+    def __init__(self, models: dict[str, str] = PROVIDER_MODELS["anthropic"]):
+        import anthropic
+
+        if not os.getenv("ANTHROPIC_API_KEY"):
+            raise RuntimeError("ANTHROPIC_API_KEY is not set")
+        self.models = models
+        self._anthropic = anthropic
+        self._client = anthropic.Anthropic()
+
+    def _error(self, exc: Exception) -> ProviderError:
+        anthropic = self._anthropic
+        if isinstance(exc, anthropic.AuthenticationError):
+            return ProviderError(self.name, "auth", str(exc), 401)
+        if isinstance(exc, anthropic.RateLimitError):
+            return ProviderError(self.name, "rate_limit", str(exc), 429)
+        if isinstance(exc, anthropic.APIStatusError):
+            return ProviderError(self.name, "status", str(exc.message), exc.status_code)
+        return ProviderError(self.name, "connection", str(exc))
+
+    def _params(self, messages, max_tokens, temperature, tier) -> dict:
+        # Anthropic takes system text separately and wants a user turn first.
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        chat = [m for m in messages if m["role"] != "system"]
+        if not chat or chat[0]["role"] != "user":
+            chat.insert(0, {"role": "user", "content": "(conversation continues)"})
+        params = {"model": self.model_for(tier), "max_tokens": max_tokens, "messages": chat}
+        if system:
+            params["system"] = system
+        if temperature is not None:
+            params["temperature"] = temperature
+        return params
+
+    @staticmethod
+    def _usage(reported, usage: dict | None) -> None:
+        if reported is not None and usage is not None:
+            usage["prompt_tokens"] = reported.input_tokens
+            usage["completion_tokens"] = reported.output_tokens
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        params = self._params(messages, max_tokens, temperature, tier)
+        # No JSON response format: instruct, and prefill the reply with "{" so
+        # the model continues a JSON object.
+        prefill = ""
+        if json_mode:
+            params["system"] = (params.get("system", "") + "\n\n" + _JSON_ONLY).strip()
+            if params["messages"][-1]["role"] == "user":
+                prefill = "{"
+                params["messages"] = params["messages"] + [{"role": "assistant", "content": prefill}]
+        try:
+            response = self._client.messages.create(**params)
+        except self._anthropic.APIError as exc:
+            raise self._error(exc) from exc
+        self._usage(response.usage, usage)
+        return prefill + response.content[0].text
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None) -> Iterator[str]:
+        try:
+            with self._client.messages.stream(
+                **self._params(messages, max_tokens, temperature, tier)
+            ) as stream:
+                for text in stream.text_stream:
+                    if text:
+                        yield text
+                self._usage(stream.get_final_message().usage, usage)
+        except self._anthropic.APIError as exc:
+            raise self._error(exc) from exc
+
+
+_PROVIDER_TYPES: dict[str, type[LLMProvider]] = {
+    "groq":      GroqProvider,
+    "anthropic": AnthropicProvider,
+}
+
+
+# ── Health & Circuit Breaker ───────────────────────────────────────────────────
+
+class ProviderHealth:
+    """Rolling outcome/latency window and circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        window: int = HEALTH_WINDOW,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+    ):
+        self._outcomes: deque[tuple[bool, float]] = deque(maxlen=window)
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._consecutive = 0
+        self._open_until = 0.0
+        self._trial = False  # a half-open trial call is in flight
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """
+        Claim a call slot: always granted while the circuit is closed, never
+        while it is open. After the cooldown (half-open) exactly one trial
+        call is granted; it holds the slot until its outcome is recorded or
+        it is released.
+        """
+        with self._lock:
+            if time.monotonic() < self._open_until:
+                return False
+            if self._consecutive >= self._threshold:
+                if self._trial:
+                    return False
+                self._trial = True
+            return True
+
+    def release(self) -> None:
+        """Give back a trial slot whose call ended without an outcome (e.g. a cancelled stream)."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self._outcomes.append((True, latency))
+            self._consecutive = 0
+            self._open_until = 0.0
+            self._trial = False
+
+    def record_failure(self, latency: float, error: ProviderError) -> bool:
+        """Record a failure; returns True if this failure opened the circuit."""
+        with self._lock:
+            self._outcomes.append((False, latency))
+            self._trial = False
+            if not error.retryable:
+                return False
+            self._consecutive += 1
+            if self._consecutive >= self._threshold:
+                self._open_until = time.monotonic() + self._cooldown
+                return True
+            return False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            outcomes = list(self._outcomes)
+            now = time.monotonic()
+            state = "closed"
+            if self._open_until > now:
+                state = "open"
+            elif self._consecutive >= self._threshold:
+                state = "half_open"
+        latencies = sorted(latency for ok, latency in outcomes if ok)
+        return {
+            "state":         state,
+            "calls":         len(outcomes),
+            "error_rate":    round(sum(1 for ok, _ in outcomes if not ok) / len(outcomes), 3) if outcomes else 0.0,
+            "p50_latency_s": round(latencies[len(latencies) // 2], 3) if latencies else None,
+        }
+
+
+# ── Registry ───────────────────────────────────────────────────────────────────
+
+class ProviderRegistry:
+    """Routes calls to the first healthy provider, failing over in order."""
+
+    def __init__(self, providers: list[LLMProvider]):
+        if not providers:
+            raise RuntimeError("No LLM provider is available; check LLM_PROVIDERS and API keys.")
+        self.providers = providers
+        self._health = {p.name: ProviderHealth() for p in providers}
+        self._latency: dict[tuple[str, str], deque[float]] = {}
+        self._latency_lock = threading.Lock()
+
+    @property
+    def primary(self) -> LLMProvider:
+        return self.providers[0]
+
+    def _candidates(self) -> Iterator[LLMProvider]:
+        """
+        Providers to try, in order, each claimed from its circuit breaker just
+        before it is tried; the primary alone if no circuit grants a call.
+        """
+        granted = False
+        for provider in self.providers:
+            if self._health[provider.name].acquire():
+                granted = True
+                yield provider
+        if not granted:
+            yield self.primary
+
+    def _serving(self) -> LLMProvider:
+        """The provider calls currently go to: the first whose circuit is not open."""
+        for provider in self.providers:
+            if self._health[provider.name].snapshot()["state"] != "open":
+                return provider
+        return self.primary
+
+    def _succeeded(self, provider: LLMProvider, tier: str | None, started: float) -> None:
+        latency = time.monotonic() - started
+        self._health[provider.name].record_success(latency)
+        with self._latency_lock:
+            key = (provider.name, provider.model_for(tier))
+            self._latency.setdefault(key, deque(maxlen=HEALTH_WINDOW)).append(latency)
+
+    def latency_p95(self, tier: str, min_samples: int) -> float | None:
+        """
+        p95 full-call latency of the model currently serving `tier`, or None
+        until it has `min_samples` successful calls. Streams count until
+        their last fragment, so every sample measures the same thing.
+        """
+        provider = self._serving()
+        with self._latency_lock:
+            samples = sorted(self._latency.get((provider.name, provider.model_for(tier)), ()))
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def reset_latency(self, tier: str) -> None:
+        """Forget the latency samples of every provider's model for `tier`."""
+        with self._latency_lock:
+            for provider in self.providers:
+                self._latency.pop((provider.name, provider.model_for(tier)), None)
+
+    @staticmethod
+    def _provider_error(provider: LLMProvider, exc: Exception) -> ProviderError:
+        """`exc` as a ProviderError; anything a provider failed to map becomes a
+        non-retryable "status" error, so the call still fails over."""
+        if isinstance(exc, ProviderError):
+            return exc
+        _log.warning("LLM provider %s raised unmapped %s: %s", provider.name, type(exc).__name__, exc)
+        error = ProviderError(provider.name, "status", f"{type(exc).__name__}: {exc}")
+        error.__cause__ = exc
+        return error
+
+    def _failed(self, provider: LLMProvider, started: float, error: ProviderError) -> None:
+        if self._health[provider.name].record_failure(time.monotonic() - started, error):
+            _log.warning(
+                "Circuit opened for LLM provider %s after repeated %s errors",
+                provider.name, error.kind,
+            )
+
+    def complete(
+        self, messages: list[dict], max_tokens: int, call_type: str = "", served: dict | None = None, **kwargs,
+    ) -> str:
+        """
+        `LLMProvider.complete` on the first provider that succeeds.
+
+        `call_type` labels the call's metrics (e.g. "reply", "score"). If a
+        `served` dict is passed, it is filled with the "provider" and "model"
+        that answered.
+        """
+        error: ProviderError | None = None
+        for provider in self._candidates():
+            started = time.monotonic()
+            model = provider.model_for(kwargs.get("tier"))
+            call = CallTimer(call_type, provider.name, model, messages)
+            try:
+                text = provider.complete(messages, max_tokens, usage=call.usage, **kwargs)
+            except Exception as exc:
+                error = self._provider_error(provider, exc)
+                call.finish(error.kind)
+                self._failed(provider, started, error)
+                continue
+            except BaseException:
+                self._health[provider.name].release()
+                raise
+            call.output(text)
+            call.finish("ok")
+            self._succeeded(provider, kwargs.get("tier"), started)
+            if served is not None:
+                served.update(provider=provider.name, model=model)
+            return text
+        raise error
+
+    def stream(self, messages: list[dict], max_tokens: int, call_type: str = "", **kwargs) -> Iterator[str]:
+        """
+        `LLMProvider.stream` with failover before the first fragment.
+
+        Once text has been yielded the provider is committed; a later failure
+        is raised to the caller as-is. A stream closed early by its consumer
+        is recorded with outcome "cancelled".
+        """
+        error: ProviderError | None = None
+        for provider in self._candidates():
+            started = time.monotonic()
+            call = CallTimer(call_type, provider.name, provider.model_for(kwargs.get("tier")), messages)
+            received = False
+            try:
+                for fragment in provider.stream(messages, max_tokens, usage=call.usage, **kwargs):
+                    if not received:
+                        call.first_token()
+                    received = True
+                    call.output(fragment)
+                    yield fragment
+            except Exception as exc:
+                error = self._provider_error(provider, exc)
+                call.finish(error.kind)
+                self._failed(provider, started, error)
+                if received:
+                    raise error
+                continue
+            except GeneratorExit:
+                call.finish("cancelled")
+                self._health[provider.name].release()
+                raise
+            except BaseException:
+                self._health[provider.name].release()
+                raise
+            call.finish("ok")
+            self._succeeded(provider, kwargs.get("tier"), started)
+            return
+        raise error
+
+    def health(self) -> dict[str, dict]:
+        """Per-provider circuit state, error rate and median latency."""
+        return {name: h.snapshot() for name, h in self._health.items()}
+
+
+_registry: ProviderRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def register_provider(name: str, factory) -> None:
+    """
+    Make an extra provider available under `name` in LLM_PROVIDERS, e.g. the
+    simulated backend of tools/loadtest.py. `factory()` must return an
+    LLMProvider; register before the registry is first built.
+    """
+    _PROVIDER_TYPES[name] = factory
+
+
+def build_registry(names: list[str] = LLM_PROVIDERS) -> ProviderRegistry:
+    """Instantiate the configured providers, skipping any that cannot start."""
+    providers: list[LLMProvider] = []
+    for name in names:
+        provider_type = _PROVIDER_TYPES.get(name)
+        if provider_type is None:
+            _log.warning("Unknown LLM provider %r ignored", name)
+            continue
+        try:
+            providers.append(provider_type())
+        except Exception as exc:
+            _log.info("LLM provider %s unavailable: %s", name, exc)
+    if not providers:
+        # Surfaces to candidates as the usual "check your API key" message.
+        raise ProviderError(
+            names[0] if names else "groq", "auth",
+            "No LLM provider is available; check LLM_PROVIDERS and API keys.",
+        )
+    return ProviderRegistry(providers)
+
+
+def get_registry() -> ProviderRegistry:
+    """Return the process-wide provider registry, building it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = build_registry()
+    return _registry
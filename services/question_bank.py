@@ -0,0 +1,226 @@
+"""
+services/question_bank.py
+─────────────────────────
+Stored Stage 4 technical questions, keyed by canonical technology id (see
+utils/taxonomy.py), version and difficulty tier.
+
+Generating 3–5 fresh questions per technology was the largest completion in
+every session, and the popular stacks were regenerated thousands of times.
+The bank keeps question sets in SQLite (QUESTION_BANK_PATH) and:
+
+  - serves a stack it fully covers locally, sampling one question per tier
+    at random (`render_question_block`);
+  - harvests every question block the LLM does generate (`harvest`);
+  - refills a technology through the LLM in the background only when it is
+    missing or any tier has fewer than BANK_MIN_PER_TIER questions (`refill`).
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from config.settings import (
+    QUESTION_BANK_PATH,
+    QUESTION_TIERS,
+    QUESTIONS_PER_TECH,
+    BANK_MIN_PER_TIER,
+    BANK_REFILL_PER_TIER,
+)
+from services.background import submit
+from services.llm_service import generate_question_set
+from services.score_cache import normalize
+from utils.questions import parse_question_sections
+from utils.taxonomy import canonical_tech, display_name
+
+_log = logging.getLogger(__name__)
+
+# ── Storage ────────────────────────────────────────────────────────────────────
+
+class QuestionBank:
+    """SQLite-backed question store, safe to share across threads."""
+
+    def __init__(self, path: str = QUESTION_BANK_PATH) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            " tech TEXT NOT NULL, version TEXT NOT NULL, tier TEXT NOT NULL,"
+            " question TEXT NOT NULL, norm TEXT NOT NULL, source TEXT NOT NULL,"
+            " created REAL NOT NULL, PRIMARY KEY (tech, version, tier, norm))"
+        )
+
+    def add(self, tech: str, version: str, tier: str, questions: list[str], source: str) -> int:
+        """Insert new questions (duplicates are ignored); returns how many were added."""
+        rows = [
+            (tech, version, tier, q.strip(), normalize(q), source, time.time())
+            for q in questions if q.strip()
+        ]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._db.total_changes - before
+
+    def questions(self, tech: str, version: str, tier: str) -> list[str]:
+        """All stored questions for one tech/version/tier."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT question FROM questions WHERE tech = ? AND version = ? AND tier = ?",
+                (tech, version, tier),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+
+_bank: QuestionBank | None = None
+_bank_lock = threading.Lock()
+_refilling: set[tuple[str, str]] = set()
+
+
+def get_bank() -> QuestionBank:
+    """Return the process-wide question bank, opening it on first use."""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
+
+
+# ── Sampling ───────────────────────────────────────────────────────────────────
+
+def _pool(tech: str, version: str, tier: str) -> list[str]:
+    """Version-specific questions, topped up with version-agnostic ones."""
+    bank = get_bank()
+    questions = bank.questions(tech, version, tier) if version else []
+    return questions + bank.questions(tech, "", tier)
+
+
+def sample_questions(tech: str, version: str = "", k: int = QUESTIONS_PER_TECH) -> list[str] | None:
+    """
+    Randomly sample `k` questions for a tech, easiest first.
+
+    One question is drawn from each tier in order, then further ones from any
+    tier. Returns None if some tier is empty.
+    """
+    pools = {tier: _pool(tech, version, tier) for tier in QUESTION_TIERS}
+    if not all(pools.values()):
+        return None
+
+    picked = [random.choice(pools[tier]) for tier in QUESTION_TIERS][:k]
+    rest = [q for tier in QUESTION_TIERS for q in pools[tier] if q not in picked]
+    picked += random.sample(rest, min(len(rest), k - len(picked)))
+    return picked
+
+
+def render_question_block(tech_stack: list[str]) -> str | None:
+    """
+    Render Stage 4 questions for the whole stack from the bank.
+
+    Returns the markdown block in the system prompt's format, or None if any
+    declared technology is unknown or not yet covered (the LLM then generates
+    the questions as before). Missing or low-variety techs are queued for a
+    background refill.
+    """
+    techs = stack_techs(tech_stack)
+    if not techs:
+        return None
+    for tech, version in techs:
+        refill(tech, version)
+    return render_techs(techs)
+
+
+def render_techs(techs: list[tuple[str, str]]) -> str | None:
+    """Sample and format a block for canonical (tech, version) pairs; None if any is uncovered."""
+    sections = []
+    for tech, version in techs:
+        questions = sample_questions(tech, version)
+        if questions is None:
+            return None
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+        sections.append(f"**{display_name(tech)}**\n{numbered}")
+    return "\n\n".join(sections)
+
+
+def stack_techs(tech_stack: list[str]) -> list[tuple[str, str]] | None:
+    """Canonical (tech, version) pairs for a stack; None if any item is unknown."""
+    if any(canonical_tech(item) is None for item in tech_stack):
+        return None
+    return known_techs(tech_stack)
+
+
+def known_techs(tech_stack: list[str]) -> list[tuple[str, str]]:
+    """Canonical (tech, version) pairs for the stack items the taxonomy knows."""
+    techs: list[tuple[str, str]] = []
+    for item in tech_stack:
+        canonical = canonical_tech(item)
+        if canonical is not None and canonical not in techs:
+            techs.append(canonical)
+    return techs
+
+
+# ── Refill ─────────────────────────────────────────────────────────────────────
+
+def needs_refill(tech: str, version: str = "") -> bool:
+    """True if any tier sampled for the tech has fewer than BANK_MIN_PER_TIER questions."""
+    return any(len(_pool(tech, version, tier)) < BANK_MIN_PER_TIER for tier in QUESTION_TIERS)
+
+
+def fill(tech: str, version: str = "", source: str = "refill") -> int:
+    """Generate a question set for the tech now and store it; returns questions added."""
+    generated = generate_question_set(display_name(tech), version, BANK_REFILL_PER_TIER)
+    if not generated:
+        return 0
+    bank = get_bank()
+    added = sum(
+        bank.add(tech, version, tier, generated.get(tier, []), source)
+        for tier in QUESTION_TIERS
+    )
+    _log.info("Question bank %s for %s %s added %d questions", source, tech, version, added)
+    return added
+
+
+def _refill_job(tech: str, version: str) -> None:
+    try:
+        fill(tech, version)
+    finally:
+        with _bank_lock:
+            _refilling.discard((tech, version))
+
+
+def refill(tech: str, version: str = "") -> bool:
+    """Refill a low-variety tech in the background; returns True if a job started."""
+    with _bank_lock:
+        if (tech, version) in _refilling:
+            return False
+        _refilling.add((tech, version))
+    if not needs_refill(tech, version):
+        with _bank_lock:
+            _refilling.discard((tech, version))
+        return False
+    submit(_refill_job, tech, version)
+    return True
+
+
+def harvest(reply: str) -> int:
+    """
+    Store the questions of an LLM-generated Stage 4 block.
+
+    Position maps to tier as in the system prompt: the first question is
+    beginner, the second intermediate, the rest advanced.
+    """
+    bank = get_bank()
+    added = 0
+    for name, questions in parse_question_sections(reply):
+        canonical = canonical_tech(name)
+        if canonical is None:
+            continue
+        tech, version = canonical
+        for position, question in enumerate(questions):
+            tier = QUESTION_TIERS[min(position, len(QUESTION_TIERS) - 1)]
+            added += bank.add(tech, version, tier, [question], "live")
+    return added
@@ -0,0 +1,179 @@
+"""
+services/score_cache.py
+───────────────────────
+Two-tier memoising cache for `score_answer` results.
+
+The same short answers ("I don't know", "yes", a one-word framework name)
+recur across thousands of candidates, and each one used to cost a full 70B
+scoring call. Results are cached under a key built from the normalised
+question, normalised answer, model and scoring-prompt version:
+
+  - Tier 1: in-process LRU (SCORE_CACHE_MEMORY_ENTRIES), shared by sessions.
+  - Tier 2: SQLite file (SCORE_CACHE_PATH), shared by processes and restarts,
+    with a TTL (SCORE_CACHE_TTL_SECONDS) and a row cap
+    (SCORE_CACHE_MAX_ENTRIES) enforced by evicting the least recently used.
+
+Hit/miss/eviction counters are available from `cache_stats()` and are
+exported by services/metrics.py.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import (
+    SCORE_CACHE_PATH,
+    SCORE_CACHE_MEMORY_ENTRIES,
+    SCORE_CACHE_MAX_ENTRIES,
+    SCORE_CACHE_TTL_SECONDS,
+)
+
+_log = logging.getLogger(__name__)
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+
+# Trim the disk tier in batches so eviction is not run on every insert.
+_EVICT_EVERY = 256
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ("I don't know." → "i dont know")."""
+    text = text.lower().replace("’", "'")
+    text = _PUNCT_RE.sub("", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def make_key(question: str, answer: str, model: str, prompt_version: str) -> str:
+    """Build the cache key for one scoring request."""
+    raw = "\x1f".join((normalize(question), normalize(answer), model, prompt_version))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """In-memory LRU backed by an SQLite table, safe to share across threads."""
+
+    def __init__(
+        self,
+        path: str = SCORE_CACHE_PATH,
+        memory_entries: int = SCORE_CACHE_MEMORY_ENTRIES,
+        max_entries: int = SCORE_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = SCORE_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._memory_entries = memory_entries
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+                       "memory_evictions": 0, "disk_evictions": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " key TEXT PRIMARY KEY, result TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS scores_accessed ON scores(accessed)")
+
+    # ── Lookup / Store ─────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached result for `key`, or None on a miss or expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] < self._ttl:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[1]
+            self._memory.pop(key, None)
+
+            try:
+                row = self._db.execute(
+                    "SELECT result, created FROM scores WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] < self._ttl:
+                    self._db.execute("UPDATE scores SET accessed = ? WHERE key = ?", (now, key))
+                    result = json.loads(row[0])
+                    self._remember(key, row[1], result)
+                    self._stats["disk_hits"] += 1
+                    return result
+            except sqlite3.Error as exc:
+                _log.warning("Score cache read failed: %s", exc)
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        """Store `result` in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, result)
+            self._stats["stores"] += 1
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO scores (key, result, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(result), now, now),
+                )
+                self._inserts += 1
+                if self._inserts % _EVICT_EVERY == 0:
+                    self._evict(now)
+            except sqlite3.Error as exc:
+                _log.warning("Score cache write failed: %s", exc)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current in-memory size."""
+        with self._lock:
+            return {**self._stats, "memory_size": len(self._memory)}
+
+    # ── Internals ──────────────────────────────────────────────────────────────
+
+    def _remember(self, key: str, created: float, result: dict) -> None:
+        """Insert into the LRU tier, dropping the least recently used entry."""
+        self._memory[key] = (created, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then the least recently used beyond the row cap."""
+        before = self._db.total_changes
+        self._db.execute("DELETE FROM scores WHERE created < ?", (now - self._ttl,))
+        self._db.execute(
+            "DELETE FROM scores WHERE key IN ("
+            " SELECT key FROM scores ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+        self._stats["disk_evictions"] += self._db.total_changes - before
+
+
+_cache: ScoreCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ScoreCache:
+    """Return the process-wide score cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ScoreCache()
+    return _cache
+
+
+def cache_stats() -> dict[str, int]:
+    """Hit/miss/eviction counters for the process-wide score cache ({} until it is opened)."""
+    cache = _cache
+    return cache.stats() if cache is not None else {}
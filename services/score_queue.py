@@ -0,0 +1,223 @@
+"""
+services/score_queue.py
+───────────────────────
+Asynchronous answer scoring for the technical-questions stage.
+
+Scoring used to run to completion before the reply call even started, so a
+technical turn cost two serial LLM round-trips. Now the score is submitted to
+the background pool and the reply is generated at the same time; the accuracy
+badge fills in on a later rerun once the score lands.
+
+Two modes (SCORE_MODE in config/settings.py):
+  per_answer : one scoring call per candidate message, as soon as it is sent.
+  batch      : answers are buffered while a question block is open and the
+               whole block is scored in one call when it closes (a new block
+               starts, the stage moves on, or every question has a reply).
+
+A batch answer the scoring call did not map to any question is scored on
+its own against the next unanswered question, so no answer silently loses
+its badge.
+
+State lives in plain dicts owned by the caller (session_state in the app):
+  pending : message index → (Future, job, attempt); a batch job registers the
+            same Future under every message index it covers
+  scores  : message index → int score
+  batch   : {"questions": [str], "answers": [(index, text)]} for the open block
+"""
+
+import logging
+import time
+from typing import Callable
+
+from services.background import submit
+from services.llm_service import score_answer, score_section
+from utils.questions import flatten_questions, is_question_block, parse_question_sections
+
+_log = logging.getLogger(__name__)
+
+_MAX_ATTEMPTS = 3
+_RETRY_BACKOFF_SECONDS = 1.5
+
+
+# ── Jobs ───────────────────────────────────────────────────────────────────────
+
+def _run_job(job: dict, attempt: int) -> dict[int, int]:
+    """Worker body: back off on retries, score, and return {message index: score}."""
+    if attempt:
+        time.sleep(_RETRY_BACKOFF_SECONDS * attempt)
+
+    if job["kind"] == "single":
+        result = score_answer(job["question"], job["answer"])
+        if not result or "score" not in result:
+            raise ValueError("no score returned")
+        return {job["index"]: result["score"]}
+
+    indices = [index for index, _ in job["answers"]]
+    results = score_section(job["questions"], [text for _, text in job["answers"]])
+    if results is None:
+        raise ValueError("no scores returned")
+
+    # A message's badge is the mean score of the questions it answered.
+    per_message: dict[int, list[int]] = {}
+    answered: set[int] = set()
+    for item in results:
+        try:
+            message, score = item.get("message"), int(item["score"])
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+        if isinstance(message, int) and 1 <= message <= len(indices):
+            per_message.setdefault(indices[message - 1], []).append(score)
+            answered.add(item.get("question"))
+    scores = {index: round(sum(s) / len(s)) for index, s in per_message.items()}
+
+    unmapped = [(index, text) for index, text in job["answers"] if index not in scores]
+    if unmapped:
+        _log.info("Batch scoring left %d of %d answers unmapped; scoring them one by one",
+                  len(unmapped), len(indices))
+        open_questions = [q for number, q in enumerate(job["questions"], 1) if number not in answered]
+        for n, (index, text) in enumerate(unmapped):
+            question = open_questions[n] if n < len(open_questions) else "\n".join(job["questions"])
+            result = score_answer(question, text)
+            if result and "score" in result:
+                scores[index] = result["score"]
+    return scores
+
+
+def _submit(pending: dict, job: dict, attempt: int) -> None:
+    """Submit `job` and register its Future under every message it covers."""
+    future = submit(_run_job, job, attempt)
+    if job["kind"] == "single":
+        pending[job["index"]] = (future, job, attempt)
+    else:
+        for index, _ in job["answers"]:
+            pending[index] = (future, job, attempt)
+
+
+# ── Per-Answer Mode ────────────────────────────────────────────────────────────
+
+def schedule_score(pending: dict, index: int, question: str, answer: str) -> None:
+    """Queue scoring of the answer stored at message `index`."""
+    job = {"kind": "single", "index": index, "question": question, "answer": answer}
+    _submit(pending, job, 0)
+
+
+# ── Batch Mode ─────────────────────────────────────────────────────────────────
+
+def open_block(pending: dict, batch: dict, questions: list[str]) -> None:
+    """Start buffering answers for a new question block, flushing any open one."""
+    flush_block(pending, batch)
+    batch["questions"] = list(questions)
+    batch["answers"] = []
+
+
+def add_answer(pending: dict, batch: dict, index: int, answer: str) -> bool:
+    """
+    Buffer a candidate message against the open block.
+
+    The block is flushed once it has as many replies as questions.
+
+    Returns
+    -------
+    bool
+        False if no block is open (the caller should score per answer).
+    """
+    if not batch.get("questions"):
+        return False
+    batch["answers"].append((index, answer))
+    if len(batch["answers"]) >= len(batch["questions"]):
+        flush_block(pending, batch)
+    return True
+
+
+def flush_block(pending: dict, batch: dict) -> None:
+    """Score every buffered answer of the open block in one call and close it."""
+    questions, answers = batch.get("questions"), batch.get("answers")
+    if questions and answers:
+        job = {"kind": "batch", "questions": questions, "answers": list(answers)}
+        _submit(pending, job, 0)
+    batch["questions"] = []
+    batch["answers"] = []
+
+
+def track_reply(pending: dict, batch: dict, reply: str, stage: str) -> None:
+    """
+    Update the open block after an assistant reply.
+
+    A new question block opens a block (flushing the previous one); leaving
+    the technical-questions stage flushes whatever is buffered.
+    """
+    if stage == "technical_questions" and is_question_block(reply):
+        open_block(pending, batch, flatten_questions(parse_question_sections(reply)))
+    elif stage != "technical_questions":
+        flush_block(pending, batch)
+
+
+# ── Reindexing ─────────────────────────────────────────────────────────────────
+
+def remap_indices(pending: dict, batch: dict, new_index: Callable[[int], int | None]) -> None:
+    """
+    Follow messages to new indices after the transcript was rewritten (e.g.
+    merged with another replica's copy).
+
+    `new_index` maps an old message index to its new one, or None if the
+    message is gone. Jobs covering a moved message are cancelled and
+    resubmitted under the new indices (repeat scoring calls mostly hit the
+    score cache); buffered batch answers are renumbered in place.
+    """
+    jobs = {id(entry[0]): entry for entry in pending.values()}
+    moved = []
+    for future, job, attempt in jobs.values():
+        indices = [job["index"]] if job["kind"] == "single" else [index for index, _ in job["answers"]]
+        if any(new_index(index) != index for index in indices):
+            future.cancel()
+            for index in indices:
+                pending.pop(index, None)
+            moved.append((job, attempt))
+
+    for job, attempt in moved:
+        if job["kind"] == "single":
+            index = new_index(job["index"])
+            if index is not None:
+                _submit(pending, {**job, "index": index}, attempt)
+        else:
+            answers = [(new_index(index), text) for index, text in job["answers"] if new_index(index) is not None]
+            if answers:
+                _submit(pending, {**job, "answers": answers}, attempt)
+
+    batch["answers"] = [
+        (new_index(index), text) for index, text in batch.get("answers", []) if new_index(index) is not None
+    ]
+
+
+# ── Collection ─────────────────────────────────────────────────────────────────
+
+def collect_scores(pending: dict, scores: dict) -> bool:
+    """
+    Move finished scores from `pending` into `scores`.
+
+    Failed jobs are resubmitted until _MAX_ATTEMPTS is reached, after which
+    the answers are left without a badge.
+
+    Returns
+    -------
+    bool
+        True if at least one new score was recorded.
+    """
+    finished: dict[int, tuple] = {}
+    for index, entry in list(pending.items()):
+        if entry[0].done():
+            del pending[index]
+            finished[id(entry[0])] = entry
+
+    changed = False
+    for future, job, attempt in finished.values():
+        try:
+            result = future.result()
+        except Exception:
+            if attempt + 1 < _MAX_ATTEMPTS:
+                _submit(pending, job, attempt + 1)
+            continue
+
+        scores.update(result)
+        changed = changed or bool(result)
+    return changed
@@ -0,0 +1,261 @@
+"""
+services/session_store.py
+─────────────────────────
+Durable SQLite store for screening sessions and transcripts.
+
+Every session is keyed by a resume token (carried in the page URL as ?s=…)
+and persisted as three tables: the session row (stage, ended flag,
+candidate_data), its messages and its answer scores. The database runs in
+WAL mode so recruiters' readers never block the writer.
+
+Writes are write-behind: the app only enqueues them, and one writer thread
+drains the queue, grouping everything that arrived within
+SESSION_STORE_FLUSH_SECONDS (up to SESSION_STORE_BATCH operations) into a
+single transaction. A candidate turn therefore never waits on the disk; a
+crash can lose at most the last flush window.
+
+Reads (`load`) are synchronous and only happen when a session is resumed;
+they wait only for the queued writes of the session being loaded.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from config.settings import SESSION_STORE_PATH, SESSION_STORE_BATCH, SESSION_STORE_FLUSH_SECONDS
+
+_log = logging.getLogger(__name__)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    " token TEXT PRIMARY KEY, session_id TEXT NOT NULL, stage TEXT NOT NULL,"
+    " ended INTEGER NOT NULL DEFAULT 0, candidate_data TEXT NOT NULL DEFAULT '{}',"
+    " created REAL NOT NULL, updated REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS messages ("
+    " token TEXT NOT NULL, idx INTEGER NOT NULL, role TEXT NOT NULL,"
+    " content TEXT NOT NULL, time TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (token, idx))",
+    "CREATE TABLE IF NOT EXISTS scores ("
+    " token TEXT NOT NULL, idx INTEGER NOT NULL, score INTEGER NOT NULL,"
+    " PRIMARY KEY (token, idx))",
+    "CREATE INDEX IF NOT EXISTS sessions_updated ON sessions(updated)",
+)
+
+_UPSERT_SESSION = (
+    "INSERT INTO sessions (token, session_id, stage, ended, candidate_data, created, updated)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(token) DO UPDATE SET stage = excluded.stage, ended = excluded.ended,"
+    " candidate_data = excluded.candidate_data, updated = excluded.updated"
+)
+_PUT_MESSAGE = "INSERT OR REPLACE INTO messages (token, idx, role, content, time) VALUES (?, ?, ?, ?, ?)"
+_PUT_SCORE = "INSERT OR REPLACE INTO scores (token, idx, score) VALUES (?, ?, ?)"
+_DROP_SCORES_FROM = "DELETE FROM scores WHERE token = ? AND idx >= ?"
+
+_STOP = object()
+
+
+class SessionStore:
+    """SQLite session store with a write-behind queue and a single writer thread."""
+
+    def __init__(
+        self,
+        path: str = SESSION_STORE_PATH,
+        batch: int = SESSION_STORE_BATCH,
+        flush_seconds: float = SESSION_STORE_FLUSH_SECONDS,
+    ) -> None:
+        self._path = path
+        self._batch = batch
+        self._flush_seconds = flush_seconds
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: dict[str, int] = {}  # token → queued writes not yet committed
+        self._committed = threading.Condition()
+        self._stopped = False
+        self._stats = {"enqueued": 0, "written": 0, "transactions": 0, "errors": 0}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commits are durable across process crashes; only an OS
+        # crash can drop the last transactions.
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+        self._writer = threading.Thread(target=self._run, name="talentscout-session-store", daemon=True)
+        self._writer.start()
+
+    # ── Write-behind API ───────────────────────────────────────────────────────
+
+    def save_session(self, token: str, session_id: str, stage: str, ended: bool, candidate_data: dict) -> None:
+        """Queue an upsert of the session row."""
+        now = time.time()
+        self._put(_UPSERT_SESSION, (
+            token, session_id, stage, int(ended),
+            json.dumps(candidate_data, ensure_ascii=False), now, now,
+        ))
+
+    def save_messages(self, token: str, messages: list[dict], start: int = 0) -> None:
+        """Queue messages[start:] (keyed by their index in the transcript)."""
+        for idx in range(start, len(messages)):
+            msg = messages[idx]
+            self._put(_PUT_MESSAGE, (token, idx, msg["role"], msg["content"], msg.get("time", "")))
+
+    def save_score(self, token: str, idx: int, score: int) -> None:
+        """Queue the accuracy score of the answer at message index `idx`."""
+        self._put(_PUT_SCORE, (token, idx, score))
+
+    def rewrite_scores(self, token: str, scores: dict[int, int], start: int) -> None:
+        """Queue replacing every stored score at message index `start` or later with `scores`' ones."""
+        self._put(_DROP_SCORES_FROM, (token, start))
+        for idx, score in sorted(scores.items()):
+            if idx >= start:
+                self._put(_PUT_SCORE, (token, idx, score))
+
+    def flush(self, token: str | None = None) -> None:
+        """Block until every queued write (or every write for `token`) has been committed."""
+        if token is None:
+            self._queue.join()
+            return
+        with self._committed:
+            self._committed.wait_for(lambda: token not in self._pending or self._stopped)
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def stats(self) -> dict[str, int]:
+        """Queue depth plus enqueued/written/transaction/error counters."""
+        return {**self._stats, "pending": self._queue.qsize()}
+
+    # ── Reads ──────────────────────────────────────────────────────────────────
+
+    def load(self, token: str) -> dict | None:
+        """
+        Return a stored session, or None for an unknown token.
+
+        The session's pending writes are flushed first, so a session resumed
+        in the same process sees everything it wrote; other sessions' writes
+        are not waited for.
+
+        Returns
+        -------
+        dict | None
+            {"session_id", "stage", "ended", "candidate_data", "messages",
+             "scores"} with scores keyed by message index.
+        """
+        self.flush(token)
+        # Readers get their own connection so they never wait on the writer;
+        # an in-memory database only exists on the writer's connection.
+        db = self._db if self._path == ":memory:" else sqlite3.connect(self._path)
+        try:
+            row = db.execute(
+                "SELECT session_id, stage, ended, candidate_data FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+            if row is None:
+                return None
+            messages = [
+                {"role": role, "content": content, "time": ts}
+                for role, content, ts in db.execute(
+                    "SELECT role, content, time FROM messages WHERE token = ? ORDER BY idx", (token,)
+                )
+            ]
+            scores = dict(db.execute("SELECT idx, score FROM scores WHERE token = ?", (token,)).fetchall())
+        finally:
+            if db is not self._db:
+                db.close()
+        return {
+            "session_id":     row[0],
+            "stage":          row[1],
+            "ended":          bool(row[2]),
+            "candidate_data": json.loads(row[3]),
+            "messages":       messages,
+            "scores":         scores,
+        }
+
+    # ── Writer ─────────────────────────────────────────────────────────────────
+
+    def _put(self, sql: str, params: tuple) -> None:
+        # Every statement's first parameter is the session token.
+        with self._committed:
+            self._pending[params[0]] = self._pending.get(params[0], 0) + 1
+        self._stats["enqueued"] += 1
+        self._queue.put((sql, params))
+
+    def _done(self, ops: list[tuple[str, tuple]]) -> None:
+        """Mark `ops` as no longer pending and wake readers waiting on their sessions."""
+        with self._committed:
+            for _, params in ops:
+                left = self._pending[params[0]] - 1
+                if left:
+                    self._pending[params[0]] = left
+                else:
+                    del self._pending[params[0]]
+            self._committed.notify_all()
+
+    def _run(self) -> None:
+        """Writer loop: commit whatever arrives within one flush window as one transaction."""
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            deadline = time.monotonic() + self._flush_seconds
+            while first is not _STOP and len(batch) < self._batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                if item is _STOP:
+                    break
+
+            ops = [op for op in batch if op is not _STOP]
+            if ops:
+                self._commit(ops)
+                self._done(ops)
+            for _ in batch:
+                self._queue.task_done()
+            if len(ops) < len(batch):
+                with self._committed:
+                    self._stopped = True
+                    self._committed.notify_all()
+                return
+
+    def _commit(self, ops: list[tuple[str, tuple]]) -> None:
+        try:
+            self._db.execute("BEGIN")
+            for sql, params in ops:
+                self._db.execute(sql, params)
+            self._db.execute("COMMIT")
+        except sqlite3.Error as exc:
+            self._stats["errors"] += 1
+            _log.warning("Session store write of %d operations failed: %s", len(ops), exc)
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            return
+        self._stats["written"] += len(ops)
+        self._stats["transactions"] += 1
+
+
+_store: SessionStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SessionStore | None:
+    """Return the process-wide session store, or None when SESSION_STORE_PATH is empty."""
+    global _store
+    if _store is None and SESSION_STORE_PATH:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+                atexit.register(_store.close)
+    return _store
@@ -0,0 +1,266 @@
+"""
+services/shared_store.py
+────────────────────────
+Shared live-session store, so any app replica can pick up any candidate.
+
+The SQLite store (services/session_store.py) is local to one machine; this
+store keeps the live state of every session in an external key-value backend
+that all replicas share:
+
+  - "redis":  any Redis-protocol server (Redis, Valkey, KeyDB, …) through
+              redis-py; a fakeredis client can be passed in for tests.
+  - "memory": an in-process stand-in with the same semantics, for a single
+              replica or local development.
+
+Each session is one compact record — short keys, messages as
+[role, content, time] triples, zlib-compressed once it grows — stored with a
+version number. Writes are optimistic: `save` only succeeds if the stored
+version is still the one the writer last read. On a conflict the stored and
+local states are merged (messages are append-only, scores and profile fields
+are unioned, the stage never moves backwards) and the write is retried.
+"""
+
+import json
+import logging
+import threading
+import time
+import zlib
+
+from config.settings import (
+    CONVERSATION_STAGES,
+    SESSION_BACKEND,
+    SESSION_REDIS_URL,
+    SESSION_TTL_SECONDS,
+)
+
+_log = logging.getLogger(__name__)
+
+_KEY_PREFIX = "talentscout:session:"
+_ROLES = ("user", "assistant", "system")
+# Records above this size (bytes of JSON) are stored zlib-compressed.
+_COMPRESS_OVER = 1024
+_SAVE_ATTEMPTS = 4
+
+
+class VersionConflict(Exception):
+    """The stored record changed since the writer last read it."""
+
+
+# ── Serialisation ──────────────────────────────────────────────────────────────
+
+def encode_state(state: dict) -> bytes:
+    """Serialise a session state into the compact stored form."""
+    record = {
+        "i": state["session_id"],
+        "g": state["stage"],
+        "e": int(state["ended"]),
+        "c": state["candidate_data"],
+        "m": [
+            [_ROLES.index(m["role"]), m["content"], m.get("time", "")]
+            for m in state["messages"]
+        ],
+        "s": sorted([idx, score] for idx, score in state["scores"].items()),
+    }
+    raw = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"z" + zlib.compress(raw) if len(raw) > _COMPRESS_OVER else b"j" + raw
+
+
+def decode_state(data: bytes) -> dict:
+    """Inverse of `encode_state`."""
+    raw = zlib.decompress(data[1:]) if data[:1] == b"z" else data[1:]
+    record = json.loads(raw)
+    return {
+        "session_id":     record["i"],
+        "stage":          record["g"],
+        "ended":          bool(record["e"]),
+        "candidate_data": record["c"],
+        "messages":       [{"role": _ROLES[r], "content": c, "time": t} for r, c, t in record["m"]],
+        "scores":         {idx: score for idx, score in record["s"]},
+    }
+
+
+def common_prefix(a: list[dict], b: list[dict]) -> int:
+    """Length of the longest common prefix of two message logs (by role and content)."""
+    n = 0
+    for x, y in zip(a, b):
+        if x["role"] != y["role"] or x["content"] != y["content"]:
+            break
+        n += 1
+    return n
+
+
+def merge_states(local: dict, stored: dict) -> dict:
+    """
+    Combine two diverged copies of one session.
+
+    Both copies extend the same append-only log, so the messages are merged
+    on their common prefix: the stored tail (written first) is kept and the
+    local tail is appended after it, with the local scores of those messages
+    moved to their new indices. Profile fields and scores are unioned with
+    local values taking precedence, and the stage is whichever of the two is
+    further along.
+    """
+    ours, theirs = local["messages"], stored["messages"]
+    prefix = common_prefix(ours, theirs)
+    local_tail, stored_tail = ours[prefix:], theirs[prefix:]
+    shift = len(stored_tail) if local_tail else 0
+    if local_tail and stored_tail:
+        _log.warning(
+            "Session %s diverged after message %d: keeping %d stored and appending %d local messages",
+            stored["session_id"], prefix, len(stored_tail), len(local_tail),
+        )
+    local_scores = {idx + shift if idx >= prefix else idx: score for idx, score in local["scores"].items()}
+
+    stage = max(local["stage"], stored["stage"], key=CONVERSATION_STAGES.index)
+    return {
+        "session_id":     stored["session_id"],
+        "stage":          stage,
+        "ended":          local["ended"] or stored["ended"],
+        "candidate_data": {**stored["candidate_data"], **local["candidate_data"]},
+        "messages":       theirs + local_tail,
+        "scores":         {**stored["scores"], **local_scores},
+    }
+
+
+# ── Backends ───────────────────────────────────────────────────────────────────
+
+class MemoryBackend:
+    """In-process versioned key-value store with per-key expiry."""
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS) -> None:
+        self._ttl = ttl_seconds
+        self._data: dict[str, tuple[int, bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[int, bytes] | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[2] < time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return entry[0], entry[1]
+
+    def compare_and_set(self, key: str, expected: int, data: bytes) -> int:
+        with self._lock:
+            entry = self._data.get(key)
+            current = entry[0] if entry and entry[2] >= time.monotonic() else 0
+            if current != expected:
+                raise VersionConflict(key)
+            self._data[key] = (current + 1, data, time.monotonic() + self._ttl)
+            return current + 1
+
+
+class RedisBackend:
+    """Versioned records in Redis hashes ({v: version, d: data}), CAS via WATCH/MULTI."""
+
+    def __init__(self, url: str = SESSION_REDIS_URL, ttl_seconds: int = SESSION_TTL_SECONDS, client=None):
+        import redis
+
+        self._redis = redis
+        self._client = client or redis.Redis.from_url(url)
+        self._ttl = ttl_seconds
+        self._client.ping()
+
+    def get(self, key: str) -> tuple[int, bytes] | None:
+        version, data = self._client.hmget(key, "v", "d")
+        if version is None or data is None:
+            return None
+        return int(version), data
+
+    def compare_and_set(self, key: str, expected: int, data: bytes) -> int:
+        with self._client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                current = int(pipe.hget(key, "v") or 0)
+                if current != expected:
+                    raise VersionConflict(key)
+                pipe.multi()
+                pipe.hset(key, mapping={"v": current + 1, "d": data})
+                pipe.expire(key, self._ttl)
+                pipe.execute()
+            except self._redis.WatchError as exc:
+                raise VersionConflict(key) from exc
+        return current + 1
+
+
+_BACKENDS = {"memory": MemoryBackend, "redis": RedisBackend}
+
+
+# ── Store ──────────────────────────────────────────────────────────────────────
+
+class SharedSessionStore:
+    """Versioned session states on a shared backend."""
+
+    def __init__(self, backend) -> None:
+        self._backend = backend
+        self._stats = {"loads": 0, "saves": 0, "conflicts": 0, "bytes": 0}
+
+    def load(self, token: str) -> tuple[int, dict] | None:
+        """Return (version, state) for `token`, or None if there is no live record."""
+        self._stats["loads"] += 1
+        found = self._backend.get(_KEY_PREFIX + token)
+        if found is None:
+            return None
+        return found[0], decode_state(found[1])
+
+    def save(self, token: str, state: dict, version: int) -> tuple[int, dict]:
+        """
+        Write `state` if the record is still at `version` (0 for a new session).
+
+        On a version conflict the stored state is merged in and the write is
+        retried.
+
+        Returns
+        -------
+        tuple[int, dict]
+            The new version and the state actually stored: `state` itself, or
+            the merged state after a conflict.
+        """
+        key = _KEY_PREFIX + token
+        for _ in range(_SAVE_ATTEMPTS):
+            data = encode_state(state)
+            try:
+                version = self._backend.compare_and_set(key, version, data)
+            except VersionConflict:
+                self._stats["conflicts"] += 1
+                found = self._backend.get(key)
+                if found is None:
+                    version = 0
+                    continue
+                version = found[0]
+                state = merge_states(state, decode_state(found[1]))
+                continue
+            self._stats["saves"] += 1
+            self._stats["bytes"] += len(data)
+            return version, state
+        raise VersionConflict(key)
+
+    def stats(self) -> dict[str, int]:
+        """Load/save/conflict counters and total bytes written."""
+        return dict(self._stats)
+
+
+_store: SharedSessionStore | None = None
+_store_ready = False
+_store_lock = threading.Lock()
+
+
+def get_shared_store() -> SharedSessionStore | None:
+    """
+    Return the process-wide shared store, or None when SESSION_BACKEND is
+    unset or its backend cannot be reached (the app then runs replica-local).
+    """
+    global _store, _store_ready
+    if not _store_ready:
+        with _store_lock:
+            if not _store_ready:
+                factory = _BACKENDS.get(SESSION_BACKEND)
+                if SESSION_BACKEND and factory is None:
+                    _log.warning("Unknown session backend %r ignored", SESSION_BACKEND)
+                elif factory is not None:
+                    try:
+                        _store = SharedSessionStore(factory())
+                    except Exception as exc:  # missing redis package, unreachable server, …
+                        _log.warning("Shared session backend %s unavailable: %s", SESSION_BACKEND, exc)
+                _store_ready = True
+    return _store
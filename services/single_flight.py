@@ -0,0 +1,152 @@
+"""
+services/single_flight.py
+─────────────────────────
+Merge byte-identical in-flight LLM requests into one upstream call.
+
+When a burst of candidates opens the screening link at once, many sessions
+send exactly the same request (same messages, same parameters). The first
+caller for a key becomes the leader and makes the upstream call; everyone
+else who asks for that key while it is in flight waits for — and shares —
+the leader's result. Nothing is cached once the call completes.
+
+`do()` covers blocking calls. `stream()` fans one upstream stream out to
+every concurrent consumer: a pump thread reads it into a shared buffer and
+each consumer replays the buffer from the start at its own pace. When the
+last consumer closes its stream early, the upstream stream is closed too
+instead of being read to the end for nobody.
+"""
+
+import contextvars
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(*parts) -> str:
+    """Stable hash of a request's JSON-serialisable parts."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Broadcast:
+    """Append-only fragment buffer shared by the consumers of one stream."""
+
+    def __init__(self):
+        self.fragments: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0  # guarded by SingleFlight._lock
+        self.cancelled = False
+        self.cond = threading.Condition()
+
+    def pump(self, stream: Iterator[str], on_finish: Callable[[], None]) -> None:
+        try:
+            for fragment in stream:
+                with self.cond:
+                    if self.cancelled:
+                        break
+                    self.fragments.append(fragment)
+                    self.cond.notify_all()
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            stream.close()
+            on_finish()
+            with self.cond:
+                self.done = True
+                self.cond.notify_all()
+
+    def replay(self) -> Iterator[str]:
+        index = 0
+        while True:
+            with self.cond:
+                while index >= len(self.fragments) and not self.done:
+                    self.cond.wait()
+                pending = self.fragments[index:]
+                finished = self.done
+            yield from pending
+            index += len(pending)
+            if finished and index >= len(self.fragments):
+                break
+        if self.error is not None:
+            raise self.error
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._streams: dict[str, _Broadcast] = {}
+        self.merged = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Return fn(), sharing one execution among concurrent callers of `key`."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.merged += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    def stream(self, key: str, make_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Yield the fragments of one shared upstream stream for `key`."""
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is None:
+                broadcast = self._streams[key] = _Broadcast()
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(broadcast.pump, _lazy(make_stream), lambda: self._finish(key, broadcast)),
+                    name="talentscout-singleflight",
+                    daemon=True,
+                ).start()
+            else:
+                self.merged += 1
+            broadcast.subscribers += 1
+        return self._subscribe(key, broadcast)
+
+    def _subscribe(self, key: str, broadcast: _Broadcast) -> Iterator[str]:
+        """Replay `broadcast`; the last consumer to leave early cancels the upstream."""
+        try:
+            yield from broadcast.replay()
+        finally:
+            with self._lock:
+                broadcast.subscribers -= 1
+                if broadcast.subscribers == 0:
+                    with broadcast.cond:
+                        broadcast.cancelled = not broadcast.done
+                    if broadcast.cancelled and self._streams.get(key) is broadcast:
+                        del self._streams[key]
+
+    def _finish(self, key: str, broadcast: _Broadcast) -> None:
+        # Late arrivals after the upstream finished start a fresh call.
+        with self._lock:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+
+def _lazy(make_stream: Callable[[], Iterator[str]]) -> Iterator[str]:
+    """Defer make_stream() into the pump thread so its errors are broadcast too."""
+    yield from make_stream()
+
+
+flights = SingleFlight()
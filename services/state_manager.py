@@ -3,8 +3,19 @@ Manages conversation stage transitions and progress reporting.
 Stage order:
   greeting → collecting_info → tech_stack → technical_questions → wrap_up → ended
 
+Each session keeps a StageTracker that matches only the newest assistant
+message against precompiled signal matchers and logs why every transition
+happened; `infer_stage` is the stateless equivalent.
 """
 
+import logging
+import re
+from collections import deque
+
+from utils.taxonomy import canonical_tech
+
+_log = logging.getLogger(__name__)
+
 _PROGRESS: dict[str, int] = {
     "greeting":            10,
     "collecting_info":     30,
@@ -42,8 +53,6 @@ _WRAP_UP_SIGNALS = {
 }
 
 _TECH_Q_SIGNALS = {
-    "**python**", "**javascript**", "**react**", "**django**",
-    "**node**", "**sql**", "**java**", "**typescript**",
     "here are", "technical question", "let's assess", "proficiency",
     "following question",
 }
@@ -58,42 +67,152 @@ _INFO_SIGNALS = {
     "desired position", "current role", "tell me about yourself",
 }
 
+# Phrases in the latest reply that mean the assistant wrapped up the screening.
+_CONCLUDED_SIGNALS = {
+    "recruiter will", "2-3 business days", "2–3 business days",
+    "best of luck", "thank you for your time today",
+}
 
-def _recent_bot_text(messages: list[dict], n: int = 4) -> str:
-    """Return the concatenated text of the last n assistant messages, lowercased."""
-    bot_msgs = [m["content"] for m in messages if m["role"] == "assistant"]
-    return " ".join(bot_msgs[-n:]).lower()
-
-
-def infer_stage(messages: list[dict], current_stage: str) -> str:
-   
-    # Never retreat from a terminal state.
-    if current_stage == "ended":
-        return "ended"
-
-    recent = _recent_bot_text(messages)
-    assistant_count = sum(1 for m in messages if m["role"] == "assistant")
+# Phrases the assistant uses when asking the candidate to confirm their stack.
+_CONFIRM_SIGNALS = {
+    "confirm", "is that correct", "is that right", "is this correct",
+    "anything else", "did i miss", "is that everything", "is that all",
+}
 
-    # Detect terminal/wrap-up stage first (highest priority).
-    if any(signal in recent for signal in _WRAP_UP_SIGNALS):
-        return "ended"
 
-    # Detect technical questions stage.
-    if any(signal in recent for signal in _TECH_Q_SIGNALS):
-        return "technical_questions"
+def _matcher(signals: set[str]) -> re.Pattern:
+    """One case-insensitive alternation over a signal group, longest phrase first."""
+    return re.compile("|".join(re.escape(s) for s in sorted(signals, key=len, reverse=True)), re.I)
 
-    # Detect tech-stack probing stage.
-    if any(signal in recent for signal in _TECH_STACK_SIGNALS):
-        # Only advance if we haven't already passed this stage.
-        if current_stage in ("greeting", "collecting_info", "tech_stack"):
-            return "tech_stack"
 
-    # Early turns: still collecting basic info.
-    if assistant_count <= 1:
-        return "greeting"
+_MATCHERS: dict[str, re.Pattern] = {
+    "wrap_up":    _matcher(_WRAP_UP_SIGNALS),
+    "tech_q":     _matcher(_TECH_Q_SIGNALS),
+    "tech_stack": _matcher(_TECH_STACK_SIGNALS),
+    "info":       _matcher(_INFO_SIGNALS),
+}
+_CONCLUDED_RE = _matcher(_CONCLUDED_SIGNALS)
+_CONFIRM_RE = _matcher(_CONFIRM_SIGNALS)
+
+# A bold header naming a known technology ("**Django**") opens a question block.
+_BOLD_RE = re.compile(r"\*\*\s*\[?([^*\[\]\n]{1,60}?)\]?\s*\*\*")
+
+# Signals are looked for in this many of the latest assistant messages.
+_WINDOW = 4
+
+
+def _tech_header(text: str) -> str | None:
+    return next((m.group(1) for m in _BOLD_RE.finditer(text) if canonical_tech(m.group(1))), None)
+
+
+def _signals(text: str) -> dict[str, str]:
+    """The first phrase matched by each signal group in one assistant message."""
+    found = {}
+    for group, matcher in _MATCHERS.items():
+        match = matcher.search(text)
+        if match:
+            found[group] = match.group().lower()
+    if "tech_q" not in found:
+        header = _tech_header(text)
+        if header:
+            found["tech_q"] = f"**{header}**"
+    return found
+
+
+def awaiting_stack_confirmation(messages: list[dict]) -> bool:
+    """True if the latest assistant message asks the candidate to confirm their stack."""
+    last_bot = next((m["content"] for m in reversed(messages) if m["role"] == "assistant"), "")
+    return "?" in last_bot and _CONFIRM_RE.search(last_bot) is not None
+
+
+_STAGE_ORDER: dict[str, int] = {stage: i for i, stage in enumerate(_PROGRESS)}
+
+
+def advance_stage(current_stage: str, proposed: str | None) -> str:
+    """
+    Apply a stage reported by a structured turn.
+
+    The proposed stage is accepted only if it is known and does not move the
+    conversation backwards; otherwise the current stage is kept.
+    """
+    if proposed not in _STAGE_ORDER:
+        return current_stage
+    if _STAGE_ORDER[proposed] < _STAGE_ORDER.get(current_stage, 0):
+        return current_stage
+    if proposed != current_stage:
+        _log.info("Stage %s → %s: reported by structured turn", current_stage, proposed)
+    return proposed
+
+
+class StageTracker:
+    """
+    Incremental stage inference for one session (kept in session_state).
+
+    Each assistant message is matched against the signal groups once, when
+    it is first seen; the tracker keeps the matches for the last _WINDOW
+    assistant messages and a running assistant-message count, so a turn
+    costs the same however long the transcript is.
+    """
+
+    def __init__(self):
+        self.cursor = 0            # first message not yet observed
+        self.assistant_count = 0
+        self.concluded = False     # latest reply wrapped up the screening
+        self._window: deque[dict[str, str]] = deque(maxlen=_WINDOW)
+
+    def observe(self, messages: list[dict]) -> None:
+        """Match the assistant messages added since the last call."""
+        if self.cursor > len(messages):
+            self.__init__()  # the transcript was reset
+        for msg in messages[self.cursor:]:
+            if msg["role"] == "assistant":
+                self.assistant_count += 1
+                self._window.append(_signals(msg["content"]))
+                self.concluded = _CONCLUDED_RE.search(msg["content"]) is not None
+        self.cursor = len(messages)
+
+    def _recent(self, group: str) -> str | None:
+        """The phrase of `group` matched in the most recent window message, if any."""
+        return next((found[group] for found in reversed(self._window) if group in found), None)
+
+    def infer(self, current_stage: str) -> tuple[str, str]:
+        """The stage implied by the observed messages, and why."""
+        # Never retreat from a terminal state.
+        if current_stage == "ended":
+            return "ended", "terminal"
+
+        # Detect terminal/wrap-up stage first (highest priority).
+        if phrase := self._recent("wrap_up"):
+            return "ended", f"wrap-up signal {phrase!r}"
+
+        # Detect technical questions stage.
+        if phrase := self._recent("tech_q"):
+            return "technical_questions", f"technical-question signal {phrase!r}"
+
+        # Detect tech-stack probing stage, only if we haven't already passed it.
+        phrase = self._recent("tech_stack")
+        if phrase and current_stage in ("greeting", "collecting_info", "tech_stack"):
+            return "tech_stack", f"tech-stack signal {phrase!r}"
+
+        # Early turns: still collecting basic info.
+        if self.assistant_count <= 1:
+            return "greeting", "first assistant message"
+
+        if phrase := self._recent("info"):
+            return "collecting_info", f"info signal {phrase!r}"
+
+        # Default: stay in current stage (never regress).
+        return current_stage, "no signal"
+
+    def update(self, messages: list[dict], current_stage: str) -> str:
+        """Observe new messages and return the next stage, logging any transition."""
+        self.observe(messages)
+        stage, reason = self.infer(current_stage)
+        if stage != current_stage:
+            _log.info("Stage %s → %s: %s", current_stage, stage, reason)
+        return stage
 
-    if any(signal in recent for signal in _INFO_SIGNALS):
-        return "collecting_info"
 
-    # Default: stay in current stage (never regress).
-    return current_stage
+def infer_stage(messages: list[dict], current_stage: str) -> str:
+    """Stateless inference: replay the whole transcript through a fresh StageTracker."""
+    return StageTracker().update(messages, current_stage)
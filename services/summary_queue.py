@@ -0,0 +1,82 @@
+"""
+services/summary_queue.py
+─────────────────────────
+Incremental background summary of older conversation turns.
+
+The summary is kept in a small per-session dict (session_state.context):
+  {"summary": str, "upto": int, "pending": (Future, cut) | None}
+where `upto` is the index of the first message NOT covered by the summary.
+It is extended in the background at stage boundaries, or earlier if the
+verbatim tail outgrows the token budget, and read by
+services/context_builder.build_context on every reply.
+"""
+
+from config.settings import CONTEXT_TOKEN_BUDGET, CONTEXT_KEEP_MESSAGES
+from services.background import submit
+from services.context_builder import message_tokens
+from services.llm_service import summarize_history
+
+# Start folding turns into the summary once the verbatim tail uses this share
+# of the budget, so the summary is ready before trimming would drop anything.
+_SUMMARY_TRIGGER_RATIO = 0.75
+
+
+def collect_summary(ctx: dict) -> bool:
+    """
+    Apply a finished background summary to `ctx`.
+
+    Returns
+    -------
+    bool
+        True if the summary advanced.
+    """
+    pending = ctx.get("pending")
+    if not pending or not pending[0].done():
+        return False
+    future, cut = pending
+    ctx["pending"] = None
+
+    try:
+        summary = future.result()
+    except Exception:
+        summary = None
+    if not summary:
+        return False
+
+    ctx["summary"] = summary
+    ctx["upto"] = cut
+    return True
+
+
+def maybe_schedule_summary(
+    ctx: dict,
+    messages: list[dict],
+    stage_changed: bool,
+    budget: int = CONTEXT_TOKEN_BUDGET,
+    keep: int = CONTEXT_KEEP_MESSAGES,
+) -> bool:
+    """
+    Fold older turns into the summary in the background when worthwhile.
+
+    A summary job is started at stage boundaries, or whenever the verbatim
+    tail crosses _SUMMARY_TRIGGER_RATIO of the budget, provided there are
+    turns outside the last `keep` messages that are not yet summarised and no
+    job is already running.
+
+    Returns
+    -------
+    bool
+        True if a job was submitted.
+    """
+    upto = ctx.get("upto", 0)
+    cut = len(messages) - keep
+    if ctx.get("pending") or cut <= upto:
+        return False
+
+    tail_tokens = sum(message_tokens(m) for m in messages[upto:])
+    if not stage_changed and tail_tokens < budget * _SUMMARY_TRIGGER_RATIO:
+        return False
+
+    turns = [{"role": m["role"], "content": m["content"]} for m in messages[upto:cut]]
+    ctx["pending"] = (submit(summarize_history, ctx.get("summary", ""), turns), cut)
+    return True
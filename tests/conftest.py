@@ -0,0 +1,45 @@
+"""
+tests/conftest.py
+─────────────────
+Shared fixtures.
+"""
+
+from concurrent.futures import Future
+
+import pytest
+
+from services import (
+    engine, greeting_pool, prefetch, providers, question_bank, score_cache, score_queue, summary_queue,
+)
+from services.providers import ProviderRegistry
+from services.question_bank import QuestionBank
+from services.score_cache import ScoreCache
+from tools.mock_llm import MockProvider
+
+
+def _inline(fn, *args, **kwargs) -> Future:
+    """Run a background job on the calling thread and return its finished Future."""
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+@pytest.fixture
+def mock_llm(monkeypatch):
+    """
+    The scripted interviewer of tools/mock_llm.py as the only provider, with
+    no latency, in-memory score cache and question bank, and background jobs
+    run inline so every turn's side work has landed when it returns.
+    """
+    mock = MockProvider(ttft=0, token_rate=1e6, seed=7)
+    monkeypatch.setattr(providers, "_registry", ProviderRegistry([mock]))
+    monkeypatch.setattr(score_cache, "_cache", ScoreCache(":memory:"))
+    monkeypatch.setattr(question_bank, "_bank", QuestionBank(":memory:"))
+    monkeypatch.setattr(greeting_pool, "_pool", [])
+    monkeypatch.setattr(greeting_pool, "GREETING_POOL_SIZE", 0)
+    for module in (engine, greeting_pool, prefetch, question_bank, score_queue, summary_queue):
+        monkeypatch.setattr(module, "submit", _inline)
+    return mock
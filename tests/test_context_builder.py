@@ -0,0 +1,43 @@
+"""
+tests/test_context_builder.py
+─────────────────────────────
+Token budget of the reply context.
+"""
+
+from services.context_builder import build_context, message_tokens
+
+
+def _history(n: int, words: int = 50) -> list[dict]:
+    return [
+        {"role": "user" if i % 2 else "assistant", "content": f"message {i} " + "word " * words, "time": "10:00"}
+        for i in range(n)
+    ]
+
+
+def test_short_history_is_sent_whole():
+    context = build_context("system", _history(4))
+    assert [m["content"] for m in context[1:]] == [m["content"] for m in _history(4)]
+    assert all(set(m) == {"role", "content"} for m in context)
+
+
+def test_budget_keeps_the_newest_messages_that_fit():
+    history = _history(100)
+    context = build_context("system", history, budget=600, keep=2)
+    tail = context[1:]
+    assert tail[-1]["content"] == history[-1]["content"]
+    assert sum(message_tokens(m) for m in context) <= 600
+    # The next older message would not have fitted.
+    older = history[-len(tail) - 1]
+    assert sum(message_tokens(m) for m in context) + message_tokens(older) > 600
+
+
+def test_keep_wins_over_budget():
+    context = build_context("system", _history(10, words=500), budget=10, keep=3)
+    assert len(context) == 4
+
+
+def test_summary_replaces_summarised_messages():
+    history = _history(10)
+    context = build_context("system", history, summary="Earlier: intro.", upto=6)
+    assert context[1]["role"] == "system" and "Earlier: intro." in context[1]["content"]
+    assert [m["content"] for m in context[2:]] == [m["content"] for m in history[6:]]
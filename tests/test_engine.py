@@ -0,0 +1,94 @@
+"""
+tests/test_engine.py
+────────────────────
+Full screenings through ScreeningSession against the scripted mock LLM.
+"""
+
+from config.settings import FAREWELL_MESSAGE, QUESTION_BANK_INTRO
+from services import engine
+from services.engine import ScreeningSession
+from tools.mock_llm import ASK_INFO, NEXT_QUESTION, WELCOME, WRAP_UP
+
+PROFILE = "ada@example.com, +1 555 0100, Berlin, 5 years"
+ANSWERS = ["Migrations version the schema.", "Profile it, then cache.", "Shard the writes."]
+
+
+def _say(session: ScreeningSession, text: str) -> str:
+    reply = "".join(session.reply(text))
+    session.poll()
+    return reply
+
+
+def _to_questions(session: ScreeningSession) -> str:
+    """Start a session and answer up to the Stage 4 questions; returns the question block reply."""
+    "".join(session.start())
+    for text in ("Ada Lovelace", PROFILE, "Python, Django"):
+        _say(session, text)
+    return _say(session, "Yes")
+
+
+def test_start_streams_the_greeting(mock_llm):
+    session = ScreeningSession()
+    chunks = list(session.start())
+    assert len(chunks) > 1
+    assert "".join(chunks).strip() == WELCOME
+    assert session.started and session.stage == "greeting"
+    assert session.messages[-1]["role"] == "assistant"
+
+
+def test_reply_records_the_answer_before_the_reply_is_consumed(mock_llm):
+    session = ScreeningSession()
+    "".join(session.start())
+    chunks = session.reply("Ada Lovelace")
+    assert session.messages[-1] == {"role": "user", "content": "Ada Lovelace", "time": session.messages[-1]["time"]}
+
+    assert "".join(chunks).strip() == ASK_INFO
+    assert session.messages[-1]["role"] == "assistant"
+    # Post-reply bookkeeping: profile fields, cursor and stage.
+    assert session.candidate_data["full_name"] == "Ada Lovelace"
+    assert session.extract_cursor == len(session.messages)
+    assert session.stage == "collecting_info"
+
+
+def test_stack_confirmation_serves_the_question_bank(mock_llm):
+    session = ScreeningSession()
+    block = _to_questions(session)
+    assert session.candidate_data["tech_stack"] == ["Python", "Django"]
+    assert block.startswith(QUESTION_BANK_INTRO)
+    assert "**Python**" in block and "**Django**" in block
+    assert session.stage == "technical_questions"
+
+
+def test_answers_are_scored_and_the_screening_ends(mock_llm):
+    session = ScreeningSession()
+    _to_questions(session)
+    replies = [_say(session, answer) for answer in ANSWERS]
+    assert [r.strip() for r in replies] == [NEXT_QUESTION, NEXT_QUESTION, WRAP_UP]
+
+    answered = [i for i, m in enumerate(session.messages) if m["content"] in ANSWERS]
+    assert sorted(session.scores) == answered
+    assert not session.pending_scores
+    assert session.stage == "ended" and session.ended
+
+
+def test_exit_ends_the_screening_without_an_llm_call(mock_llm):
+    session = ScreeningSession()
+    "".join(session.start())
+    calls = mock_llm.calls
+    assert "".join(session.reply("bye")) == FAREWELL_MESSAGE
+    assert mock_llm.calls == calls
+    assert session.ended and session.stage == "ended"
+    assert session.messages[-1]["content"] == FAREWELL_MESSAGE
+
+
+def test_structured_turns_score_in_the_reply_call(mock_llm, monkeypatch):
+    session = ScreeningSession()
+    _to_questions(session)
+    monkeypatch.setattr(engine, "TURN_MODE", "structured")
+
+    chunks = list(session.reply(ANSWERS[0]))
+    assert [c.strip() for c in chunks] == [NEXT_QUESTION]  # yielded whole
+    index = len(session.messages) - 2
+    assert session.messages[index]["content"] == ANSWERS[0]
+    assert index in session.scores and not session.pending_scores
+    assert session.stage == "technical_questions"
@@ -0,0 +1,166 @@
+"""
+tests/test_executor.py
+──────────────────────
+Retries, hedging, latency budgets and stream cleanup of the executor.
+
+Backoff sleeps are recorded instead of slept. Attempts are fakes gated on
+events, so the only real waiting is the short p95 or budget under test.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import executor
+from services.executor import LatencyTracker, execute, execute_stream
+from services.providers import ProviderError
+
+_P95 = 0.2
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the executor asked to sleep; nothing actually sleeps."""
+    slept: list[float] = []
+    monkeypatch.setattr(executor, "time", SimpleNamespace(monotonic=time.monotonic, sleep=slept.append))
+    monkeypatch.setattr(executor, "RETRY_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(executor, "tracker", LatencyTracker())
+    return slept
+
+
+@pytest.fixture
+def hedging(monkeypatch):
+    """A tracker whose p95 for every call type is _P95 seconds."""
+    tracker = LatencyTracker()
+    for _ in range(executor.HEDGE_MIN_SAMPLES):
+        tracker.record("t", _P95)
+    monkeypatch.setattr(executor, "tracker", tracker)
+    monkeypatch.setattr(executor, "HEDGE_ENABLED", True)
+    return tracker
+
+
+def _failing(*errors):
+    """An attempt raising `errors` in turn, then returning "ok"; counts its calls."""
+    calls = []
+
+    def attempt():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return attempt, calls
+
+
+def _rate_limit() -> ProviderError:
+    return ProviderError("p", "rate_limit", "slow down", 429)
+
+
+# ── Retries ────────────────────────────────────────────────────────────────────
+
+def test_retryable_errors_are_retried_with_capped_jitter(sleeps):
+    attempt, calls = _failing(_rate_limit(), ProviderError("p", "status", "bad gateway", 502))
+    assert execute(attempt, "t") == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= executor.RETRY_BASE_DELAY
+    assert 0 <= sleeps[1] <= executor.RETRY_BASE_DELAY * 2
+
+
+def test_auth_errors_are_not_retried(sleeps):
+    attempt, calls = _failing(ProviderError("p", "auth", "bad key", 401))
+    with pytest.raises(ProviderError) as info:
+        execute(attempt, "t")
+    assert info.value.kind == "auth"
+    assert len(calls) == 1 and sleeps == []
+
+
+def test_retries_stop_at_max_attempts(sleeps):
+    attempt, calls = _failing(*[_rate_limit()] * 5)
+    with pytest.raises(ProviderError):
+        execute(attempt, "t")
+    assert len(calls) == 3
+
+
+# ── Hedging ────────────────────────────────────────────────────────────────────
+
+def test_fast_calls_are_not_hedged(hedging):
+    attempt, calls = _failing()
+    assert execute(attempt, "t") == "ok"
+    time.sleep(_P95 * 1.5)
+    assert len(calls) == 1
+
+
+def test_hedge_starts_after_p95_and_first_answer_wins(hedging):
+    started: list[float] = []
+    hedge_started = threading.Event()
+
+    def attempt():
+        started.append(time.monotonic())
+        if len(started) == 1:
+            hedge_started.wait(2)
+            return "slow"
+        hedge_started.set()
+        return "fast"
+
+    assert execute(attempt, "t") == "fast"
+    assert len(started) == 2
+    assert started[1] - started[0] >= _P95 * 0.9
+
+
+# ── Budget ─────────────────────────────────────────────────────────────────────
+
+def test_budget_is_enforced(monkeypatch, sleeps):
+    monkeypatch.setitem(executor.LLM_LATENCY_BUDGETS, "t", 0.1)
+    release = threading.Event()
+    began = time.monotonic()
+    with pytest.raises(ProviderError) as info:
+        execute(lambda: release.wait(2), "t")
+    release.set()
+    assert info.value.kind == "timeout"
+    assert time.monotonic() - began < 1
+
+
+# ── Streams ────────────────────────────────────────────────────────────────────
+
+def test_losing_hedged_stream_is_closed(hedging):
+    streams: list[dict] = []
+
+    def make_stream():
+        state = {"closed": False}
+        slow = not streams
+        streams.append(state)
+
+        def fragments():
+            try:
+                if slow:
+                    time.sleep(_P95 * 2)
+                yield "first "
+                yield "second"
+            finally:
+                state["closed"] = True
+
+        return fragments()
+
+    assert "".join(execute_stream(make_stream, "t")) == "first second"
+    assert len(streams) == 2
+
+    deadline = time.monotonic() + 2
+    while not streams[0]["closed"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert streams[0]["closed"]
+
+
+def test_stream_retries_until_first_fragment(sleeps):
+    calls = []
+
+    def make_stream():
+        calls.append(1)
+        if len(calls) == 1:
+            raise _rate_limit()
+        return iter(["a", "b"])
+
+    assert list(execute_stream(make_stream, "t")) == ["a", "b"]
+    assert len(calls) == 2 and len(sleeps) == 1
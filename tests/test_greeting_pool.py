@@ -0,0 +1,59 @@
+"""
+tests/test_greeting_pool.py
+───────────────────────────
+Serving and refreshing pre-generated greetings, with a stubbed LLM.
+"""
+
+import itertools
+
+import pytest
+
+from services import greeting_pool
+from services.greeting_pool import _refresh_job, take_greeting
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Empty pool of size 3; greetings are numbered and refresh jobs are queued, not run."""
+    entries: list[tuple[float, str]] = []
+    jobs = []
+    counter = itertools.count(1)
+    monkeypatch.setattr(greeting_pool, "_pool", entries)
+    monkeypatch.setattr(greeting_pool, "_refreshing", False)
+    monkeypatch.setattr(greeting_pool, "GREETING_POOL_SIZE", 3)
+    monkeypatch.setattr(greeting_pool, "GREETING_MAX_AGE_SECONDS", 3600)
+    monkeypatch.setattr(greeting_pool, "generate_greeting", lambda: f"Welcome #{next(counter)}")
+    monkeypatch.setattr(greeting_pool, "submit", jobs.append)
+    return entries, jobs
+
+
+def test_empty_pool_schedules_one_refresh(pool):
+    entries, jobs = pool
+    assert take_greeting() is None
+    assert take_greeting() is None
+    assert jobs == [_refresh_job]  # only one refresh at a time
+
+    jobs[0]()
+    assert sorted(g for _, g in entries) == ["Welcome #1", "Welcome #2", "Welcome #3"]
+    assert take_greeting() in {"Welcome #1", "Welcome #2", "Welcome #3"}
+    assert len(jobs) == 1  # full and fresh: nothing to refresh
+
+
+def test_stale_greetings_are_served_then_replaced(pool):
+    entries, jobs = pool
+    entries[:] = [(0.0, "Old #1"), (0.0, "Old #2"), (0.0, "Old #3")]
+    assert take_greeting().startswith("Old")
+    assert len(jobs) == 1
+
+    jobs[0]()
+    assert sorted(g for _, g in entries) == ["Welcome #1", "Welcome #2", "Welcome #3"]
+    # The refresh finished, so a later stale pool can start another.
+    assert not greeting_pool._refreshing
+
+
+def test_failed_generation_stops_the_refresh(pool, monkeypatch):
+    entries, jobs = pool
+    monkeypatch.setattr(greeting_pool, "generate_greeting", lambda: None)
+    take_greeting()
+    jobs[0]()
+    assert entries == [] and not greeting_pool._refreshing
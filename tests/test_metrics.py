@@ -0,0 +1,95 @@
+"""
+tests/test_metrics.py
+─────────────────────
+Recording LLM calls and the Prometheus exposition, file writer and session rollup.
+"""
+
+import pytest
+
+from services import metrics
+from services.metrics import CallTimer, MetricsStore, render, session_rollup, set_context, write_file
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fresh = MetricsStore(session_limit=2)
+    monkeypatch.setattr(metrics, "store", fresh)
+    token = metrics._context.set({})
+    yield fresh
+    metrics._context.reset(token)
+
+
+def _call(call_type: str = "reply", outcome: str = "ok", usage: dict | None = None, text: str = "") -> None:
+    timer = CallTimer(call_type, "groq", "m-big", [{"role": "user", "content": "Hello there"}])
+    timer.first_token()
+    timer.output(text)
+    timer.usage.update(usage or {})
+    timer.finish(outcome)
+
+
+def _samples(text: str) -> dict[str, float]:
+    """Sample lines of an exposition: series → value."""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines() if line and not line.startswith("#")
+    }
+
+
+def test_render_exposes_calls_in_prometheus_format(store):
+    set_context(session="s1", stage="tech_stack")
+    _call(usage={"prompt_tokens": 100, "completion_tokens": 20})
+    _call(outcome="rate_limit")
+
+    text = render()
+    samples = _samples(text)
+    ok = 'call_type="reply",stage="tech_stack",provider="groq",model="m-big",outcome="ok"'
+    assert "# TYPE talentscout_llm_latency_seconds histogram" in text
+    assert samples[f"talentscout_llm_requests_total{{{ok}}}"] == 1
+    assert samples[f'talentscout_llm_requests_total{{{ok[:-4]}"rate_limit"}}'] == 1
+    assert samples[f'talentscout_llm_latency_seconds_bucket{{{ok},le="+Inf"}}'] == 1
+    assert samples[f'talentscout_llm_prompt_tokens_bucket{{{ok},le="128"}}'] == 1
+    assert samples[f'talentscout_llm_prompt_tokens_bucket{{{ok},le="64"}}'] == 0
+    assert samples[f"talentscout_llm_completion_tokens_sum{{{ok}}}"] == 20
+    assert samples[f"talentscout_llm_ttft_seconds_count{{{ok}}}"] == 1
+    assert "talentscout_llm_pool_size" in text
+
+
+def test_missing_usage_is_estimated_and_counted(store):
+    set_context(session="s1", stage="greeting")
+    _call(text="A fairly short reply.")
+    samples = _samples(render())
+    assert samples[
+        'talentscout_llm_tokens_estimated_total{call_type="reply",stage="greeting",provider="groq",model="m-big",outcome="ok"}'
+    ] == 1
+
+
+def test_session_rollup_totals_one_session(store):
+    set_context(session="s1", stage="technical_questions")
+    _call("reply", usage={"prompt_tokens": 100, "completion_tokens": 20})
+    _call("score", usage={"prompt_tokens": 50, "completion_tokens": 5})
+    _call("score", outcome="timeout")
+    set_context(session="s2")
+    _call("reply", usage={"prompt_tokens": 1, "completion_tokens": 1})
+
+    rollup = session_rollup("s1")
+    assert rollup["calls"] == 3 and rollup["errors"] == 1
+    assert rollup["prompt_tokens"] == 150 and rollup["completion_tokens"] == 25
+    assert rollup["by_call_type"] == {"reply": 1, "score": 2}
+    assert session_rollup("unknown") == {}
+
+
+def test_rollups_are_bounded_least_recent_first(store):
+    for session in ("s1", "s2", "s1", "s3"):
+        set_context(session=session, stage="greeting")
+        _call()
+    assert session_rollup("s2") == {}
+    assert session_rollup("s1")["calls"] == 2 and session_rollup("s3")["calls"] == 1
+
+
+def test_write_file_replaces_the_exposition_atomically(store, tmp_path):
+    set_context(session="s1", stage="greeting")
+    _call(usage={"prompt_tokens": 10, "completion_tokens": 2})
+    path = tmp_path / "out" / "metrics.prom"
+    write_file(str(path))
+    assert path.read_text(encoding="utf-8") == render()
+    assert not (tmp_path / "out" / "metrics.prom.tmp").exists()
@@ -0,0 +1,79 @@
+"""
+tests/test_model_router.py
+──────────────────────────
+Tier routing, per-model latency and the downgrade hold.
+"""
+
+import pytest
+
+from services import model_router
+from services.providers import LLMProvider, ProviderRegistry
+
+
+class _Registry:
+    """Stands in for the provider registry with a fixed p95."""
+
+    def __init__(self, p95: float | None):
+        self.p95 = p95
+        self.resets = 0
+
+    def latency_p95(self, tier: str, min_samples: int) -> float | None:
+        return self.p95
+
+    def reset_latency(self, tier: str) -> None:
+        self.resets += 1
+        self.p95 = None
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fake = _Registry(None)
+    monkeypatch.setattr(model_router, "get_registry", lambda: fake)
+    monkeypatch.setattr(model_router, "pool_stats", lambda: {"in_flight": 0, "pool_size": 10})
+    monkeypatch.setattr(model_router, "_downgraded", {})
+    return fake
+
+
+def test_call_types_map_to_tiers(registry):
+    assert model_router.route("score")["tier"] == "scoring"
+    assert model_router.route("summary")["tier"] == "summarization"
+    assert model_router.route("something-new")["tier"] == "conversation"
+
+
+def test_slow_model_downgrades_and_holds(registry, monkeypatch):
+    monkeypatch.setattr(model_router, "DOWNGRADE_HOLD_SECONDS", 3600)
+    registry.p95 = model_router.DOWNGRADE_P95_SECONDS + 1
+    assert model_router.route("reply")["tier"] == "fast"
+    assert registry.resets == 1  # the slow samples are forgotten
+    # Fast again, but the downgrade holds.
+    assert model_router.route("reply")["tier"] == "fast"
+
+
+def test_downgrade_ends_after_hold_on_fresh_samples(registry, monkeypatch):
+    monkeypatch.setattr(model_router, "DOWNGRADE_HOLD_SECONDS", 0)
+    registry.p95 = model_router.DOWNGRADE_P95_SECONDS + 1
+    assert model_router.route("reply")["tier"] == "fast"
+    assert model_router.route("reply")["tier"] == "conversation"
+
+
+class _Fake(LLMProvider):
+    def __init__(self, name: str):
+        self.name = name
+        self.models = {"conversation": f"{name}-big", "fast": f"{name}-small"}
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        return "ok"
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None):
+        yield self.complete(messages, max_tokens, tier=tier)
+
+
+def test_registry_tracks_latency_per_model():
+    registry = ProviderRegistry([_Fake("a")])
+    for _ in range(3):
+        registry.complete([{"role": "user", "content": "hi"}], 10, tier="fast")
+    assert registry.latency_p95("fast", 3) is not None
+    assert registry.latency_p95("conversation", 1) is None
+
+    registry.reset_latency("fast")
+    assert registry.latency_p95("fast", 1) is None
@@ -0,0 +1,89 @@
+"""
+tests/test_persistence.py
+─────────────────────────
+Two replicas writing one session: merge, adoption and archive resync.
+"""
+
+from concurrent.futures import Future
+
+import pytest
+
+from services import persistence, score_queue
+from services.engine import ScreeningSession
+from services.persistence import SessionPersister, resume
+from services.score_queue import schedule_score
+from services.session_store import SessionStore
+from services.shared_store import MemoryBackend, SharedSessionStore
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    archive = SessionStore(str(tmp_path / "sessions.sqlite3"), flush_seconds=0.01)
+    shared = SharedSessionStore(MemoryBackend(ttl_seconds=60))
+    monkeypatch.setattr(persistence, "get_store", lambda: archive)
+    monkeypatch.setattr(persistence, "get_shared_store", lambda: shared)
+    yield archive, shared
+    archive.close()
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Scoring jobs submitted to the background pool, left unfinished."""
+    submitted = []
+
+    def submit(fn, job, attempt):
+        submitted.append(job)
+        return Future()
+
+    monkeypatch.setattr(score_queue, "submit", submit)
+    return submitted
+
+
+def _turn(session, answer: str, reply: str) -> None:
+    session.messages.append({"role": "user", "content": answer, "time": "10:00"})
+    session.messages.append({"role": "assistant", "content": reply, "time": "10:00"})
+
+
+def test_concurrent_writers_merge_and_resync(stores, jobs):
+    archive, shared = stores
+    opening = [
+        {"role": "user", "content": "Hello", "time": "10:00"},
+        {"role": "assistant", "content": "**Django**\n1. How do migrations work?", "time": "10:00"},
+    ]
+    first = ScreeningSession("sid")
+    first.messages = list(opening)
+    SessionPersister("tok").save(first)
+    archive.flush()
+
+    # Two replicas resume the same session and each answer once.
+    a, a_persister = resume("tok")
+    b, b_persister = resume("tok")
+    _turn(a, "Schema versions.", "Thanks!")
+    a.scores[2] = 70
+    a_persister.save(a)
+
+    _turn(b, "They track model changes.", "Noted.")
+    schedule_score(b.pending_scores, 2, opening[1]["content"], "They track model changes.")
+    b.extract_cursor = 4
+    b_persister.save(b)  # conflicts with a's write and merges
+
+    contents = [m["content"] for m in b.messages]
+    assert contents[2:] == ["Schema versions.", "Thanks!", "They track model changes.", "Noted."]
+    assert b.scores == {2: 70}
+    # b's in-flight score followed its answer to index 4.
+    assert set(b.pending_scores) == {4}
+    assert jobs[-1]["index"] == 4 and jobs[-1]["answer"] == "They track model changes."
+    assert b.extract_cursor == 2
+    assert b.tracker.cursor == len(b.messages)
+
+    # The archive holds the merged order and scores, and b's next save adds nothing stale.
+    archive.flush()
+    saved = archive.load("tok")
+    assert [m["content"] for m in saved["messages"]] == contents
+    assert saved["scores"] == {2: 70}
+
+    b.scores[4] = 55
+    b_persister.save(b)
+    archive.flush()
+    assert archive.load("tok")["scores"] == {2: 70, 4: 55}
+    assert shared.load("tok")[1]["scores"] == {2: 70, 4: 55}
@@ -0,0 +1,47 @@
+"""
+tests/test_prefetch.py
+──────────────────────
+Keying of the speculative question prefetch.
+"""
+
+from concurrent.futures import Future
+
+import pytest
+
+from services import prefetch
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    jobs = []
+
+    def submit(fn, techs):
+        jobs.append(techs)
+        future = Future()
+        future.set_result(f"block for {len(techs)}")
+        return future
+
+    monkeypatch.setattr(prefetch, "submit", submit)
+    return jobs
+
+
+def test_known_subset_is_prefetched(submitted):
+    state = {"stack": None, "future": None}
+    assert prefetch.maybe_prefetch(state, ["Python", "Elixir", "pg"])
+    assert submitted == [(("python", ""), ("postgresql", ""))]
+    # An unknown stack is never served the partial block.
+    assert prefetch.take_prefetched(state, ["Python", "Elixir", "pg"]) is None
+
+
+def test_same_known_stack_is_not_restarted(submitted):
+    state = {"stack": None, "future": None}
+    prefetch.maybe_prefetch(state, ["Python"])
+    assert not prefetch.maybe_prefetch(state, ["Python", "Elixir"])
+    assert len(submitted) == 1
+
+
+def test_fully_known_stack_is_served(submitted):
+    state = {"stack": None, "future": None}
+    prefetch.maybe_prefetch(state, ["Python", "pg"])
+    assert prefetch.take_prefetched(state, ["Python", "pg"], wait=1) == "block for 2"
+    assert prefetch.take_prefetched(state, ["Java"], wait=1) is None
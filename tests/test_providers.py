@@ -0,0 +1,145 @@
+"""
+tests/test_providers.py
+───────────────────────
+Circuit breaker and failover of the provider registry.
+"""
+
+import threading
+
+import pytest
+
+from services.providers import (
+    _PROVIDER_TYPES, LLMProvider, ProviderError, ProviderHealth, ProviderRegistry, build_registry,
+)
+
+
+def _rate_limit() -> ProviderError:
+    return ProviderError("p", "rate_limit", "slow down", 429)
+
+
+def _open(health: ProviderHealth) -> None:
+    for _ in range(2):
+        health.record_failure(0.1, _rate_limit())
+
+
+def test_circuit_opens_after_threshold():
+    health = ProviderHealth(threshold=2, cooldown=60)
+    assert health.acquire()
+    _open(health)
+    assert not health.acquire()
+    assert health.snapshot()["state"] == "open"
+
+
+def test_half_open_lets_exactly_one_trial_through():
+    health = ProviderHealth(threshold=2, cooldown=0)
+    _open(health)
+    granted = []
+    threads = [threading.Thread(target=lambda: granted.append(health.acquire())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert granted.count(True) == 1
+
+
+def test_trial_success_closes_and_failure_reopens():
+    health = ProviderHealth(threshold=2, cooldown=0)
+    _open(health)
+    assert health.acquire()
+    health.record_success(0.1)
+    assert health.acquire() and health.acquire()
+
+    _open(health)
+    assert health.acquire()
+    assert health.record_failure(0.1, _rate_limit())  # reopened
+    assert health.acquire()  # cooldown 0: the next trial
+
+
+def test_released_trial_can_be_retaken():
+    health = ProviderHealth(threshold=2, cooldown=0)
+    _open(health)
+    assert health.acquire()
+    assert not health.acquire()
+    health.release()
+    assert health.acquire()
+
+
+class _Fake(LLMProvider):
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.models = {"conversation": name}
+        self.fail = fail
+        self.calls = 0
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        self.calls += 1
+        if self.fail:
+            raise ProviderError(self.name, "rate_limit", "busy", 429)
+        return self.name
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None):
+        yield self.complete(messages, max_tokens, tier=tier)
+
+
+def test_registry_fails_over_and_leaves_unused_breakers_alone():
+    primary, backup = _Fake("primary", fail=True), _Fake("backup")
+    registry = ProviderRegistry([primary, backup])
+    assert registry.complete([{"role": "user", "content": "hi"}], 10) == "backup"
+    assert primary.calls == 1 and backup.calls == 1
+
+    primary.fail = False
+    assert registry.complete([{"role": "user", "content": "hi"}], 10) == "primary"
+    assert backup.calls == 1
+
+
+def test_registry_raises_last_error_when_all_fail():
+    registry = ProviderRegistry([_Fake("a", fail=True), _Fake("b", fail=True)])
+    with pytest.raises(ProviderError):
+        registry.complete([{"role": "user", "content": "hi"}], 10)
+
+
+class _Broken(_Fake):
+    """A provider whose SDK raises something it does not map to ProviderError."""
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        self.calls += 1
+        raise RuntimeError("sdk exploded")
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None):
+        yield "partial "
+        raise RuntimeError("sdk exploded")
+
+
+def test_unmapped_errors_fail_over():
+    registry = ProviderRegistry([_Broken("broken"), _Fake("backup")])
+    assert registry.complete([{"role": "user", "content": "hi"}], 10) == "backup"
+
+
+def test_unmapped_error_after_first_fragment_is_a_provider_error():
+    registry = ProviderRegistry([_Broken("broken"), _Fake("backup")])
+    stream = registry.stream([{"role": "user", "content": "hi"}], 10)
+    assert next(stream) == "partial "
+    with pytest.raises(ProviderError) as info:
+        next(stream)
+    assert info.value.provider == "broken" and not info.value.retryable
+
+
+def test_providers_without_api_key_are_skipped(monkeypatch):
+    pytest.importorskip("groq")
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.setitem(_PROVIDER_TYPES, "backup", lambda: _Fake("backup"))
+    registry = build_registry(["groq", "backup"])
+    assert [p.name for p in registry.providers] == ["backup"]
+
+    with pytest.raises(ProviderError) as info:
+        build_registry(["groq"])
+    assert info.value.kind == "auth"
+
+
+def test_provider_missing_a_method_fails_at_creation():
+    class Partial(LLMProvider):
+        def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None):
+            return ""
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -0,0 +1,81 @@
+"""
+tests/test_question_bank.py
+───────────────────────────
+Sampling from and refilling the question bank, with a stubbed LLM.
+"""
+
+import pytest
+
+from services import question_bank
+from services.question_bank import QuestionBank, refill, render_question_block, sample_questions
+
+TIERS = ("beginner", "intermediate", "advanced")
+
+
+@pytest.fixture
+def bank(monkeypatch):
+    """An in-memory bank; refill jobs are queued, not run."""
+    store = QuestionBank(":memory:")
+    jobs = []
+    generated = []
+
+    def generate(tech, version, per_tier):
+        generated.append((tech, version, per_tier))
+        return {tier: [f"{tech} {tier} question {n}?" for n in range(per_tier)] for tier in TIERS}
+
+    monkeypatch.setattr(question_bank, "_bank", store)
+    monkeypatch.setattr(question_bank, "_refilling", set())
+    monkeypatch.setattr(question_bank, "generate_question_set", generate)
+    monkeypatch.setattr(question_bank, "submit", lambda fn, *args: jobs.append((fn, args)))
+    return store, jobs, generated
+
+
+def _stock(store: QuestionBank, tech: str, per_tier: int, version: str = "") -> None:
+    for tier in TIERS:
+        store.add(tech, version, tier, [f"{tier} {n}?" for n in range(per_tier)], "seed")
+
+
+def test_sample_takes_one_question_per_tier_easiest_first(bank):
+    store, _, _ = bank
+    _stock(store, "python", 2)
+    picked = sample_questions("python")
+    assert [q.split()[0] for q in picked] == list(TIERS)
+    assert len(set(picked)) == 3
+
+
+def test_sample_needs_every_tier(bank):
+    store, _, _ = bank
+    store.add("python", "", "beginner", ["What is a list?"], "seed")
+    assert sample_questions("python") is None
+
+
+def test_version_questions_are_topped_up_with_generic_ones(bank):
+    store, _, _ = bank
+    store.add("python", "3.12", "beginner", ["What is new in 3.12?"], "seed")
+    _stock(store, "python", 1)
+    picked = sample_questions("python", "3.12", k=5)
+    assert sorted(picked) == sorted(["What is new in 3.12?", "beginner 0?", "intermediate 0?", "advanced 0?"])
+
+
+def test_refill_runs_once_per_tech_and_stores_the_set(bank):
+    store, jobs, generated = bank
+    assert refill("python")
+    assert not refill("python")  # already queued
+    assert len(jobs) == 1
+
+    fn, args = jobs[0]
+    fn(*args)
+    assert generated == [("Python", "", question_bank.BANK_REFILL_PER_TIER)]
+    assert all(len(store.questions("python", "", tier)) == question_bank.BANK_REFILL_PER_TIER for tier in TIERS)
+    # Stocked now: no further refill.
+    assert not refill("python")
+    assert len(jobs) == 1
+
+
+def test_unknown_stack_is_not_served(bank):
+    store, jobs, _ = bank
+    _stock(store, "python", question_bank.BANK_MIN_PER_TIER)
+    assert render_question_block(["Python", "Brainfuck++"]) is None
+    block = render_question_block(["Python"])
+    assert block.startswith("**Python**\n1. ")
+    assert jobs == []
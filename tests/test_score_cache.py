@@ -0,0 +1,72 @@
+"""
+tests/test_score_cache.py
+─────────────────────────
+Score cache keys and which model a cached score is stored under.
+"""
+
+import json
+
+import pytest
+
+from services import llm_service, model_router
+from services.providers import LLMProvider, ProviderError, ProviderRegistry
+from services.score_cache import ScoreCache, make_key
+
+
+def test_key_ignores_case_punctuation_and_spacing():
+    assert make_key("What is GIL?", "I don't  know.", "m", "v1") == make_key("what is gil", "I dont know", "m", "v1")
+
+
+@pytest.mark.parametrize("changed", [
+    ("Other question?", "I don't know.", "m", "v1"),
+    ("What is GIL?", "Something else", "m", "v1"),
+    ("What is GIL?", "I don't know.", "other-model", "v1"),
+    ("What is GIL?", "I don't know.", "m", "v2"),
+])
+def test_key_changes_with_every_part(changed):
+    assert make_key("What is GIL?", "I don't know.", "m", "v1") != make_key(*changed)
+
+
+def test_cache_round_trip():
+    cache = ScoreCache(":memory:")
+    cache.put("k", {"score": 70})
+    assert cache.get("k") == {"score": 70}
+    assert cache.get("missing") is None
+
+
+class _Scorer(LLMProvider):
+    def __init__(self, name: str, fail: bool = False):
+        self.name = name
+        self.models = {"conversation": f"{name}-big", "scoring": f"{name}-small"}
+        self.fail = fail
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        if self.fail:
+            raise ProviderError(self.name, "status", "bad request", 400)
+        return json.dumps({"score": 60, "feedback": "ok"})
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None):
+        yield self.complete(messages, max_tokens, tier=tier)
+
+
+def test_failover_scores_are_stored_under_the_model_that_answered(monkeypatch):
+    registry = ProviderRegistry([_Scorer("primary", fail=True), _Scorer("backup")])
+    cache = ScoreCache(":memory:")
+    monkeypatch.setattr(llm_service, "get_registry", lambda: registry)
+    monkeypatch.setattr(model_router, "get_registry", lambda: registry)
+    monkeypatch.setattr(llm_service, "get_cache", lambda: cache)
+
+    assert llm_service.score_answer("What is GIL?", "A lock.")["score"] == 60
+    version = llm_service._SCORE_PROMPT_VERSION
+    assert cache.get(make_key("What is GIL?", "A lock.", "primary-small", version)) is None
+    assert cache.get(make_key("What is GIL?", "A lock.", "backup-small", version)) == {"score": 60, "feedback": "ok"}
+
+
+def test_stats_count_evictions():
+    cache = ScoreCache(":memory:", memory_entries=1)
+    cache.put("a", {"score": 1})
+    cache.put("b", {"score": 2})
+    assert cache.get("a") == {"score": 1}  # from disk, evicting "b" from memory
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 2
+    assert stats["disk_hits"] == 1 and stats["memory_size"] == 1
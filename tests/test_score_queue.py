@@ -0,0 +1,36 @@
+"""
+tests/test_score_queue.py
+─────────────────────────
+Mapping batch scores back to candidate messages.
+"""
+
+from services import score_queue
+
+
+def _batch(monkeypatch, results):
+    asked = []
+    monkeypatch.setattr(score_queue, "score_section", lambda questions, answers: results)
+    monkeypatch.setattr(score_queue, "score_answer", lambda q, a: asked.append((q, a)) or {"score": 40})
+    job = {"kind": "batch", "questions": ["Q1", "Q2", "Q3"], "answers": [(3, "A"), (5, "B"), (7, "C")]}
+    return score_queue._run_job(job, 0), asked
+
+
+def test_message_badge_is_mean_of_its_questions(monkeypatch):
+    scores, asked = _batch(monkeypatch, [
+        {"question": 1, "message": 1, "score": 80},
+        {"question": 2, "message": 1, "score": 60},
+        {"question": 3, "message": 2, "score": 90},
+        {"question": 4, "message": 3, "score": 50},
+    ])
+    assert scores == {3: 70, 5: 90, 7: 50}
+    assert asked == []
+
+
+def test_unmapped_answers_are_scored_one_by_one(monkeypatch):
+    scores, asked = _batch(monkeypatch, [
+        {"question": 1, "message": 1, "score": 80},
+        {"question": 2, "message": None, "score": 0},
+        {"question": 3, "message": "bogus", "score": 10},
+    ])
+    assert scores == {3: 80, 5: 40, 7: 40}
+    assert asked == [("Q2", "B"), ("Q3", "C")]
@@ -0,0 +1,73 @@
+"""
+tests/test_server.py
+────────────────────
+Smoke test of the HTTP/WebSocket API against the scripted mock LLM.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from api import server  # noqa: E402
+from api.server import ScreeningServer  # noqa: E402
+from tools.mock_llm import ASK_INFO, WELCOME  # noqa: E402
+
+
+@pytest.fixture
+def app(mock_llm, monkeypatch):
+    monkeypatch.setattr(server, "_warm", lambda: None)
+    monkeypatch.setattr(server, "enabled", lambda: False)
+    return ScreeningServer(workers=4).app()
+
+
+def _run(app, scenario) -> None:
+    async def main():
+        async with TestClient(TestServer(app)) as client:
+            await scenario(client)
+
+    asyncio.run(main())
+
+
+def test_http_session_lifecycle(app):
+    async def scenario(client):
+        created = await client.post("/sessions")
+        assert created.status == 201
+        body = await created.json()
+        assert body["reply"].strip() == WELCOME
+        token = body["state"]["token"]
+
+        answered = await client.post(f"/sessions/{token}/messages", json={"content": "Ada Lovelace"})
+        body = await answered.json()
+        assert body["reply"].strip() == ASK_INFO
+        assert body["state"]["stage"] == "collecting_info"
+        assert body["state"]["candidate_data"]["full_name"] == "Ada Lovelace"
+
+        state = await (await client.get(f"/sessions/{token}")).json()
+        assert len(state["state"]["messages"]) == 4
+
+        bad = await client.post(f"/sessions/{token}/messages", json={"content": "  "})
+        assert bad.status == 400
+        assert (await client.delete(f"/sessions/{token}")).status == 204
+        assert (await client.get(f"/sessions/{token}")).status == 404
+
+    _run(app, scenario)
+
+
+def test_websocket_streams_deltas_then_state(app):
+    async def scenario(client):
+        token = (await (await client.post("/sessions")).json())["state"]["token"]
+        async with client.ws_connect(f"/sessions/{token}/ws") as ws:
+            await ws.send_json({"content": "Ada Lovelace"})
+            deltas = []
+            while (msg := await ws.receive_json(timeout=5))["type"] == "delta":
+                deltas.append(msg["text"])
+            assert len(deltas) > 1 and "".join(deltas).strip() == ASK_INFO
+            assert msg["type"] == "turn" and msg["state"]["stage"] == "collecting_info"
+
+            await ws.send_json({"nope": 1})
+            assert (await ws.receive_json(timeout=5))["type"] == "error"
+
+    _run(app, scenario)
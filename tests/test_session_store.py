@@ -0,0 +1,46 @@
+"""
+tests/test_session_store.py
+───────────────────────────
+Write-behind SQLite session store.
+"""
+
+import threading
+
+import pytest
+
+from services.session_store import SessionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.sqlite3"), flush_seconds=0.01)
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    messages = [{"role": "assistant", "content": "Hi", "time": "10:00"}, {"role": "user", "content": "Ada"}]
+    store.save_session("t1", "sid", "greeting", False, {"name": "Ada"})
+    store.save_messages("t1", messages)
+    store.save_score("t1", 1, 75)
+
+    loaded = store.load("t1")
+    assert loaded["candidate_data"] == {"name": "Ada"}
+    assert [m["content"] for m in loaded["messages"]] == ["Hi", "Ada"]
+    assert loaded["scores"] == {1: 75}
+    assert store.load("unknown") is None
+
+
+def test_load_waits_only_for_its_own_session(store):
+    gate = threading.Event()
+    commit = store._commit
+    store._commit = lambda ops: (gate.wait(), commit(ops))
+
+    store.save_session("busy", "sid", "greeting", False, {})
+    loader = threading.Thread(target=store.load, args=("idle",))
+    loader.start()
+    loader.join(2)
+    assert not loader.is_alive()  # not blocked behind the other session's write
+
+    gate.set()
+    assert store.load("busy")["stage"] == "greeting"
@@ -0,0 +1,144 @@
+"""
+tests/test_shared_store.py
+──────────────────────────
+Serialisation, optimistic writes and conflict merging of the shared session
+store, against the in-process backend and a fakeredis server.
+"""
+
+import pytest
+
+from services.shared_store import (
+    MemoryBackend,
+    RedisBackend,
+    SharedSessionStore,
+    VersionConflict,
+    decode_state,
+    encode_state,
+    merge_states,
+)
+
+
+def _msg(role: str, content: str, time: str = "10:00") -> dict:
+    return {"role": role, "content": content, "time": time}
+
+
+def _state(messages: list[dict], **overrides) -> dict:
+    state = {
+        "session_id":     "s1",
+        "stage":          "greeting",
+        "ended":          False,
+        "candidate_data": {},
+        "messages":       messages,
+        "scores":         {},
+    }
+    state.update(overrides)
+    return state
+
+
+_BASE = [_msg("user", "Hello"), _msg("assistant", "Welcome! What's your name?")]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryBackend(ttl_seconds=60)
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(ttl_seconds=60, client=fakeredis.FakeRedis())
+
+
+# ── Serialisation ──────────────────────────────────────────────────────────────
+
+def test_round_trip_small_state_is_uncompressed():
+    state = _state(_BASE, candidate_data={"full_name": "Jane Doe"}, scores={1: 80})
+    data = encode_state(state)
+    assert data[:1] == b"j"
+    assert decode_state(data) == state
+
+
+def test_round_trip_large_state_is_compressed():
+    messages = [_msg("user" if i % 2 else "assistant", f"message {i} " * 20) for i in range(40)]
+    state = _state(messages, stage="technical_questions", ended=True, scores={3: 55, 5: 90})
+    data = encode_state(state)
+    assert data[:1] == b"z"
+    assert decode_state(data) == state
+
+
+def test_round_trip_keeps_unicode():
+    state = _state([_msg("user", "Zürich — 5 yrs ✓")], candidate_data={"location": "Zürich"})
+    assert decode_state(encode_state(state)) == state
+
+
+# ── Optimistic writes ──────────────────────────────────────────────────────────
+
+def test_compare_and_set_versions(backend):
+    assert backend.get("k") is None
+    assert backend.compare_and_set("k", 0, b"one") == 1
+    assert backend.compare_and_set("k", 1, b"two") == 2
+    assert backend.get("k") == (2, b"two")
+
+
+def test_compare_and_set_rejects_stale_version(backend):
+    backend.compare_and_set("k", 0, b"one")
+    with pytest.raises(VersionConflict):
+        backend.compare_and_set("k", 0, b"stale")
+    assert backend.get("k") == (1, b"one")
+
+
+def test_store_save_and_load(backend):
+    store = SharedSessionStore(backend)
+    version, stored = store.save("tok", _state(_BASE), 0)
+    assert version == 1
+    assert store.load("tok") == (1, stored)
+    assert store.load("unknown") is None
+
+
+def test_store_merges_concurrent_writers(backend):
+    store = SharedSessionStore(backend)
+    version, _ = store.save("tok", _state(_BASE), 0)
+
+    # Two replicas read version 1 and each append a different turn.
+    first = _state(_BASE + [_msg("user", "I'm Jane"), _msg("assistant", "Thanks Jane!")], stage="collecting_info")
+    second = _state(_BASE + [_msg("user", "Jane here"), _msg("assistant", "Hi Jane!")],
+                    candidate_data={"full_name": "Jane"}, scores={3: 70})
+    store.save("tok", first, version)
+    version, merged = store.save("tok", second, version)
+
+    assert version == 3
+    assert store.stats()["conflicts"] == 1
+    assert [m["content"] for m in merged["messages"]] == [
+        "Hello", "Welcome! What's your name?", "I'm Jane", "Thanks Jane!", "Jane here", "Hi Jane!",
+    ]
+    assert merged["stage"] == "collecting_info"
+    assert merged["candidate_data"] == {"full_name": "Jane"}
+    assert merged["scores"] == {5: 70}
+    assert store.load("tok") == (3, merged)
+
+
+# ── Merging ────────────────────────────────────────────────────────────────────
+
+def test_merge_keeps_longer_log_when_one_extends_the_other():
+    longer = _BASE + [_msg("user", "I'm Jane")]
+    assert merge_states(_state(_BASE), _state(longer))["messages"] == longer
+    assert merge_states(_state(longer), _state(_BASE))["messages"] == longer
+
+
+def test_merge_keeps_both_tails_of_equal_length():
+    local = _state(_BASE + [_msg("user", "local")], scores={2: 40})
+    stored = _state(_BASE + [_msg("user", "stored")], scores={2: 90})
+    merged = merge_states(local, stored)
+    assert [m["content"] for m in merged["messages"]][2:] == ["stored", "local"]
+    assert merged["scores"] == {2: 90, 3: 40}
+
+
+def test_merge_unions_fields_with_local_precedence():
+    local = _state(_BASE, candidate_data={"email": "new@example.com"}, scores={1: 50})
+    stored = _state(_BASE, candidate_data={"email": "old@example.com", "phone": "555"}, scores={1: 10, 0: 20})
+    merged = merge_states(local, stored)
+    assert merged["candidate_data"] == {"email": "new@example.com", "phone": "555"}
+    assert merged["scores"] == {0: 20, 1: 50}
+
+
+def test_merge_never_moves_stage_backwards():
+    merged = merge_states(_state(_BASE, stage="tech_stack"), _state(_BASE, stage="technical_questions", ended=True))
+    assert merged["stage"] == "technical_questions"
+    assert merged["ended"] is True
@@ -0,0 +1,68 @@
+"""
+tests/test_single_flight.py
+───────────────────────────
+Merging of identical in-flight calls and streams.
+"""
+
+import threading
+import time
+
+from services.single_flight import SingleFlight, request_key
+
+
+def test_request_key_is_stable():
+    assert request_key("reply", [{"a": 1, "b": 2}]) == request_key("reply", [{"b": 2, "a": 1}])
+    assert request_key("reply", "x") != request_key("score", "x")
+
+
+def test_concurrent_calls_share_one_execution():
+    flights, release, calls = SingleFlight(), threading.Event(), []
+
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("k", fn))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while flights.merged < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["result"] * 4 and len(calls) == 1
+
+
+def _upstream(state: dict, gate: threading.Event, delay: float = 0.0):
+    try:
+        for n in range(100):
+            gate.wait(2)
+            time.sleep(delay)
+            yield f"{n} "
+            state["sent"] = n + 1
+    finally:
+        state["closed"] = True
+
+
+def test_consumers_share_one_stream():
+    flights, gate, state = SingleFlight(), threading.Event(), {}
+    first = flights.stream("k", lambda: _upstream(state, gate))
+    second = flights.stream("k", lambda: _upstream({}, gate))
+    gate.set()
+    assert "".join(first) == "".join(second)
+    assert state["sent"] == 100
+
+
+def test_last_consumer_leaving_closes_the_upstream():
+    flights, gate, state = SingleFlight(), threading.Event(), {}
+    gate.set()
+    stream = flights.stream("k", lambda: _upstream(state, gate, delay=0.01))
+    assert next(stream) == "0 "
+    stream.close()
+
+    deadline = time.monotonic() + 2
+    while not state.get("closed") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert state.get("closed") and state["sent"] < 100
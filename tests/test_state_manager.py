@@ -0,0 +1,77 @@
+"""
+tests/test_state_manager.py
+───────────────────────────
+Stage advancement: structured-turn stages and signal inference.
+"""
+
+import pytest
+
+from services.state_manager import StageTracker, advance_stage, awaiting_stack_confirmation, infer_stage
+
+
+@pytest.mark.parametrize("current, proposed, expected", [
+    ("greeting", "collecting_info", "collecting_info"),
+    ("tech_stack", "technical_questions", "technical_questions"),
+    ("technical_questions", "tech_stack", "technical_questions"),  # never backwards
+    ("tech_stack", None, "tech_stack"),
+    ("tech_stack", "lunch", "tech_stack"),
+    ("technical_questions", "ended", "ended"),
+])
+def test_advance_stage(current, proposed, expected):
+    assert advance_stage(current, proposed) == expected
+
+
+def _bot(text: str) -> dict:
+    return {"role": "assistant", "content": text}
+
+
+def _user(text: str) -> dict:
+    return {"role": "user", "content": text}
+
+
+SCREENING = [
+    _bot("Welcome! May I have your full name?"),
+    _user("Ada Lovelace"),
+    _bot("Thanks! What is your email and phone number?"),
+    _user("ada@example.com, 555 0100"),
+    _bot("Great. What is your tech stack — languages, frameworks and databases?"),
+    _user("Python, Django"),
+    _bot("Just to confirm: Python and Django. Is that correct?"),
+    _user("Yes"),
+    _bot("**Django**\n1. How do migrations work?"),
+    _user("They version the schema."),
+    _bot("Thank you for your time today! A recruiter will reach out within 2-3 business days."),
+]
+
+
+@pytest.mark.parametrize("upto, expected", [
+    (1, "greeting"),
+    (3, "collecting_info"),
+    (5, "tech_stack"),
+    (7, "tech_stack"),
+    (9, "technical_questions"),
+    (11, "ended"),
+])
+def test_tracker_follows_the_screening(upto, expected):
+    tracker, stage = StageTracker(), "greeting"
+    for end in range(1, upto + 1):
+        stage = tracker.update(SCREENING[:end], stage)
+    assert stage == expected
+    assert infer_stage(SCREENING[:upto], "greeting") == expected
+
+
+def test_tracker_concludes_only_on_the_latest_reply():
+    tracker = StageTracker()
+    tracker.observe(SCREENING)
+    assert tracker.concluded
+    tracker.observe(SCREENING + [_user("One more thing"), _bot("Sure, go ahead.")])
+    assert not tracker.concluded
+
+
+def test_ended_is_terminal():
+    assert infer_stage(SCREENING[:3], "ended") == "ended"
+
+
+def test_awaiting_stack_confirmation():
+    assert awaiting_stack_confirmation(SCREENING[:7])
+    assert not awaiting_stack_confirmation(SCREENING[:5])
@@ -0,0 +1,56 @@
+"""
+tests/test_taxonomy.py
+──────────────────────
+Technology matching and stack normalisation.
+"""
+
+import pytest
+
+from utils.taxonomy import canonical_tech, find_techs, has_tech, normalize_stack
+
+
+def test_aliases_versions_and_order():
+    assert find_techs("Mostly Python 3.11 + Postgres, some golang") == [
+        ("python", "3.11"), ("postgresql", ""), ("go", ""),
+    ]
+
+
+def test_word_boundaries():
+    assert find_techs("a good javascript dev") == [("javascript", "")]
+
+
+def test_years_are_not_versions():
+    assert find_techs("Java 5 years") == [("java", "")]
+
+
+@pytest.mark.parametrize("text", ["How would you react to that?", "let's go", "in the spring"])
+def test_everyday_words_need_their_capitalisation(text):
+    assert not has_tech(text)
+
+
+def test_capitalised_everyday_words_match():
+    assert find_techs("I use React and Go daily") == [("react", ""), ("go", "")]
+
+
+@pytest.mark.parametrize("text", ["I open the py files", "each node in the tree", "see pg 12 of the manual"])
+def test_abbreviations_in_prose_do_not_match(text):
+    assert not has_tech(text)
+
+
+def test_abbreviations_match_in_a_stack_list():
+    assert find_techs("Python, pg and js") == [("python", ""), ("postgresql", ""), ("javascript", "")]
+    assert find_techs("Node / Express") == [("node", ""), ("express", "")]
+
+
+@pytest.mark.parametrize("text, tech", [("py", "python"), ("node", "node"), ("go", "go"), ("react", "react")])
+def test_whole_text_matches_any_alias(text, tech):
+    assert canonical_tech(text) == (tech, "")
+
+
+def test_multi_word_names_win_over_their_prefix():
+    assert find_techs("Spring 5 and Spring Boot 3") == [("spring", "5"), ("springboot", "3")]
+    assert normalize_stack(["Spring Boot 3"]) == ["Spring Boot 3"]
+
+
+def test_normalize_stack_keeps_unknown_items_and_drops_duplicates():
+    assert normalize_stack(["python3.11", "pg", "Postgres", "Elixir"]) == ["Python 3.11", "PostgreSQL", "Elixir"]
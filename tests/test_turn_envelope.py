@@ -0,0 +1,59 @@
+"""
+tests/test_turn_envelope.py
+───────────────────────────
+Parsing of structured-turn completions.
+"""
+
+import json
+
+import pytest
+
+from utils.turn_envelope import parse_turn_envelope
+
+
+def _envelope(**fields) -> str:
+    return json.dumps({"reply": "Thanks!", **fields})
+
+
+def test_well_formed_envelope():
+    parsed = parse_turn_envelope(_envelope(
+        score=72, feedback=" Solid. ", next_stage="technical_questions",
+        candidate_data={"email": " ada@example.com ", "tech_stack": ["python3.11", "pg"]},
+    ))
+    assert parsed == {
+        "reply": "Thanks!", "score": 72, "feedback": "Solid.", "next_stage": "technical_questions",
+        "candidate_data": {"email": "ada@example.com", "tech_stack": ["Python 3.11", "PostgreSQL"]},
+    }
+
+
+def test_code_fences_and_surrounding_prose():
+    raw = "Sure, here it is:\n```json\n" + _envelope(score="88") + "\n```\nHope that helps."
+    parsed = parse_turn_envelope(raw)
+    assert parsed["reply"] == "Thanks!" and parsed["score"] == 88
+
+
+@pytest.mark.parametrize("raw", [None, "", "no json here", '{"score": 50}', '{"reply": "   "}', "[1, 2]"])
+def test_unusable_completions(raw):
+    assert parse_turn_envelope(raw) is None
+
+
+@pytest.mark.parametrize("score, expected", [(150, 100), (-3, 0), ("71.6", 72), (True, None), ("n/a", None)])
+def test_scores_are_clamped_or_dropped(score, expected):
+    assert parse_turn_envelope(_envelope(score=score))["score"] == expected
+
+
+def test_feedback_needs_a_score():
+    assert parse_turn_envelope(_envelope(feedback="Good."))["feedback"] is None
+
+
+def test_unknown_stage_and_fields_are_dropped():
+    parsed = parse_turn_envelope(_envelope(
+        next_stage="Lunch", candidate_data={"favourite_colour": "blue", "phone": "", "years_experience": 4},
+    ))
+    assert parsed["next_stage"] is None
+    assert parsed["candidate_data"] == {"years_experience": "4 years"}
+
+
+def test_tech_stack_string_is_split():
+    parsed = parse_turn_envelope(_envelope(candidate_data={"tech_stack": "Django, React and Docker"}))
+    assert parsed["candidate_data"]["tech_stack"] == ["Django", "React", "Docker"]
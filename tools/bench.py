@@ -0,0 +1,300 @@
+"""
+tools/bench.py
+──────────────
+Micro-benchmarks for the code that runs on every turn or rerun, over
+generated transcripts of 10, 100 and 1,000 turns:
+
+    python -m tools.bench                  # measure and compare with the baseline
+    python -m tools.bench --save           # measure and store as the new baseline
+    python -m tools.bench -k stage -s 1000 # only benchmarks matching "stage", 1,000 turns
+
+Benchmarks:
+
+  extract_fields        profile extraction over the whole transcript (resume, bulk backfill)
+  update_candidate_data incremental extraction of the newest turn (every turn)
+  infer_stage           stateless stage inference over the whole transcript
+  StageTracker.update   incremental stage inference of the newest turn (every turn)
+  detect_exit           exit-intent check of the newest message (every turn)
+  render_history        redraw of the visible chat window (every rerun)
+  message_html          uncached HTML of the visible chat window (cold start, resume)
+  render_sidebar        sidebar redraw (every rerun)
+  SYSTEM_PROMPT.format  stage-aware system prompt (every LLM reply)
+  build_messages        system prompt plus the token-budgeted history (every LLM reply)
+
+Each result is the best per-call time over several timing runs, plus the
+peak memory allocated during one call (tracemalloc). Streamlit calls run in
+bare mode, so they measure our rendering code and Streamlit's element
+construction but not the browser.
+
+Results are compared with a baseline (default data/bench_baseline.json;
+timings are machine-specific, so keep one baseline per machine or CI
+runner). The exit status is 1 when any benchmark is slower than
+baseline × (1 + --time-threshold) or allocates more than
+baseline × (1 + --alloc-threshold); differences below 1 µs or 1 KiB are
+treated as noise, and a benchmark that looks slower is re-measured before
+it counts as a regression.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable
+
+import streamlit as st
+
+from config.prompt import SYSTEM_PROMPT
+from config.settings import CHAT_WINDOW_MESSAGES, GREETING_TRIGGER
+from services.engine import ScreeningSession
+from services.llm_service import _build_messages
+from services.state_manager import StageTracker, infer_stage
+from ui.chat_ui import message_html, render_history
+from ui.sidebar import render_sidebar
+from utils.extraction import extract_fields, update_candidate_data
+from utils.validators import detect_exit
+
+_DEFAULT_BASELINE = os.path.join("data", "bench_baseline.json")
+_SIZES = (10, 100, 1000)
+_REPEATS = 5
+_CONFIRM_RUNS = 2
+# Differences below these are noise, whatever the relative change.
+_MIN_TIME_DELTA_US = 1.0
+_MIN_ALLOC_DELTA_KIB = 1.0
+
+
+# ── Transcripts ────────────────────────────────────────────────────────────────
+
+_OPENING = (
+    ("Welcome to TalentScout! 👋 I'm your AI hiring assistant. May I have your full name?",
+     "Hi, I'm Priya Raman."),
+    ("Thanks, Priya! Could you share your email, phone number, location, years of experience "
+     "and the desired position you're applying for?",
+     "Sure — priya.raman@example.com, +91 98450 12345. I'm based in Bengaluru, I have 5 years "
+     "of experience and I'm applying for Backend Engineer."),
+    ("Great. What is your tech stack — programming languages, frameworks, databases and tools?",
+     "Mostly Python, Django, PostgreSQL and Redis, with Docker for deployment."),
+    ("Just to confirm: Python, Django, PostgreSQL, Redis and Docker. Is that correct?",
+     "Yes, that's correct."),
+)
+_QUESTION_BLOCK = (
+    "Here are a few technical questions based on your stack:\n\n"
+    "**Python**\n"
+    "1. How does the GIL affect CPU-bound and I/O-bound workloads?\n"
+    "2. In a production app, how would you track down a memory leak?\n\n"
+    "**Django**\n"
+    "3. How would you avoid N+1 queries in a list view?"
+)
+_FOLLOW_UP = "Thanks — that's a solid answer. Let's move on to the next question when you're ready."
+_ANSWER = (
+    "I would start by measuring: profile the endpoint under realistic load, look at the slowest "
+    "queries and the allocation hot spots, then fix the biggest one first and measure again. "
+    "For turn {n} specifically I'd also add a regression test so it stays fixed."
+)
+
+
+def transcript(turns: int) -> tuple[list[dict], dict[int, int]]:
+    """
+    A screening of `turns` candidate/assistant exchanges, plus answer scores.
+
+    The first turns collect the profile and confirm the stack; the rest
+    alternate technical answers with follow-ups, with a fresh question block
+    every three answers.
+    """
+    messages = [{"role": "user", "content": GREETING_TRIGGER}]
+    scores: dict[int, int] = {}
+    for n in range(turns):
+        if n < len(_OPENING):
+            bot, user = _OPENING[n]
+        else:
+            bot = _QUESTION_BLOCK if (n - len(_OPENING)) % 3 == 0 else _FOLLOW_UP
+            user = _ANSWER.format(n=n)
+        messages.append({"role": "assistant", "content": bot, "time": f"{10 + n // 60 % 10}:{n % 60:02d}"})
+        messages.append({"role": "user", "content": user, "time": f"{10 + n // 60 % 10}:{n % 60:02d}"})
+        if n >= len(_OPENING):
+            scores[len(messages) - 1] = 40 + n * 7 % 60
+    return messages, scores
+
+
+# ── Benchmarks ─────────────────────────────────────────────────────────────────
+
+def _session(messages: list[dict], scores: dict[int, int]) -> ScreeningSession:
+    session = ScreeningSession("bench")
+    session.messages = messages
+    session.scores = scores
+    session.candidate_data = extract_fields(messages)
+    session.stage = infer_stage(messages, "greeting")
+    return session
+
+
+def _benchmarks(messages: list[dict], scores: dict[int, int]) -> dict[str, Callable[[], object]]:
+    """Zero-argument callables, one per benchmark, over one transcript."""
+    session = _session(messages, scores)
+    data = session.candidate_data
+    newest = len(messages) - 2  # the newest exchange: assistant reply + candidate message
+    partial = {k: v for k, v in data.items() if k != "tech_stack"}
+    tracker = StageTracker()
+    tracker.observe(messages[:newest])
+    last_user = messages[-1]["content"]
+    window = messages[max(1, len(messages) - CHAT_WINDOW_MESSAGES):]
+    context = {"summary": "", "upto": 0}
+    st.session_state["screening"] = session
+
+    def update_tracker():
+        tracker.cursor = newest
+        return tracker.update(messages, session.stage)
+
+    return {
+        "extract_fields":        lambda: extract_fields(messages),
+        "update_candidate_data": lambda: update_candidate_data(dict(partial), messages, newest),
+        "infer_stage":           lambda: infer_stage(messages, "greeting"),
+        "StageTracker.update":   update_tracker,
+        "detect_exit":           lambda: detect_exit(last_user),
+        "render_history":        lambda: render_history(messages, scores, CHAT_WINDOW_MESSAGES),
+        "message_html":          lambda: [
+            message_html.__wrapped__(i, m["role"], m["content"], m.get("time", ""), None)
+            for i, m in enumerate(window)
+        ],
+        "render_sidebar":        render_sidebar,
+        "SYSTEM_PROMPT.format":  lambda: SYSTEM_PROMPT.format(
+            stage=session.stage, candidate_data=json.dumps(data, indent=2),
+        ),
+        "build_messages":        lambda: _build_messages(messages, session.stage, data, context),
+    }
+
+
+def _measure(fn: Callable[[], object]) -> dict[str, float]:
+    """Best time per call (µs) over _REPEATS runs and the peak KiB allocated by one call."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=_REPEATS, number=number)) / number
+
+    fn()  # warm caches so the allocation pass sees the steady state
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"us": best * 1e6, "peak_kib": (peak - before) / 1024}
+
+
+def run(sizes: list[int], pattern: str = "", only: set[str] | None = None) -> dict[str, dict[str, float]]:
+    """Measure every benchmark matching `pattern` (or named "name@size" in `only`) at every size."""
+    results = {}
+    for turns in sizes:
+        messages, scores = transcript(turns)
+        for name, fn in _benchmarks(messages, scores).items():
+            key = f"{name}@{turns}"
+            if pattern.lower() in name.lower() and (only is None or key in only):
+                results[key] = _measure(fn)
+    return results
+
+
+# ── Baseline ───────────────────────────────────────────────────────────────────
+
+def _regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    time_threshold: float,
+    alloc_threshold: float,
+) -> dict[str, str]:
+    """Benchmarks that regressed past a threshold, with the reason."""
+    failed = {}
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        us, kib = result["us"], result["peak_kib"]
+        if us > base["us"] * (1 + time_threshold) and us - base["us"] > _MIN_TIME_DELTA_US:
+            failed[key] = f"time {base['us']:.1f}µs → {us:.1f}µs"
+        elif kib > base["peak_kib"] * (1 + alloc_threshold) and kib - base["peak_kib"] > _MIN_ALLOC_DELTA_KIB:
+            failed[key] = f"allocations {base['peak_kib']:.1f}KiB → {kib:.1f}KiB"
+    return failed
+
+
+def _change(value: float, base: float | None) -> str:
+    if not base:
+        return ""
+    return f"{(value - base) / base * 100:+.0f}%"
+
+
+def render(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], failed: dict[str, str]) -> str:
+    rows = [f"{'benchmark':<32}{'µs/call':>12}{'Δ':>7}{'peak KiB':>12}{'Δ':>7}"]
+    for key, result in results.items():
+        base = baseline.get(key, {})
+        rows.append(
+            f"{key:<32}{result['us']:>12.1f}{_change(result['us'], base.get('us')):>7}"
+            f"{result['peak_kib']:>12.1f}{_change(result['peak_kib'], base.get('peak_kib')):>7}"
+            + ("  REGRESSED" if key in failed else "")
+        )
+    return "\n".join(rows)
+
+
+def _load_baseline(path: str) -> dict[str, dict[str, float]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+
+def _save_baseline(path: str, results: dict[str, dict[str, float]]) -> None:
+    """Merge `results` into the baseline at `path` (other entries are kept)."""
+    merged = {**_load_baseline(path), **results}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"python": sys.version.split()[0], "results": merged}, f, indent=2, sort_keys=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.bench",
+        description="Benchmark the per-turn hot paths against a stored baseline.",
+    )
+    parser.add_argument("-s", "--sizes", type=int, nargs="+", default=list(_SIZES),
+                        help="transcript lengths in turns (default: 10 100 1000)")
+    parser.add_argument("-k", "--filter", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=_DEFAULT_BASELINE, help=f"baseline file (default: {_DEFAULT_BASELINE})")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.5,
+                        help="allowed relative slowdown before failing (default: 0.5 = +50%%)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.2,
+                        help="allowed relative growth of peak allocations (default: 0.2 = +20%%)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    # Streamlit warns on every call made outside a running app; logging would dominate the timings.
+    logging.disable(logging.WARNING)
+    results = run(args.sizes, args.filter)
+    baseline = _load_baseline(args.baseline)
+    failed = {} if args.save else _regressions(results, baseline, args.time_threshold, args.alloc_threshold)
+    # A slow run is re-measured before it fails the gate; the best time counts.
+    for _ in range(_CONFIRM_RUNS):
+        if not failed:
+            break
+        for key, result in run(args.sizes, args.filter, set(failed)).items():
+            results[key]["us"] = min(results[key]["us"], result["us"])
+        failed = _regressions(results, baseline, args.time_threshold, args.alloc_threshold)
+    logging.disable(logging.NOTSET)
+
+    print(render(results, baseline, failed))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save:
+        _save_baseline(args.baseline, results)
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+    elif not baseline:
+        print(f"no baseline at {args.baseline}; run with --save to create one", file=sys.stderr)
+    for key, reason in failed.items():
+        print(f"REGRESSED: {key}: {reason}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+tools/bulk_extract.py
+─────────────────────
+Backfill candidate_data from archived transcripts and plain-text resumes.
+
+Runs the same extraction as the chat app (utils/extraction.py) outside
+Streamlit, spread over a process pool:
+
+    python -m tools.bulk_extract archive/ resumes/ -o candidates.jsonl
+
+Inputs are files or directories (searched recursively):
+
+  *.jsonl  one transcript per line — {"id": ..., "messages": [...]}, a bare
+           list of {"role", "content"} messages, or {"id": ..., "text": ...}
+  *.txt    one resume per file; each non-empty line is scanned as a message
+
+Records are read lazily and sent to workers in chunks of --chunk-size, with
+at most two chunks per worker in flight, so memory stays bounded however
+large the archive is. Each output line is
+{"source": <file>, "id": <record id>, "candidate_data": {...}}; results are
+written as chunks finish, so output order is not input order. Throughput and
+per-field hit rates are reported on stderr.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from utils.extraction import PROFILE_FIELDS, extract_fields, text_to_messages
+
+_SUFFIXES = (".jsonl", ".txt")
+
+
+# ── Input ──────────────────────────────────────────────────────────────────────
+
+def _files(paths: list[str]) -> Iterator[str]:
+    """Input files under `paths`, in a stable order."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                for name in sorted(names):
+                    if name.endswith(_SUFFIXES):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _records(paths: list[str]) -> Iterator[tuple[str, str, str]]:
+    """
+    Yield (source, id, raw) work items without parsing them.
+
+    A JSONL line's raw payload is the line itself; a text file is read by the
+    worker, so its raw payload is empty. Undecodable bytes are replaced, so
+    one bad line costs that record (reported by the worker), not the run.
+    """
+    for path in _files(paths):
+        if path.endswith(".jsonl"):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for number, line in enumerate(f, 1):
+                    if line.strip():
+                        yield path, str(number), line
+        else:
+            yield path, os.path.basename(path), ""
+
+
+def _chunks(items: Iterator, size: int) -> Iterator[list]:
+    chunk: list = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ── Worker ─────────────────────────────────────────────────────────────────────
+
+def _valid(messages: list) -> list[dict]:
+    """Drop entries that are not {"role", "content": str} messages."""
+    return [
+        m for m in messages
+        if isinstance(m, dict) and isinstance(m.get("content"), str) and "role" in m
+    ]
+
+
+def _messages(source: str, raw: str) -> tuple[str | None, list[dict]]:
+    """Parse one work item into (record id from the payload, messages)."""
+    if not raw:
+        with open(source, encoding="utf-8", errors="replace") as f:
+            return None, text_to_messages(f.read())
+
+    record = json.loads(raw)
+    if isinstance(record, list):
+        return None, _valid(record)
+    if not isinstance(record, dict):
+        raise ValueError("record is neither an object nor a message list")
+    record_id = record.get("id")
+    if isinstance(record.get("messages"), list):
+        return record_id, _valid(record["messages"])
+    if isinstance(record.get("text"), str):
+        return record_id, text_to_messages(record["text"])
+    raise ValueError('record has neither "messages" nor "text"')
+
+
+def _extract_chunk(chunk: list[tuple[str, str, str]]) -> tuple[list[str], int, dict[str, int]]:
+    """Worker body: extract every record of a chunk; returns (JSON lines, errors, field hits)."""
+    lines: list[str] = []
+    errors = 0
+    hits = dict.fromkeys(PROFILE_FIELDS, 0)
+    for source, fallback_id, raw in chunk:
+        try:
+            record_id, messages = _messages(source, raw)
+            data = extract_fields(messages)
+        except (OSError, ValueError) as exc:
+            errors += 1
+            print(f"{source}:{fallback_id}: skipped ({exc})", file=sys.stderr)
+            continue
+        for field in data:
+            hits[field] = hits.get(field, 0) + 1
+        lines.append(json.dumps(
+            {"source": source, "id": record_id if record_id is not None else fallback_id,
+             "candidate_data": data},
+            ensure_ascii=False,
+        ))
+    return lines, errors, hits
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────────
+
+class _Report:
+    """Running totals for the throughput and hit-rate report."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.records = 0
+        self.errors = 0
+        self.hits = dict.fromkeys(PROFILE_FIELDS, 0)
+
+    def add(self, records: int, errors: int, hits: dict[str, int]) -> None:
+        self.records += records
+        self.errors += errors
+        for field in self.hits:
+            self.hits[field] += hits.get(field, 0)
+
+    def rate(self) -> float:
+        return self.records / max(time.monotonic() - self.started, 1e-9)
+
+    def render(self) -> str:
+        elapsed = time.monotonic() - self.started
+        rows = [
+            f"records    {self.records}  ({self.errors} skipped)",
+            f"elapsed    {elapsed:.1f}s",
+            f"throughput {self.rate():.0f} records/s",
+            "hit rates:",
+        ]
+        for field, hits in self.hits.items():
+            share = hits / self.records if self.records else 0.0
+            rows.append(f"  {field:<17} {share:6.1%}  ({hits})")
+        return "\n".join(rows)
+
+
+def run(
+    paths: list[str],
+    out,
+    workers: int | None = None,
+    chunk_size: int = 500,
+    progress_every: float = 10.0,
+) -> _Report:
+    """Extract every record under `paths` into `out` (a text stream); returns the report."""
+    workers = workers or os.cpu_count() or 1
+    report = _Report()
+    chunks = _chunks(_records(paths), chunk_size)
+    in_flight: set[Future] = set()
+    last_progress = time.monotonic()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight.add(pool.submit(_extract_chunk, chunk))
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                lines, errors, hits = future.result()
+                if lines:
+                    out.write("\n".join(lines) + "\n")
+                report.add(len(lines), errors, hits)
+
+            if progress_every and time.monotonic() - last_progress >= progress_every:
+                last_progress = time.monotonic()
+                print(f"… {report.records} records, {report.rate():.0f}/s", file=sys.stderr)
+    out.flush()
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.bulk_extract",
+        description="Extract candidate_data from archived transcripts (.jsonl) and resumes (.txt).",
+    )
+    parser.add_argument("paths", nargs="+", help="input files or directories")
+    parser.add_argument("-o", "--output", help="output JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="records per work unit (default: 500)")
+    parser.add_argument("--progress", type=float, default=10.0, help="seconds between progress lines; 0 disables")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            report = run(args.paths, out, args.workers, args.chunk_size, args.progress)
+    else:
+        report = run(args.paths, sys.stdout, args.workers, args.chunk_size, args.progress)
+    print(report.render(), file=sys.stderr)
+    return 0 if report.records or not report.errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+tools/fetch_fonts.py
+────────────────────
+Download the interface fonts into static/fonts so they are served by the app
+itself instead of Google Fonts:
+
+    python -m tools.fetch_fonts
+
+Run once per checkout (or at image build time) and commit or ship the
+.woff2 files with the app; until then the missing families fall back to
+system fonts (or Google Fonts with TALENTSCOUT_FONT_CDN=1). Only the latin
+subset is kept; all families are published under
+the SIL Open Font License.
+"""
+
+import os
+import re
+import sys
+import urllib.request
+
+from ui.styles import FONT_FILES, _STATIC_DIR
+
+_CSS_URL = "https://fonts.googleapis.com/css2?family={spec}&display=swap"
+# Google Fonts only serves woff2 to browsers it recognises.
+_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+_LATIN_RE = re.compile(r"/\* latin \*/\s*@font-face\s*{[^}]*?url\((https://[^)]+\.woff2)\)")
+
+
+def _get(url: str) -> bytes:
+    request = urllib.request.Request(url, headers={"User-Agent": _USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def fetch(name: str, spec: str, directory: str) -> str:
+    """Download the latin woff2 of one Google Fonts `spec` to directory/name."""
+    css = _get(_CSS_URL.format(spec=spec.replace(" ", "+"))).decode("utf-8")
+    match = _LATIN_RE.search(css)
+    if match is None:
+        raise ValueError(f"no latin woff2 face for {spec!r}")
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(_get(match.group(1)))
+    return path
+
+
+def main() -> int:
+    directory = os.path.join(_STATIC_DIR, "fonts")
+    os.makedirs(directory, exist_ok=True)
+    failed = 0
+    for name, spec in FONT_FILES.items():
+        try:
+            path = fetch(name, spec, directory)
+        except (OSError, ValueError) as exc:
+            failed += 1
+            print(f"{name}: failed ({exc})", file=sys.stderr)
+            continue
+        print(f"{path}  {os.path.getsize(path) // 1024} KiB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
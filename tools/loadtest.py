@@ -0,0 +1,291 @@
+"""
+tools/loadtest.py
+─────────────────
+Capacity test: drive synthetic candidates through complete screenings
+against the simulated LLM backend of tools/mock_llm.py. Runs fully offline.
+
+    python -m tools.loadtest --sessions 200 --concurrency 50 --ttft 0.4 --error-rate 0.02
+
+Every candidate is a scripted persona run through the real engine
+(services/engine.py) — greeting → collecting_info → tech_stack →
+technical_questions → ended — on its own thread, with up to --concurrency
+screenings in flight. All LLM calls made by services/llm_service.py
+(replies, scoring, question-bank fills, summaries) go through the normal
+provider executor to the mock, whose time to first token, token rate and
+429 rate are set on the command line.
+
+The report (stderr, or --json FILE) gives sessions/sec, p50/p95/p99 of the
+time to first chunk and of the full turn, CPU seconds and RSS per live
+session, and the mock's call and 429 counts. Thresholds turn it into a
+deploy gate: the exit status is 1 if a screening did not reach "ended" or a
+--max-*/--min-* limit is missed.
+
+The run uses its own temporary question bank and score cache and disables
+the session stores and the greeting pool, so every greeting is
+generated and nothing outside the temporary directory is touched.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+_FULL_FLOW = ("greeting", "collecting_info", "tech_stack", "technical_questions", "ended")
+
+_PERSONAS = (
+    ("Priya", "Raman", "Bengaluru", "Backend Engineer", 5, "Python, Django and PostgreSQL"),
+    ("Lucas", "Moreau", "Lyon", "Full Stack Developer", 3, "JavaScript, React and Node.js"),
+    ("Amara", "Okafor", "Lagos", "Data Engineer", 7, "Python, Spark and AWS"),
+    ("Kenji", "Watanabe", "Osaka", "Platform Engineer", 9, "Go, Kubernetes and Terraform"),
+    ("Sofia", "Lindqvist", "Stockholm", "Android Developer", 4, "Kotlin, Java and Firebase"),
+    ("Diego", "Herrera", "Bogotá", "Machine Learning Engineer", 6, "Python, PyTorch and Docker"),
+)
+
+_ANSWERS = (
+    "I'd start by profiling the hot path, then fix the slowest query or loop first and measure again.",
+    "I would add caching in front of the expensive calls and make the handlers stateless so they scale out.",
+    "Mostly through good tests and monitoring — I check error rates and latency percentiles after every deploy.",
+)
+
+
+# ── Personas ───────────────────────────────────────────────────────────────────
+
+def _script(n: int) -> list[str]:
+    """Candidate messages of persona `n`; names and emails are unique per candidate."""
+    first, last, city, position, years, stack = _PERSONAS[n % len(_PERSONAS)]
+    return [
+        f"Hi, I'm {first} {last}.",
+        f"My email is {first.lower()}.{last.lower()}{n}@example.com and my phone is +1 555 {n % 10_000:04d} 0100. "
+        f"I live in {city}, I have {years} years of experience and I'm applying for {position}.",
+        f"I mostly work with {stack}.",
+        "Yes, that's correct.",
+        *_ANSWERS,
+    ]
+
+
+# ── Driver ─────────────────────────────────────────────────────────────────────
+
+class _Results:
+    """Per-turn timings and per-session outcomes, shared by the candidate threads."""
+
+    def __init__(self):
+        self.first_chunk: list[float] = []
+        self.turns: list[float] = []
+        self.completed = 0
+        self.failed: list[str] = []
+        self.scores = 0
+        self.sessions: list = []  # kept alive until the end so RSS covers live sessions
+        self._lock = threading.Lock()
+
+    def turn(self, first_chunk: float, total: float) -> None:
+        with self._lock:
+            self.first_chunk.append(first_chunk)
+            self.turns.append(total)
+
+    def finish(self, session, visited: list[str], error: str | None) -> None:
+        with self._lock:
+            self.sessions.append(session)
+            self.scores += len(session.scores)
+            if error is None and session.ended and all(stage in visited for stage in _FULL_FLOW):
+                self.completed += 1
+            else:
+                self.failed.append(error or f"{session.session_id}: stopped after {' → '.join(visited)}")
+
+
+def _timed(results: _Results, chunks) -> None:
+    """Consume one reply, recording the time to its first chunk and to its end."""
+    started = time.perf_counter()
+    first = None
+    for _ in chunks:
+        if first is None:
+            first = time.perf_counter() - started
+    total = time.perf_counter() - started
+    results.turn(total if first is None else first, total)
+
+
+def _candidate(n: int, results: _Results, think: float) -> None:
+    """Run one complete screening for persona `n`."""
+    from services.engine import ScreeningSession
+
+    session = ScreeningSession()
+    visited = [session.stage]
+    error = None
+    try:
+        _timed(results, session.start())
+        for message in _script(n):
+            if session.ended:
+                break
+            if think:
+                time.sleep(think)
+            _timed(results, session.reply(message))
+            session.poll()
+            if session.stage != visited[-1]:
+                visited.append(session.stage)
+        # Wait for the answer scores still being computed in the background.
+        while session.pending_scores:
+            wait([entry[0] for entry in session.pending_scores.values()])
+            session.poll()
+    except Exception as exc:  # a failed screening is reported, not raised
+        error = f"{session.session_id}: {type(exc).__name__}: {exc}"
+    results.finish(session, visited, error)
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (Linux), falling back to the peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return _peak_rss_bytes()
+
+
+def _peak_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def run(sessions: int, concurrency: int, think: float, mock) -> dict:
+    """Run `sessions` screenings, `concurrency` at a time, and return the report."""
+    results = _Results()
+    rss_before = _rss_bytes()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="talentscout-loadtest") as pool:
+        for n in range(sessions):
+            pool.submit(_candidate, n, results, think)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+    rss = _rss_bytes() - rss_before
+
+    return {
+        "sessions":            sessions,
+        "concurrency":         concurrency,
+        "completed":           results.completed,
+        "failed":              results.failed[:10],
+        "elapsed_s":           elapsed,
+        "sessions_per_s":      results.completed / elapsed if elapsed else 0.0,
+        "turns":               len(results.turns),
+        "scores":              results.scores,
+        "first_chunk_s":       _percentiles(results.first_chunk),
+        "turn_s":              _percentiles(results.turns),
+        "cpu_ms_per_session":  1000 * cpu / max(sessions, 1),
+        "rss_kib_per_session": rss / 1024 / max(sessions, 1),
+        "peak_rss_mib":        _peak_rss_bytes() / 2**20,
+        "llm_calls":           mock.calls,
+        "llm_429s":            mock.rate_limited,
+    }
+
+
+def render(report: dict) -> str:
+    fmt = lambda p: "  ".join(f"{k} {v * 1000:.0f}ms" for k, v in p.items())
+    rows = [
+        f"sessions     {report['completed']}/{report['sessions']} completed"
+        f"  (concurrency {report['concurrency']})",
+        f"elapsed      {report['elapsed_s']:.1f}s",
+        f"throughput   {report['sessions_per_s']:.2f} sessions/s",
+        f"first chunk  {fmt(report['first_chunk_s'])}",
+        f"turn         {fmt(report['turn_s'])}  over {report['turns']} turns, {report['scores']} answers scored",
+        f"cpu          {report['cpu_ms_per_session']:.1f}ms/session",
+        f"rss          {report['rss_kib_per_session']:.1f}KiB/session  (peak {report['peak_rss_mib']:.0f}MiB)",
+        f"llm calls    {report['llm_calls']}  ({report['llm_429s']} injected 429s)",
+    ]
+    rows += [f"failed       {failure}" for failure in report["failed"]]
+    return "\n".join(rows)
+
+
+def _gate(report: dict, args: argparse.Namespace) -> list[str]:
+    """Threshold violations, as readable messages."""
+    checks = [
+        (args.max_p95, report["turn_s"]["p95"], "turn p95 {:.3f}s > {:.3f}s", True),
+        (args.max_first_chunk_p95, report["first_chunk_s"]["p95"], "first-chunk p95 {:.3f}s > {:.3f}s", True),
+        (args.max_cpu_ms, report["cpu_ms_per_session"], "cpu {:.1f}ms/session > {:.1f}ms", True),
+        (args.min_rate, report["sessions_per_s"], "throughput {:.2f} sessions/s < {:.2f}", False),
+    ]
+    violations = [
+        template.format(value, limit)
+        for limit, value, template, is_max in checks
+        if limit is not None and (value > limit if is_max else value < limit)
+    ]
+    if report["completed"] < report["sessions"]:
+        violations.append(f"{report['sessions'] - report['completed']} screenings did not complete")
+    return violations
+
+
+def _isolate(workdir: str) -> None:
+    """Point every store at `workdir` (or disable it) and select the mock provider; before project imports."""
+    os.environ.update({
+        "TALENTSCOUT_LLM_PROVIDERS":   "mock",
+        "TALENTSCOUT_QUESTION_BANK":   os.path.join(workdir, "question_bank.sqlite3"),
+        "TALENTSCOUT_SCORE_CACHE":     os.path.join(workdir, "score_cache.sqlite3"),
+        "TALENTSCOUT_SESSION_STORE":   "",
+        "TALENTSCOUT_SESSION_BACKEND": "",
+        "TALENTSCOUT_GREETING_POOL":   "0",
+    })
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tools.loadtest",
+        description="Drive synthetic candidates through full screenings against a simulated LLM.",
+    )
+    parser.add_argument("-n", "--sessions", type=int, default=100, help="screenings to run (default: 100)")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="screenings in flight (default: 20)")
+    parser.add_argument("--think", type=float, default=0.0, help="candidate think time per turn, seconds")
+    parser.add_argument("--ttft", type=float, default=0.4, help="median time to first token, seconds (default: 0.4)")
+    parser.add_argument("--ttft-sigma", type=float, default=0.5, help="log-normal shape of the TTFT (default: 0.5)")
+    parser.add_argument("--token-rate", type=float, default=150.0, help="tokens per second (default: 150)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of LLM calls answered with a 429")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the mock's latency and error draws")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    gate = parser.add_argument_group("gate (exit status 1 when missed)")
+    gate.add_argument("--max-p95", type=float, help="max turn p95, seconds")
+    gate.add_argument("--max-first-chunk-p95", type=float, help="max first-chunk p95, seconds")
+    gate.add_argument("--max-cpu-ms", type=float, help="max CPU milliseconds per session")
+    gate.add_argument("--min-rate", type=float, help="min completed sessions per second")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="talentscout-loadtest-")
+    try:
+        _isolate(workdir)
+        from services.providers import register_provider
+        from tools.mock_llm import MockProvider
+
+        mock = MockProvider(args.ttft, args.ttft_sigma, args.token_rate, args.error_rate, args.seed)
+        register_provider(MockProvider.name, lambda: mock)
+        report = run(args.sessions, args.concurrency, args.think, mock)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(render(report), file=sys.stderr)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    violations = _gate(report, args)
+    for violation in violations:
+        print(f"GATE FAILED: {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
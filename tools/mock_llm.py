@@ -0,0 +1,184 @@
+"""
+tools/mock_llm.py
+─────────────────
+Simulated LLM backend for load tests (tools/loadtest.py). Fully offline.
+
+`MockProvider` implements the provider interface of services/providers.py
+and plays a scripted interviewer, so the real engine moves through every
+stage: greeting → collecting_info → tech_stack → technical_questions →
+ended. It also answers the side calls with well-formed JSON: answer scores
+(single and batch), question-bank fills, structured turns and summaries.
+
+Timing is configurable:
+  - time to first token: log-normal with median `ttft` seconds and shape
+    `ttft_sigma`;
+  - output at `token_rate` tokens (words) per second;
+  - a share `error_rate` of calls fail with a 429 before the first token,
+    which exercises the executor's retries and the circuit breaker.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Iterator
+
+from services.providers import LLMProvider, ProviderError
+
+_STAGE_RE = re.compile(r"Conversation Stage : (\w+)")
+_TIER_COUNT_RE = re.compile(r"Write (\d+) distinct questions")
+_TECH_RE = re.compile(r"Technology: (.+)")
+_NUMBERED_RE = re.compile(r"^\d+\. ", re.M)
+
+# Candidate answers after which the interviewer wraps up.
+ANSWERS_BEFORE_WRAP_UP = 3
+
+WELCOME = (
+    "Welcome to TalentScout! 👋 I'm your AI hiring assistant and I'll guide you through "
+    "a short screening. To get started, may I have your full name?"
+)
+ASK_INFO = (
+    "Thanks! Could you share your email address, phone number, current location, "
+    "years of experience and the desired position you're applying for?"
+)
+ASK_STACK = (
+    "Great, that's very helpful. What is your tech stack — the programming languages, "
+    "frameworks, databases and tools you work with most?"
+)
+CONFIRM_STACK = "Thanks! Just to make sure I have it right: {stack}. Is that correct?"
+NEXT_QUESTION = "Thanks for that answer. Please go ahead with the next question whenever you're ready."
+WRAP_UP = (
+    "That's all the questions I have — thank you for your time today! A recruiter will reach "
+    "out within 2–3 business days with next steps. Best of luck!"
+)
+QUESTION_BLOCK = (
+    "Here are a few technical questions based on your stack. Answer them one at a time.\n\n"
+    "**{tech}**\n"
+    "1. What problem does {tech} solve best, and where would you avoid it?\n"
+    "2. In a production app, how would you diagnose a slow {tech} code path?\n"
+    "3. How would you design a {tech} service to handle ten times today's load?"
+)
+
+
+class MockProvider(LLMProvider):
+    """Scripted interviewer with configurable latency, token rate and 429 injection."""
+
+    name = "mock"
+
+    def __init__(
+        self,
+        ttft: float = 0.4,
+        ttft_sigma: float = 0.5,
+        token_rate: float = 150.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.models = {tier: f"mock-{tier}" for tier in
+                       ("conversation", "scoring", "summarization", "fast")}
+        self._ttft = ttft
+        self._sigma = ttft_sigma
+        self._token_rate = token_rate
+        self._error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    # ── Provider interface ─────────────────────────────────────────────────────
+
+    def complete(self, messages, max_tokens, temperature=None, json_mode=False, tier=None, usage=None) -> str:
+        text = self._respond(messages, json_mode)
+        time.sleep(self._first_token_delay() + len(text.split()) / self._token_rate)
+        return text
+
+    def stream(self, messages, max_tokens, temperature=None, tier=None, usage=None) -> Iterator[str]:
+        text = self._respond(messages, json_mode=False)
+        time.sleep(self._first_token_delay())
+        delay = 1.0 / self._token_rate
+        for word in text.split(" "):
+            yield word + " "
+            time.sleep(delay)
+
+    # ── Timing ─────────────────────────────────────────────────────────────────
+
+    def _first_token_delay(self) -> float:
+        """Sample the time to first token; raise a 429 for a share of calls."""
+        with self._lock:
+            self.calls += 1
+            if self._random.random() < self._error_rate:
+                self.rate_limited += 1
+                limited = True
+            else:
+                limited = False
+            delay = self._random.lognormvariate(math.log(self._ttft), self._sigma) if self._ttft > 0 else 0.0
+        if limited:
+            time.sleep(min(delay, 0.05))
+            raise ProviderError(self.name, "rate_limit", "simulated rate limit", 429)
+        return delay
+
+    # ── Script ─────────────────────────────────────────────────────────────────
+
+    def _respond(self, messages: list[dict], json_mode: bool) -> str:
+        prompt = messages[-1]["content"]
+        system = messages[0]["content"] if messages[0]["role"] == "system" else ""
+
+        if prompt.startswith("You are a technical interviewer. Score this answer"):
+            return json.dumps({"score": self._random.randint(35, 95), "feedback": "Reasonable answer."})
+        if prompt.startswith("You are a technical interviewer. Score a candidate's answers"):
+            questions = len(_NUMBERED_RE.findall(prompt.split("Candidate messages")[0]))
+            answers = prompt.count("\nMessage ")
+            return json.dumps({"scores": [
+                {"question": i, "message": i if i <= answers else None,
+                 "score": self._random.randint(35, 95), "feedback": "OK."}
+                for i in range(1, questions + 1)
+            ]})
+        if prompt.startswith("You write technical screening questions"):
+            per_tier = int(_TIER_COUNT_RE.search(prompt).group(1))
+            tech = _TECH_RE.search(prompt).group(1).strip()
+            return json.dumps({
+                tier: [f"({tier} {n}) Explain how you would use {tech} for case {n}?" for n in range(per_tier)]
+                for tier in ("beginner", "intermediate", "advanced")
+            })
+        if prompt.startswith("You maintain a running summary"):
+            return "The candidate shared their background and stack and answered technical questions."
+
+        stage_match = _STAGE_RE.search(system)
+        reply, next_stage = self._interview(messages, stage_match.group(1) if stage_match else "greeting")
+        if json_mode:
+            return json.dumps({
+                "reply": reply, "score": self._random.randint(35, 95) if stage_match
+                and stage_match.group(1) == "technical_questions" else None,
+                "feedback": None, "next_stage": next_stage, "candidate_data": {},
+            })
+        return reply
+
+    @staticmethod
+    def _interview(messages: list[dict], stage: str) -> tuple[str, str]:
+        """The interviewer's next message for the current stage, and the stage it leads to."""
+        chat = [m for m in messages if m["role"] != "system"]
+        last_user = chat[-1]["content"] if chat else ""
+        last_bot = next((m["content"] for m in reversed(chat) if m["role"] == "assistant"), "")
+
+        if stage == "greeting":
+            if len(chat) <= 1:
+                return WELCOME, "greeting"
+            return ASK_INFO, "collecting_info"
+        if stage == "collecting_info":
+            return ASK_STACK, "tech_stack"
+        if stage == "tech_stack":
+            if "Is that correct?" in last_bot:
+                tech = last_bot.split("right: ", 1)[-1].split(",")[0].split(".")[0].strip() or "Python"
+                return QUESTION_BLOCK.format(tech=tech), "technical_questions"
+            return CONFIRM_STACK.format(stack=last_user.rstrip(".")), "tech_stack"
+        if stage == "technical_questions":
+            asked = max(
+                (i for i, m in enumerate(chat) if m["role"] == "assistant" and _NUMBERED_RE.search(m["content"])),
+                default=0,
+            )
+            answers = sum(1 for m in chat[asked:] if m["role"] == "user")
+            if answers >= ANSWERS_BEFORE_WRAP_UP:
+                return WRAP_UP, "ended"
+            return NEXT_QUESTION, "technical_questions"
+        return WRAP_UP, "ended"
@@ -2,10 +2,20 @@
 ui/chat_ui.py
 ─────────────
 Chat bubble rendering with accuracy badges on user answers.
+
+Transcript messages never change once sent, so `message_html` is memoised
+per message, keyed on its index, text and score: a rerun re-emits cached
+strings instead of rebuilding every bubble, and a score landing rebuilds
+only its own bubble. `render_history` draws only the most recent window of
+the transcript; older turns are paged in on demand.
 """
 
+from functools import lru_cache
+
 import streamlit as st
 
+from config.settings import CHAT_HTML_CACHE_SIZE
+
 
 def render_header(stage_label: str, progress: int) -> None:
     """Render the sticky branded header and animated progress bar."""
@@ -40,17 +50,14 @@ def render_topbar(stage_label: str, progress: int) -> None:
     """, unsafe_allow_html=True)
 
 
-def render_message(role: str, content: str, timestamp: str = "", accuracy: int = None) -> None:
-    """
-    Render a single chat bubble.
+@lru_cache(maxsize=CHAT_HTML_CACHE_SIZE)
+def message_html(index: int, role: str, content: str, timestamp: str = "", accuracy: int = None) -> str:
+    """Build (once) the HTML of transcript message `index`."""
+    return _bubble_html(role, content, timestamp, accuracy)
 
-    Parameters
-    ----------
-    role     : 'assistant' or 'user'
-    content  : message text
-    timestamp: HH:MM string
-    accuracy : 0-100 score shown only on user messages during tech questions
-    """
+
+def _bubble_html(role: str, content: str, timestamp: str = "", accuracy: int = None) -> str:
+    """The HTML of a single chat bubble."""
     is_user = role == "user"
     avatar_html = (
         '<div class="msg-avatar user">You</div>'
@@ -76,7 +83,7 @@ def render_message(role: str, content: str, timestamp: str = "", accuracy: int =
 
     meta_html = f'<div class="msg-meta">{time_html}{badge_html}</div>' if (time_html or badge_html) else ""
 
-    st.markdown(f"""
+    return f"""
     <div class="msg-row {row_cls}">
       {avatar_html}
       <div class="msg-body">
@@ -84,7 +91,58 @@ def render_message(role: str, content: str, timestamp: str = "", accuracy: int =
         {meta_html}
       </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def render_message(
+    role: str, content: str, timestamp: str = "", accuracy: int = None, container=None, index: int = None
+) -> None:
+    """
+    Render a single chat bubble.
+
+    Parameters
+    ----------
+    role     : 'assistant' or 'user'
+    content  : message text
+    timestamp: HH:MM string
+    accuracy : 0-100 score shown only on user messages during tech questions
+    container: optional st.empty() placeholder to draw into; re-rendering into
+               the same placeholder replaces the bubble (used for streaming)
+    index    : position in the transcript; only stored messages are cached
+    """
+    if container is not None:
+        # Streaming redraws a growing partial reply: never worth caching.
+        container.markdown(_bubble_html(role, content, timestamp, accuracy), unsafe_allow_html=True)
+        return
+    if index is None:
+        st.markdown(_bubble_html(role, content, timestamp, accuracy), unsafe_allow_html=True)
+        return
+    st.markdown(message_html(index, role, content, timestamp, accuracy), unsafe_allow_html=True)
+
+
+def render_history(messages: list[dict], scores: dict, window: int, first: int = 1) -> int:
+    """
+    Render the last `window` messages of messages[first:].
+
+    Parameters
+    ----------
+    messages : full conversation history
+    scores   : message index → accuracy score (user messages only)
+    window   : how many of the most recent messages to draw
+    first    : index of the first displayable message (the hidden greeting
+               trigger is skipped)
+
+    Returns
+    -------
+    int
+        How many older messages were left out.
+    """
+    start = max(first, len(messages) - window)
+    for i in range(start, len(messages)):
+        msg = messages[i]
+        accuracy = scores.get(i) if msg["role"] == "user" else None
+        render_message(msg["role"], msg["content"], msg.get("time", ""), accuracy, index=i)
+    return start - first
 
 
 def render_ended_banner() -> None:
@@ -10,6 +10,7 @@ Renders the sidebar panel containing:
 """
 
 import streamlit as st
+from config.settings import SESSION_TOKEN_PARAM
 from services.state_manager import get_stage_progress, get_stage_label
 
 _PROFILE_FIELDS: list[tuple[str, str]] = [
@@ -25,8 +26,9 @@ _PROFILE_FIELDS: list[tuple[str, str]] = [
 
 def render_sidebar() -> None:
     with st.sidebar:
-        data     = st.session_state.get("candidate_data", {})
-        stage    = st.session_state.get("stage", "greeting")
+        screening = st.session_state.get("screening")
+        data     = screening.candidate_data if screening else {}
+        stage    = screening.stage if screening else "greeting"
         progress = get_stage_progress(stage)
         name     = data.get("full_name", "Candidate")
         position = data.get("desired_position", "Tech Role")
@@ -84,7 +86,7 @@ def render_sidebar() -> None:
         st.markdown("---")
 
         # Session info
-        msg_count = len(st.session_state.get("messages", []))
+        msg_count = len(screening.messages) if screening else 0
         st.markdown(
             f'<p style="color:#64748b;font-size:0.8rem;">'
             f"Messages exchanged: {max(0, msg_count - 1)}</p>",
@@ -109,5 +111,7 @@ def render_sidebar() -> None:
 
 def _reset_session() -> None:
     """Clear all session-state keys to start a fresh screening."""
-    for key in ["messages", "candidate_data", "stage", "ended", "started", "scores"]:
+    for key in ["screening", "history_window", "persister"]:
         st.session_state.pop(key, None)
+    # The finished screening stays in the session store; the next run issues a new token.
+    st.query_params.pop(SESSION_TOKEN_PARAM, None)
@@ -7,14 +7,46 @@ Keeping styles in a dedicated module means:
   - app.py stays clean and logic-only.
   - Designers can update visuals without touching Python logic.
   - CSS variables are defined once in :root and reused everywhere.
+
+The stylesheet is sent once per browser session: a zero-height component
+copies it into the parent page's <head>, where it survives reruns, so later
+reruns carry no styling payload at all. Fonts bundled in static/fonts
+(`python -m tools.fetch_fonts`; Streamlit static serving, see
+.streamlit/config.toml) are served by the app with preload hints. No font
+files are committed, so by default a family whose file is missing falls back
+to the system font stack; Google Fonts is used for it only when
+FONT_CDN_FALLBACK is set.
 """
 
+import json
+import os
+
 import streamlit as st
+import streamlit.components.v1 as components
+
+from config.settings import FONT_CDN_FALLBACK
+
+_STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+_FONT_URL = "app/static/fonts/"
+
+# Bundled font faces (latin subset): file → (family, style, weight range,
+# Google Fonts spec used to download it, Google Fonts family loaded instead
+# while the file is missing and FONT_CDN_FALLBACK is set).
+_FONT_FACES: dict[str, tuple[str, str, str, str, str]] = {
+    "dm-serif-display-normal.woff2": ("DM Serif Display", "normal", "400", "DM Serif Display:ital@0",
+                                      "DM+Serif+Display:ital@0;1"),
+    "dm-serif-display-italic.woff2": ("DM Serif Display", "italic", "400", "DM Serif Display:ital@1",
+                                      "DM+Serif+Display:ital@0;1"),
+    "dm-sans-normal.woff2":          ("DM Sans", "normal", "300 600", "DM Sans:wght@300..600",
+                                      "DM+Sans:wght@300;400;500;600"),
+    "syne-normal.woff2":             ("Syne", "normal", "400 800", "Syne:wght@400..800",
+                                      "Syne:wght@400;600;700;800"),
+}
+
+# File → Google Fonts spec, for tools/fetch_fonts.py.
+FONT_FILES: dict[str, str] = {name: face[3] for name, face in _FONT_FACES.items()}
 
 _CSS = """
-<style>
-@import url('https://fonts.googleapis.com/css2?family=DM+Serif+Display:ital@0;1&family=DM+Sans:wght@300;400;500;600&display=swap');
-@import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;600;700;800&family=Inter:wght@300;400;500&display=swap');
 /* ── Design Tokens ────────────────────────────────────────────────────── */
 :root {
     --bg:          #0d0f14;
@@ -244,28 +276,60 @@ div[data-testid="stSidebar"] {
     box-shadow: 0 0 0 3px rgba(110, 231, 183, 0.08) !important;
 }
 .stChatInput input { color: var(--text) !important; font-family: 'DM Sans', sans-serif !important; }
-
-</style>
-<script>
-document.addEventListener('DOMContentLoaded', function() {
-    document.addEventListener('copy', function(e) {
-        if (e.target.tagName !== 'INPUT' && e.target.tagName !== 'TEXTAREA') e.preventDefault();
-    });
-    document.addEventListener('contextmenu', function(e) {
-        if (e.target.tagName !== 'INPUT' && e.target.tagName !== 'TEXTAREA') e.preventDefault();
-    });
-    document.addEventListener('keydown', function(e) {
-        if (e.target.tagName === 'INPUT' || e.target.tagName === 'TEXTAREA') return;
-        if (e.ctrlKey && ['c','a','x'].includes(e.key.toLowerCase())) e.preventDefault();
-    });
-});
-</script>
-
-
-</style>
 """
 
+def _bundled_fonts() -> list[str]:
+    """The bundled font files that are actually on disk."""
+    return [name for name in _FONT_FACES if os.path.isfile(os.path.join(_STATIC_DIR, "fonts", name))]
+
+
+def _font_css(bundled: list[str], cdn: bool = FONT_CDN_FALLBACK) -> str:
+    """@font-face rules for the bundled files and, if `cdn`, a Google Fonts @import for every other family."""
+    fallback = dict.fromkeys(face[4] for name, face in _FONT_FACES.items() if cdn and name not in bundled)
+    imports = [
+        f"@import url('https://fonts.googleapis.com/css2?family={spec}&display=swap');" for spec in fallback
+    ]
+    faces = []
+    for name in bundled:
+        family, style, weight, _, _ = _FONT_FACES[name]
+        faces.append(
+            f"@font-face {{ font-family: '{family}'; font-style: {style}; font-weight: {weight}; "
+            f"font-display: swap; src: url('{_FONT_URL}{name}') format('woff2'); }}"
+        )
+    return "\n".join(imports + faces) + "\n"
+
+
+def _injector() -> str:
+    """Script that installs the stylesheet and font preloads in the host page once."""
+    bundled = _bundled_fonts()
+    css = json.dumps(_font_css(bundled) + _CSS).replace("</", "<\\/")
+    return f"""<script>
+(function() {{
+    const doc = window.parent.document;
+    if (doc.getElementById('ts-styles')) return;
+    for (const href of {json.dumps([_FONT_URL + name for name in bundled])}) {{
+        const link = doc.createElement('link');
+        link.rel = 'preload'; link.as = 'font'; link.type = 'font/woff2';
+        link.crossOrigin = 'anonymous'; link.href = href;
+        doc.head.appendChild(link);
+    }}
+    const style = doc.createElement('style');
+    style.id = 'ts-styles';
+    style.textContent = {css};
+    doc.head.appendChild(style);
+}})();
+</script>"""
+
 
 def load_css() -> None:
-    """Inject the custom stylesheet into the Streamlit page."""
-    st.markdown(_CSS, unsafe_allow_html=True)
+    """
+    Inject the custom stylesheet into the page, once per browser session.
+
+    The style element lives in the host page's <head>, outside Streamlit's
+    element tree, so it persists across reruns; a browser reload starts a new
+    session and injects it again.
+    """
+    if st.session_state.get("styles_loaded"):
+        return
+    components.html(_injector(), height=0)
+    st.session_state.styles_loaded = True
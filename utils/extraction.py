@@ -0,0 +1,160 @@
+"""
+utils/extraction.py
+───────────────────
+Streamlit-free core of the regex/heuristic candidate-data extraction.
+
+Shared by the screening engine (services/engine.py, which scans each new
+message once) and the offline bulk extractor (tools/bulk_extract.py). Nothing
+here touches Streamlit or the app config, so it imports cheaply in worker
+processes.
+
+Fixes applied vs. original:
+  - Name heuristic: requires title-case AND excludes common false-positive
+    phrases (experience declarations, job titles, etc.).
+  - Location: no longer hard-coded to Indian cities — accepts any phrase
+    that follows "based in", "located in", "from", or "living in".
+  - Tech stack splitting: handles comma, slash, "and", "&", semicolons,
+    newlines, and mixed separators. Detection and naming use the canonical
+    taxonomy in utils/taxonomy.py.
+  - Phone: accepts common international and domestic formats.
+"""
+
+import re
+
+from utils.taxonomy import has_tech, normalize_stack
+
+# ── Patterns ───────────────────────────────────────────────────────────────────
+
+_EMAIL_RE = re.compile(r"[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}")
+
+_PHONE_RE = re.compile(
+    r"(?:\+?\d{1,3}[\s\-]?)?(?:\(?\d{2,4}\)?[\s\-]?)?\d{3,5}[\s\-]?\d{4,6}"
+)
+
+_EXPERIENCE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:\+\s*)?(?:years?|yrs?)", re.I)
+
+# Common words that look like names but are not (two/three alphabetic words).
+_FALSE_NAME_WORDS = {
+    "full time", "part time", "five years", "ten years", "senior developer",
+    "software engineer", "data scientist", "not sure", "dont know",
+    "no idea", "i am", "i have",
+}
+
+# Separators used in tech-stack lists.
+_TECH_SPLIT_RE = re.compile(r"[,/;&\n]|\band\b", re.I)
+
+# Location trigger phrases — extract the NP that follows.
+_LOCATION_RE = re.compile(
+    r"(?:based in|located in|living in|from|currently in|i(?:'m| am) in)\s+([A-Za-z ,]+?)(?:\.|,|$)",
+    re.I,
+)
+
+
+# Keywords suggesting a message states the desired position.
+_ROLE_KEYWORDS: tuple[str, ...] = (
+    "developer", "engineer", "analyst", "scientist", "architect",
+    "manager", "designer", "devops", "qa", "tester", "intern",
+)
+
+# Every field the extractor fills; once all are present, scanning stops.
+PROFILE_FIELDS: tuple[str, ...] = (
+    "full_name", "email", "phone", "years_experience",
+    "desired_position", "location", "tech_stack",
+)
+
+
+# ── Extraction ────
+
+def _scan_message(text: str, data: dict) -> None:
+    """Fill any still-missing fields of `data` from one user message."""
+    text = text.strip()
+    lower: str = text.lower()
+
+    # ── Email ─────────
+    if "email" not in data:
+        match = _EMAIL_RE.search(text)
+        if match:
+            data["email"] = match.group()
+
+    # ── Phone ────────
+    if "phone" not in data:
+        match = _PHONE_RE.search(text)
+        # Require at least 10 digits to avoid matching years/dates.
+        if match and len(re.sub(r"\D", "", match.group())) >= 10:
+            data["phone"] = match.group().strip()
+
+    # ── Years of Experience ─────
+    if "years_experience" not in data:
+        match = _EXPERIENCE_RE.search(text)
+        if match:
+            data["years_experience"] = f"{match.group(1)} years"
+
+    # ── Full Name ─────
+    if "full_name" not in data:
+        words = text.split()
+        if (
+            2 <= len(words) <= 3
+            and all(w.istitle() for w in words)
+            and all(w.isalpha() for w in words)
+            and lower not in _FALSE_NAME_WORDS
+            and not any(kw in lower for kw in ("year", "engineer", "developer", "analyst"))
+        ):
+            data["full_name"] = text
+
+    # ── Desired Position ──────────
+    if "desired_position" not in data:
+        if any(kw in lower for kw in _ROLE_KEYWORDS):
+            data["desired_position"] = text
+
+    # ── Current Location ──────────
+    if "location" not in data:
+        match = _LOCATION_RE.search(text)
+        if match:
+            data["location"] = match.group(1).strip().title()
+
+    # ── Tech Stack ──────────
+    # Known technologies are stored under their canonical display names.
+    if "tech_stack" not in data:
+        if has_tech(text):
+            raw_items = _TECH_SPLIT_RE.split(text)
+            cleaned = normalize_stack([item for item in raw_items if item.strip()])
+            if cleaned:
+                data["tech_stack"] = cleaned
+
+
+def update_candidate_data(data: dict, messages: list[dict], cursor: int = 0) -> int:
+    """
+    Scan the user messages in messages[cursor:] into `data`, in place.
+
+    Fields already present are never overwritten, so scanning only the new
+    messages gives the same result as rescanning the whole transcript.
+    Scanning stops early once every profile field is filled.
+
+    Returns
+    -------
+    int
+        The cursor to pass next time: the index of the first unscanned message.
+    """
+    if cursor > len(messages):
+        cursor = 0  # the transcript was reset
+    for msg in messages[cursor:]:
+        if all(field in data for field in PROFILE_FIELDS):
+            break
+        if msg["role"] == "user":
+            _scan_message(msg["content"], data)
+    return len(messages)
+
+
+def extract_fields(messages: list[dict]) -> dict:
+    """Extract candidate fields from a whole transcript into a new dict."""
+    data: dict = {}
+    update_candidate_data(data, messages)
+    return data
+
+
+def text_to_messages(text: str) -> list[dict]:
+    """
+    Present free text (e.g. a plain-text resume) as user messages, one per
+    non-empty line, so the per-message heuristics apply line by line.
+    """
+    return [{"role": "user", "content": line} for line in text.splitlines() if line.strip()]
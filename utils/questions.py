@@ -0,0 +1,57 @@
+"""
+utils/questions.py
+──────────────────
+Parsing of the Stage 4 technical-question blocks the assistant produces.
+
+The system prompt asks for one section per technology:
+
+    **Python**
+    1. What is a generator?
+    2. How would you …
+
+`parse_question_sections` turns such a message back into
+[("Python", ["What is a generator?", "How would you …"]), …] so questions
+can be scored, stored and reused individually.
+"""
+
+import re
+
+_HEADER_RE = re.compile(r"^\s*(?:#{1,6}\s*)?\*\*\s*\[?([^*\[\]\n]{1,60}?)\]?\s*\*\*\s*:?\s*$")
+_NUMBERED_RE = re.compile(r"^\s*\(?(\d{1,2})[.)]\s+(.+?)\s*$")
+
+# A message must contain at least this many numbered questions to count as a
+# question block rather than a single follow-up question.
+_MIN_BLOCK_QUESTIONS = 2
+
+
+def parse_question_sections(text: str) -> list[tuple[str, list[str]]]:
+    """
+    Split an assistant message into (technology, questions) sections.
+
+    Numbered lines that appear before any bold header are ignored, as are
+    sections without questions.
+    """
+    sections: list[tuple[str, list[str]]] = []
+    current: tuple[str, list[str]] | None = None
+
+    for line in text.splitlines():
+        header = _HEADER_RE.match(line)
+        if header:
+            current = (header.group(1).strip(), [])
+            sections.append(current)
+            continue
+        numbered = _NUMBERED_RE.match(line)
+        if numbered and current is not None:
+            current[1].append(numbered.group(2).replace("**", "").strip())
+
+    return [(tech, questions) for tech, questions in sections if questions]
+
+
+def is_question_block(text: str) -> bool:
+    """True if `text` is a technical-question block (not a single follow-up)."""
+    return sum(len(qs) for _, qs in parse_question_sections(text)) >= _MIN_BLOCK_QUESTIONS
+
+
+def flatten_questions(sections: list[tuple[str, list[str]]]) -> list[str]:
+    """["[Python] What is a generator?", …] — one entry per question, tech-prefixed."""
+    return [f"[{tech}] {q}" for tech, questions in sections for q in questions]
@@ -5,25 +5,61 @@ Streamlit session-state initialisation.
 
 All keys used anywhere in the app are declared here so every module can
 safely read session_state without KeyError guards scattered everywhere.
+The screening itself lives in one headless `ScreeningSession`
+(services/engine.py) under session_state.screening.
+
+When a session store is enabled, a new browser session either resumes the
+screening named by the ?s=<token> URL parameter — from the shared live store
+first, then the local SQLite archive — or is issued a fresh token, and
+`persist_session` writes whatever changed since its last call.
 """
 
 import streamlit as st
 
+from config.settings import CHAT_WINDOW_MESSAGES, SESSION_TOKEN_PARAM
+from services.engine import ScreeningSession
+from services.persistence import SessionPersister, enabled, new_token, resume
+
 
-def init_session(scores: dict = None) -> None:
+def init_session() -> None:
     """
     Initialise all session-state keys with safe defaults.
 
     Called once per page load from app.py. Subsequent calls are no-ops
     because each block checks for key existence before writing.
     """
+    if "persister" not in st.session_state:
+        _attach_store()
+    # Built only when missing: a session is not constructed on every rerun.
+    if "screening" not in st.session_state:
+        st.session_state.screening = ScreeningSession()
+
     defaults: dict = {
-        "messages":       [],    
-        "candidate_data": {},   
-        "stage":          "greeting",
-        "ended":          False,
-        "started":        False,
+        "history_window": CHAT_WINDOW_MESSAGES,  # chat bubbles drawn per rerun
     }
     for key, default_value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = default_value
+
+
+def _attach_store() -> None:
+    """Resume the session named in the URL, or issue this session a new resume token."""
+    if not enabled():
+        st.session_state.persister = None
+        return
+
+    token = st.query_params.get(SESSION_TOKEN_PARAM)
+    resumed = resume(token) if token else None
+    if resumed is None:
+        token = new_token()
+        st.query_params[SESSION_TOKEN_PARAM] = token
+        st.session_state.persister = SessionPersister(token)
+    else:
+        st.session_state.screening, st.session_state.persister = resumed
+
+
+def persist_session() -> None:
+    """Write this session's changes to the session stores (see services/persistence.py)."""
+    persister = st.session_state.get("persister")
+    if persister is not None:
+        persister.save(st.session_state.screening)
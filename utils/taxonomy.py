@@ -0,0 +1,180 @@
+"""
+utils/taxonomy.py
+─────────────────
+Canonical technology taxonomy and a single-pass matcher.
+
+Every technology the app recognises has one canonical id, a display name
+and its aliases ("postgres", "postgresql", "pg" → "postgresql"). All aliases
+are compiled once into one word-bounded regex, so a message is scanned in a
+single pass and yields canonical ids in order of appearance:
+
+    find_techs("Mostly Python 3.11 + Postgres, some golang")
+    → [("python", "3.11"), ("postgresql", ""), ("go", "")]
+
+Word boundaries fix the substring false positives of the old keyword lists
+("go" no longer matches "good", "java" no longer matches "javascript").
+Two kinds of alias need more context, unless they are the whole text, as
+in a stack item or a question-block header:
+
+  - Everyday words ("Go", "React", "Spring", …) count only when written
+    with their usual capitalisation ("React" but not "react to it").
+  - Abbreviations ("py", "js", "pg", "node", …) count only next to a list
+    separator or "and"/"or", as in "Python, pg and js".
+
+Multi-word names that extend a shorter one are their own technologies and
+win over their prefix: "Spring Boot 3" is Spring Boot 3, not Spring 3.
+
+Downstream code keys on the ids: question-bank storage, stage detection and
+the normalised tech_stack shown in the sidebar and injected into the prompt.
+"""
+
+import re
+
+# canonical id → (display name, aliases)
+TECHS: dict[str, tuple[str, tuple[str, ...]]] = {
+    # Languages
+    "python":     ("Python",     ("python", "py")),
+    "java":       ("Java",       ("java",)),
+    "javascript": ("JavaScript", ("javascript", "js", "ecmascript")),
+    "typescript": ("TypeScript", ("typescript", "ts")),
+    "cpp":        ("C++",        ("c++", "cpp")),
+    "csharp":     ("C#",         ("c#", "csharp", "c sharp")),
+    "ruby":       ("Ruby",       ("ruby",)),
+    "go":         ("Go",         ("go", "golang")),
+    "rust":       ("Rust",       ("rust",)),
+    "php":        ("PHP",        ("php",)),
+    "swift":      ("Swift",      ("swift",)),
+    "kotlin":     ("Kotlin",     ("kotlin",)),
+    # Frameworks & libraries
+    "react":      ("React",      ("react", "reactjs", "react.js")),
+    "angular":    ("Angular",    ("angular", "angularjs")),
+    "vue":        ("Vue",        ("vue", "vuejs", "vue.js")),
+    "django":     ("Django",     ("django",)),
+    "flask":      ("Flask",      ("flask",)),
+    "fastapi":    ("FastAPI",    ("fastapi",)),
+    "spring":     ("Spring",     ("spring", "spring framework")),
+    "springboot": ("Spring Boot", ("spring boot", "springboot")),
+    "node":       ("Node.js",    ("node", "nodejs", "node.js")),
+    "express":    ("Express",    ("express", "expressjs", "express.js")),
+    "rails":      ("Rails",      ("rails", "ruby on rails", "ror")),
+    "graphql":    ("GraphQL",    ("graphql",)),
+    "pandas":     ("pandas",     ("pandas",)),
+    "numpy":      ("NumPy",      ("numpy",)),
+    # Databases
+    "sql":        ("SQL",        ("sql",)),
+    "postgresql": ("PostgreSQL", ("postgresql", "postgres", "pg")),
+    "mysql":      ("MySQL",      ("mysql",)),
+    "sqlite":     ("SQLite",     ("sqlite", "sqlite3")),
+    "mongodb":    ("MongoDB",    ("mongodb", "mongo")),
+    "redis":      ("Redis",      ("redis",)),
+    # Cloud & tooling
+    "docker":     ("Docker",     ("docker",)),
+    "kubernetes": ("Kubernetes", ("kubernetes", "k8s")),
+    "aws":        ("AWS",        ("aws", "amazon web services")),
+    "gcp":        ("GCP",        ("gcp", "google cloud", "google cloud platform")),
+    "azure":      ("Azure",      ("azure", "microsoft azure")),
+    "git":        ("Git",        ("git",)),
+    "linux":      ("Linux",      ("linux",)),
+    "terraform":  ("Terraform",  ("terraform",)),
+    # Data & BI
+    "powerbi":    ("Power BI",   ("power bi", "powerbi")),
+    "tableau":    ("Tableau",    ("tableau",)),
+    "excel":      ("Excel",      ("excel", "ms excel")),
+}
+
+# Aliases that are also common English words: matched in running text only
+# when capitalised as below (or when they make up the whole text).
+_CASED_ALIASES: dict[str, str] = {
+    "go": "Go", "rust": "Rust", "swift": "Swift", "spring": "Spring", "react": "React",
+    "express": "Express", "rails": "Rails", "excel": "Excel",
+}
+
+# Abbreviations that are too short or too common to trust in prose: matched
+# only in a stack list (or when they make up the whole text).
+_LIST_ALIASES = frozenset({"py", "js", "ts", "pg", "node", "ror"})
+
+_LIST_BEFORE_RE = re.compile(r"(?:^|[,;/+|&(\n]|\b(?:and|or))\s*$", re.I)
+_LIST_AFTER_RE = re.compile(r"^\s*(?:$|[,;/+|&)\n]|(?:and|or)\b)", re.I)
+
+ALIASES: dict[str, str] = {alias: tech for tech, (_, aliases) in TECHS.items() for alias in aliases}
+
+_TECH_RE = re.compile(
+    r"(?<![\w.+#])(" + "|".join(re.escape(a) for a in sorted(ALIASES, key=len, reverse=True)) + r")"
+    r"(?![^\W\d]|[+#])"
+    r"(?:\s*v?(\d+(?:\.\d+)?)(?!\s*\+?\s*(?:years?|yrs?)\b))?",
+    re.I,
+)
+
+
+def _accepted(match: re.Match, text: str) -> bool:
+    alias = match.group(1)
+    key = alias.lower()
+    if key not in _CASED_ALIASES and key not in _LIST_ALIASES:
+        return True
+    if match.group(0).strip().lower() == text.strip().lower():
+        return True
+    if key in _LIST_ALIASES:
+        return bool(_LIST_AFTER_RE.match(text[match.end():]) or _LIST_BEFORE_RE.search(text[:match.start()]))
+    cased = _CASED_ALIASES[key]
+    return alias in (cased, cased.upper())
+
+
+def find_techs(text: str) -> list[tuple[str, str]]:
+    """
+    Every technology mentioned in `text`, as (canonical id, version) pairs.
+
+    Pairs are returned in order of first appearance without duplicates;
+    version is the "major[.minor]" written right after the name, or "".
+    """
+    found: list[tuple[str, str]] = []
+    for match in _TECH_RE.finditer(text):
+        if not _accepted(match, text):
+            continue
+        pair = (ALIASES[match.group(1).lower()], match.group(2) or "")
+        if pair not in found:
+            found.append(pair)
+    return found
+
+
+def has_tech(text: str) -> bool:
+    """True if `text` mentions at least one known technology."""
+    return any(_accepted(m, text) for m in _TECH_RE.finditer(text))
+
+
+def canonical_tech(name: str) -> tuple[str, str] | None:
+    """
+    Map a free-text technology name to (canonical id, major[.minor] version).
+
+    "Python 3.11" → ("python", "3.11"); "reactjs" → ("react", ""). Returns
+    None for technologies the taxonomy does not know.
+    """
+    found = find_techs(name)
+    return found[0] if found else None
+
+
+def display_name(tech: str) -> str:
+    """Human-readable name for a canonical tech id."""
+    return TECHS.get(tech, (tech.title(), ()))[0]
+
+
+def tech_label(tech: str, version: str = "") -> str:
+    """Display name with version, e.g. "Python 3.11"."""
+    return f"{display_name(tech)} {version}".strip()
+
+
+def normalize_stack(items: list[str]) -> list[str]:
+    """
+    Rewrite a declared stack in canonical display form.
+
+    Items naming known technologies become their labels ("python3.11, pg"
+    → ["Python 3.11", "PostgreSQL"]); items the taxonomy does not know are
+    kept verbatim so they still reach the prompt. Duplicates are dropped.
+    """
+    stack: list[str] = []
+    for item in items:
+        found = find_techs(item)
+        labels = [tech_label(tech, version) for tech, version in found] if found else [item.strip()]
+        for label in labels:
+            if label and label not in stack:
+                stack.append(label)
+    return stack
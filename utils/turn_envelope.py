@@ -0,0 +1,108 @@
+"""
+utils/turn_envelope.py
+──────────────────────
+Parsing of the JSON envelope returned by a structured turn.
+
+In TURN_MODE "structured" a single completion answers the candidate, scores
+their previous answer, names the next stage and reports newly stated profile
+fields:
+
+    {"reply": "...", "score": 72, "feedback": "...",
+     "next_stage": "technical_questions",
+     "candidate_data": {"email": "...", "tech_stack": ["Python", "Django"]}}
+
+Models occasionally wrap JSON in code fences, add prose around it, return
+numbers as strings or invent keys. `parse_turn_envelope` tolerates all of
+that and returns a normalised dict, or None when there is no usable reply —
+the caller then falls back to the streamed turn.
+"""
+
+import json
+import re
+
+from config.settings import CONVERSATION_STAGES
+from utils.extraction import PROFILE_FIELDS
+from utils.taxonomy import normalize_stack
+
+_FENCE_RE = re.compile(r"```(?:json)?", re.I)
+_LIST_SPLIT_RE = re.compile(r"[,/;\n]|\band\b", re.I)
+
+
+def _first_object(raw: str) -> dict | None:
+    """Decode the first JSON object found in `raw`."""
+    text = _FENCE_RE.sub("", raw).strip()
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+            continue
+        return value if isinstance(value, dict) else None
+    return None
+
+
+def _score(value) -> int | None:
+    """An integer score clamped to 0–100, or None."""
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        score = round(float(value))
+    except (TypeError, ValueError):
+        return None
+    return max(0, min(100, score))
+
+
+def _fields(value) -> dict:
+    """Known, non-empty profile fields; tech_stack becomes a list of strings."""
+    if not isinstance(value, dict):
+        return {}
+    fields: dict = {}
+    for key in PROFILE_FIELDS:
+        item = value.get(key)
+        if key == "tech_stack":
+            if isinstance(item, str):
+                item = _LIST_SPLIT_RE.split(item)
+            if isinstance(item, list):
+                item = normalize_stack([str(t) for t in item if str(t).strip()])
+        elif isinstance(item, (int, float)) and not isinstance(item, bool):
+            item = f"{item:g} years" if key == "years_experience" else str(item)
+        elif isinstance(item, str):
+            item = item.strip()
+        else:
+            item = None
+        if item:
+            fields[key] = item
+    return fields
+
+
+def parse_turn_envelope(raw: str) -> dict | None:
+    """
+    Normalise a structured-turn completion.
+
+    Returns
+    -------
+    dict | None
+        {"reply": str, "score": int | None, "feedback": str | None,
+         "next_stage": str | None, "candidate_data": dict}, or None if the
+        completion holds no JSON object with a non-empty "reply".
+    """
+    envelope = _first_object(raw or "")
+    if envelope is None:
+        return None
+    reply = envelope.get("reply")
+    if not isinstance(reply, str) or not reply.strip():
+        return None
+
+    stage = envelope.get("next_stage")
+    stage = stage.strip().lower() if isinstance(stage, str) else None
+    feedback = envelope.get("feedback")
+    score = _score(envelope.get("score"))
+    return {
+        "reply":          reply.strip(),
+        "score":          score,
+        "feedback":       feedback.strip() if isinstance(feedback, str) and score is not None else None,
+        "next_stage":     stage if stage in CONVERSATION_STAGES else None,
+        "candidate_data": _fields(envelope.get("candidate_data")),
+    }
@@ -4,7 +4,7 @@ utils/validators.py
 Input validation helpers.
 """
 
-from config.settings import EXIT_KEYWORDS
+from config.settings import EXIT_KEYWORDS, CONFIRM_KEYWORDS
 
 
 def detect_exit(text: str) -> bool:
@@ -35,3 +35,20 @@ def detect_exit(text: str) -> bool:
     # Whole-word match within a longer sentence
     words = set(normalised.split())
     return bool(words & EXIT_KEYWORDS)
+
+
+def detect_confirmation(text: str) -> bool:
+    """
+    Return True if the user's message is a short affirmative reply
+    ("yes", "yep that's right", "correct!").
+
+    Long messages are never treated as confirmations — they usually add or
+    correct information that the LLM should see.
+    """
+    normalised = text.lower().strip()
+    words = [w.strip(".,!?'\"") for w in normalised.split()]
+    if not words or len(words) > 6:
+        return False
+    if any(w in ("no", "not", "but", "except", "also", "add") for w in words):
+        return False
+    return bool(set(words) & CONFIRM_KEYWORDS)